@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+""""
+Porpose: Benchmark of the FFaudiocue split pipeline.
+Usage:
+    python3 benchmark.py -o baseline.json  # save a baseline
+    python3 benchmark.py -b baseline.json  # compare with it
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: Distributed under the terms of the GPL3 License.
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+    FFaudiocue is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    FFaudiocue is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import gettext
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(PATH))))
+
+gettext.install('ffaudiocue')  # the `_` builtin used by the package
+
+try:
+    from ffaudiocue.ffc_utils.utils import get_codec_quality_items
+    from ffaudiocue.ffc_core.split_args import (open_cuesheet,
+                                                setup_splitter,
+                                                get_recipes,
+                                                )
+    from ffaudiocue.ffc_core.finalize import make_staging_dir
+    from ffaudiocue.ffc_core.split_engine import SplitEngine
+    from ffaudiocue.ffc_core.job_logs import RotatingLog
+except ImportError as error:
+    sys.exit(error)
+
+# the output formats listed on the main panel
+FORMATS = ('wav', 'flac', 'opus', 'mp3', 'ogg')
+
+# the compared figures and whether higher values are better
+FIGURES = {'tracks_per_sec': True,
+           'realtime': True,
+           'peak_rss_kb': False,
+           }
+
+
+def description():
+    """
+    print description of the program
+    """
+    descr = ('Splits synthesized CD images through the same recipes '
+             'used by FFaudiocue, for each output format and quality, '
+             'and reports tracks/sec, realtime factor and peak RSS of '
+             'ffmpeg. The results can be saved as a JSON baseline and '
+             'compared with a previous one, exiting with status 1 on '
+             'regressions.')
+
+    return descr
+
+
+def cue_time(secs):
+    """
+    Returns the given seconds as CUE sheet time (mm:ss:ff)
+    """
+    frames = round(secs * 75)
+    return f'{frames // 4500:02d}:{frames // 75 % 60:02d}:{frames % 75:02d}'
+
+
+def synthesize(workdir, ffmpeg, length, tracks, source):
+    """
+    Makes a CD image of `length` seconds using the lavfi
+    sources of ffmpeg (a sine wave plus pink noise with a
+    fixed seed, so that it is the same on each run) and its
+    CUE sheet of `tracks` tracks of the same length. Images
+    already made are reused. Returns the CUE file pathname.
+    """
+    name = f'image-{length}s-{tracks}t'
+    imagedir = os.path.join(workdir, f'{name}-{source}')
+    cuefile = os.path.join(imagedir, f'{name}.cue')
+    if os.path.exists(cuefile):
+        return cuefile
+
+    os.makedirs(imagedir, exist_ok=True)
+    audiofile = f'{name}.{source}'
+    codec = 'flac' if source == 'flac' else 'pcm_s16le'
+    graph = (f'sine=frequency=440:sample_rate=44100:duration={length}[a];'
+             f'anoisesrc=color=pink:sample_rate=44100:amplitude=0.2:'
+             f'duration={length}:seed=1[b];'
+             f'[a][b]amerge=inputs=2[out]')
+    subprocess.run([ffmpeg, '-v', 'error', '-y', '-filter_complex', graph,
+                    '-map', '[out]', '-c:a', codec,
+                    os.path.join(imagedir, audiofile)], check=True)
+
+    ctype = 'WAVE' if source == 'wav' else source.upper()
+    sheet = ['REM GENRE "Test"',
+             'REM DATE 2026',
+             'REM DISCID 00000000',
+             'REM COMMENT "FFaudiocue benchmark"',
+             'PERFORMER "FFaudiocue"',
+             f'TITLE "Benchmark {length}s"',
+             f'FILE "{audiofile}" {ctype}',
+             ]
+    for num in range(tracks):
+        sheet += [f'  TRACK {num + 1:02d} AUDIO',
+                  f'    TITLE "Track {num + 1}"',
+                  f'    INDEX 01 {cue_time(length / tracks * num)}',
+                  ]
+    with open(cuefile, 'w', encoding='utf-8') as cue:
+        cue.write('\n'.join(sheet) + '\n')
+
+    return cuefile
+
+
+def split_once(cuefile, outputformat, quality, args):
+    """
+    Splits the CUE file as `CueGui.on_start` does and
+    returns the summary of the metrics (see `summarize`)
+    and the number of tracks.
+    """
+    data = open_cuesheet(cuefile, args.ffprobe, args.ffmpeg, 'info')
+    outputdir = setup_splitter(data,
+                               ffmpeg_cmd=args.ffmpeg,
+                               ffmpeg_loglevel='info',
+                               outputformat=outputformat,
+                               quality=quality,
+                               codec_copy=False,
+                               destination=os.path.join(args.workdir,
+                                                        'output'),
+                               collection=False,
+                               )
+    os.makedirs(outputdir, exist_ok=True)
+    tmpdir = make_staging_dir(outputdir)
+    data.kwargs['tempdir'] = tmpdir
+    try:
+        recipes = get_recipes(data, args.single_pass)
+        log = RotatingLog(os.path.join(args.workdir, 'benchmark.log'))
+        status = SplitEngine(recipes, log, args.workers).run()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    if status['failed'] or status['errors']:
+        sys.exit(f'ERROR: {outputformat} "{quality}" failed, see '
+                 f'{log.filename}')
+
+    return status['metrics'], len(data.audiotracks)
+
+
+def run_case(cuefile, outputformat, quality, args):
+    """
+    Splits the CUE file `args.repeat` times and returns
+    the figures of the run with the median wall time.
+    """
+    runs = [split_once(cuefile, outputformat, quality, args)
+            for repeat in range(args.repeat)]
+    walls = [summary['wall'] for summary, tracks in runs]
+    summary, tracks = runs[walls.index(statistics.median_low(walls))]
+
+    return {'tracks': tracks,
+            'wall': summary['wall'],
+            'tracks_per_sec': round(tracks / summary['wall'], 3),
+            'realtime': summary['realtime'],
+            'cpu': round((summary['cpu_user'] or 0)
+                         + (summary['cpu_system'] or 0), 3),
+            'peak_rss_kb': summary['maxrss_kb'],
+            'bytes_out': summary['bytes_out'],
+            'walls': walls,
+            }
+
+
+def ffmpeg_version(ffmpeg):
+    """
+    Returns the first line of `ffmpeg -version`
+    """
+    out = subprocess.run([ffmpeg, '-version'], capture_output=True,
+                         text=True, check=True).stdout
+    return out.splitlines()[0]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the differences from the baseline results and
+    returns the number of figures worse than `tolerance`
+    (e.g. 0.1 is 10%).
+    """
+    regressions = 0
+    for case, figures in results.items():
+        base = baseline.get(case)
+        if not base:
+            print(f'{case:<50} (not in baseline)')
+            continue
+        for name, higher in FIGURES.items():
+            if not figures[name] or not base[name]:
+                continue
+            change = figures[name] / base[name] - 1
+            worse = -change if higher else change
+            mark = ''
+            if worse > tolerance:
+                mark = '  << REGRESSION'
+                regressions += 1
+            print(f'{case:<50} {name:<15} {base[name]:>10} -> '
+                  f'{figures[name]:>10} ({change:+.1%}){mark}')
+
+    return regressions
+
+
+def main():
+    """
+    Parse the command line and run the benchmark
+    """
+    parser = argparse.ArgumentParser(description=description())
+    parser.add_argument('-l', '--length', type=int, default=600,
+                        help='seconds of the CD image (default: 600)')
+    parser.add_argument('-t', '--tracks', type=int, default=12,
+                        help='number of tracks (default: 12)')
+    parser.add_argument('-s', '--source', choices=('wav', 'flac'),
+                        default='wav',
+                        help='format of the CD image (default: wav)')
+    parser.add_argument('-f', '--formats', nargs='+', choices=FORMATS,
+                        default=list(FORMATS),
+                        help='output formats (default: all)')
+    parser.add_argument('-q', '--auto-quality-only', action='store_true',
+                        help='only the "Auto" quality of each format')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='ffmpeg processes at once (default: 1)')
+    parser.add_argument('--single-pass', action='store_true',
+                        help='use the single pass recipes')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='runs of each case, the median is taken '
+                             '(default: 3)')
+    parser.add_argument('--ffmpeg', default='ffmpeg',
+                        help='ffmpeg executable (default: ffmpeg)')
+    parser.add_argument('--ffprobe', default='ffprobe',
+                        help='ffprobe executable (default: ffprobe)')
+    parser.add_argument('--workdir',
+                        default=os.path.join(tempfile.gettempdir(),
+                                             'ffaudiocue-benchmark'),
+                        help='folder of the images and outputs')
+    parser.add_argument('-o', '--output',
+                        help='save the results to this JSON file')
+    parser.add_argument('-b', '--baseline',
+                        help='compare the results with this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='max relative regression (default: 0.1)')
+    args = parser.parse_args()
+
+    config = {'length': args.length,
+              'tracks': args.tracks,
+              'source': args.source,
+              'workers': args.workers,
+              'single_pass': args.single_pass,
+              }
+    cuefile = synthesize(args.workdir, args.ffmpeg, args.length,
+                         args.tracks, args.source)
+    results = {}
+    for outputformat in args.formats:
+        qualities = get_codec_quality_items(outputformat)
+        if args.auto_quality_only:
+            qualities = ['Auto']
+        for quality in qualities:
+            case = f'{outputformat}: {quality}'
+            results[case] = run_case(cuefile, outputformat, quality, args)
+            fig = results[case]
+            print(f'{case:<50} {fig["tracks_per_sec"]:>8} tracks/s '
+                  f'{fig["realtime"]:>8}x  {fig["peak_rss_kb"]} KiB')
+
+    report = {'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+              'ffmpeg': ffmpeg_version(args.ffmpeg),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'cpu_count': os.cpu_count(),
+              'config': config,
+              'results': results,
+              }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fjson:
+            json.dump(report, fjson, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as fjson:
+            baseline = json.load(fjson)
+        if baseline['config'] != config:
+            print(f'WARNING: different configuration from the baseline: '
+                  f'{baseline["config"]}')
+        if baseline['ffmpeg'] != report['ffmpeg']:
+            print(f'NOTE: baseline made with {baseline["ffmpeg"]}')
+        print()
+        if compare(results, baseline['results'], args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
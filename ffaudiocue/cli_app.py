@@ -0,0 +1,395 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: cli_app.py
+Porpose: command line entry point of FFaudiocue
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import gettext
+from threading import Thread
+from shutil import which
+from ffaudiocue.ffc_sys.argparser import arguments
+from ffaudiocue.ffc_sys.settings_manager import DataSource
+from ffaudiocue.ffc_utils.utils import detect_binaries, check_quality
+
+
+def executables(appdata):
+    """
+    Returns the ffmpeg and ffprobe pathnames, from the user
+    settings if available, otherwise from the operating system.
+    """
+    cmds = []
+    for name in ('ffmpeg', 'ffprobe'):
+        cmd = appdata[f'{name}_cmd']
+        if not cmd or not which(cmd, mode=os.F_OK | os.X_OK, path=None):
+            cmd = detect_binaries(name, appdata['FFMPEG_DIR'])[1]
+        cmds.append(cmd)
+
+    return cmds
+# ------------------------------------------------------------------------
+
+
+def console_notify(topic, **kwargs):
+    """
+    Writes the `QueueEngine` events on the console.
+    """
+    if topic == 'COUNT_EVT' and kwargs['end'] == 'error':
+        sys.stderr.write(f"\nERROR: {kwargs['msg']}\n")
+
+    elif topic == 'JOB_EVT':
+        if kwargs['status'] == 'running':
+            msg = _("Processing... Album number: {} | Status "
+                    "Progress: {}%").format(kwargs['jobid'],
+                                            kwargs['progress'])
+            sys.stdout.write(f"\r{msg}")
+            sys.stdout.flush()
+        elif kwargs['status'] == 'done':
+            sys.stdout.write(f"\n[{kwargs['jobid']}] {_('Done')}: "
+                             f"{kwargs['message']}\n")
+        elif kwargs['status'] == 'failed':
+            sys.stderr.write(f"\n[{kwargs['jobid']}] ERROR: "
+                             f"{kwargs['message']}\n")
+# ------------------------------------------------------------------------
+
+
+def job_options(argmts):
+    """
+    Returns the job options of a `JobQueue` given by the
+    `split` command line arguments.
+    """
+    return {'outputformat': argmts['format'],
+            'quality': argmts['quality'],
+            'codec_copy': argmts['copy'],
+            'destination': argmts['outputdir'],
+            'collection': argmts['collection'],
+            'singlepass': argmts['single_pass'],
+            'incremental': argmts['incremental'],
+            'charset': argmts['charset'],
+            'overwrite': argmts['overwrite'],
+            'verify': argmts['verify'],
+            'checksums': argmts['checksums'],
+            }
+# ------------------------------------------------------------------------
+
+
+def run_queue(queue, appdata, argmts, title):
+    """
+    Splits all the jobs of the given queue on a
+    `QueueEngine` and waits for them to finish, logging
+    to a new job log named by `title`. Returns the status
+    of `QueueEngine.run` and the log pathname. On Ctrl+C
+    the engine is stopped and KeyboardInterrupt raised.
+    """
+    from ffaudiocue.ffc_core.queue_engine import QueueEngine
+    from ffaudiocue.ffc_core.probe_cache import ProbeCache
+    from ffaudiocue.ffc_core.charset_cache import CharsetCache
+    from ffaudiocue.ffc_core.job_logs import get_joblogs
+    from ffaudiocue.ffc_core.journal import Journals
+    from ffaudiocue.ffc_core.process_limits import ProcessLimits
+    from ffaudiocue.ffc_core.library import Library
+
+    ffmpeg, ffprobe = executables(appdata)
+    journals = Journals(os.path.join(appdata['confdir'], 'journal'))
+    journals.sweep([argmts['outputdir']]
+                   + [os.path.dirname(job['cuefile'])
+                      for job in queue.snapshot()])
+    joblogs = get_joblogs(appdata)
+    log = joblogs.open(title)
+    library = Library(os.path.join(appdata['confdir'], 'library.sqlite'))
+    engine = QueueEngine(queue, log,
+                         argmts['workers'] or appdata['maxworkers'],
+                         notify=console_notify,
+                         fps=appdata['progressfps'],
+                         ffmpeg_cmd=ffmpeg,
+                         ffprobe_cmd=ffprobe,
+                         ffmpeg_loglevel=appdata['ffmpegloglev'],
+                         probecache=ProbeCache(os.path.join(
+                             appdata['confdir'], 'probecache.json')),
+                         charsets=CharsetCache(os.path.join(
+                             appdata['confdir'], 'charsets.json')),
+                         metricsfile=log.metricsfile,
+                         journals=journals,
+                         limits=ProcessLimits.from_settings(appdata),
+                         library=library,
+                         )
+    status = {}
+    thread = Thread(target=lambda: status.update(engine.run()))
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.2)
+    except KeyboardInterrupt:
+        engine.stop()
+        thread.join()
+        raise
+    finally:
+        library.close()
+        joblogs.close(log, status)
+
+    return status, log.filename
+# ------------------------------------------------------------------------
+
+
+def split(argmts):
+    """
+    Runs the `split` command without importing any GUI
+    toolkit. All CUE sheets share the same workers, see
+    `QueueEngine`. Returns the exit status code.
+    """
+    from ffaudiocue.ffc_core.job_queue import JobQueue, find_cuesheets
+    from ffaudiocue.ffc_core.metrics import format_summary
+
+    appdata = DataSource(argmts).get_configuration()
+    if appdata.get('ERROR'):
+        sys.stderr.write(f"FATAL: {appdata['ERROR']}\n")
+        return 1
+
+    gettext.translation('ffaudiocue', appdata['localepath'],
+                        fallback=True).install()
+
+    cuesheets = find_cuesheets(argmts['paths'])
+    if not cuesheets:
+        sys.stderr.write("ERROR: No CUE files found\n")
+        return 1
+
+    options = job_options(argmts)
+    queue = JobQueue()  # not persistent
+    for cuefile in cuesheets:
+        job = queue.add(cuefile, options)
+        print(f"[{job['id']}] {cuefile}")
+
+    title = os.path.basename(cuesheets[0])
+    if len(cuesheets) > 1:
+        title += f' (+{len(cuesheets) - 1})'
+    try:
+        status, logname = run_queue(queue, appdata, argmts, title)
+    except KeyboardInterrupt:
+        sys.stderr.write(_("\n...Interrupted, run the same command "
+                           "again to resume it\n"))
+        return 130
+
+    if status['metrics']['recipes']:
+        print(f"\n{format_summary(status['metrics'])}")
+    failed = [job for job in queue.snapshot() if job['status'] != 'done']
+    if status['failed'] or failed:
+        sys.stderr.write(f"\n{len(failed)} of {len(cuesheets)} CUE "
+                         f"files failed, see Logs for details: "
+                         f"{logname}\n")
+        for job in failed:
+            sys.stderr.write(f"  {job['cuefile']}\n")
+        return 1
+
+    return 0
+# ------------------------------------------------------------------------
+
+
+def archive(watcher, album, success):
+    """
+    Moves the given album of the `watch` command out of its
+    inbox, see `WatchFolders.archive`. Returns its new
+    pathname, None if it could not be moved.
+    """
+    try:
+        dest = watcher.archive(*album, success)
+    except OSError as err:
+        sys.stderr.write(f"\nERROR: {err}\n")
+        return None
+    print(_("Moved to {0}").format(dest))
+    return dest
+# ------------------------------------------------------------------------
+
+
+def watch(argmts):
+    """
+    Runs the `watch` command: splits the albums dropped
+    into the inbox folders as soon as their files are
+    complete, with the split options of the command line
+    overridden by the profile of each inbox, then moves
+    them to the done or failed subfolder of the inbox.
+    Runs until interrupted, returns the exit status code.
+    """
+    import signal
+    from ffaudiocue.ffc_core.job_queue import JobQueue, DONE, FAILED
+    from ffaudiocue.ffc_core.watch_folder import WatchFolders, load_profile
+
+    appdata = DataSource(argmts).get_configuration()
+    if appdata.get('ERROR'):
+        sys.stderr.write(f"FATAL: {appdata['ERROR']}\n")
+        return 1
+
+    gettext.translation('ffaudiocue', appdata['localepath'],
+                        fallback=True).install()
+
+    for inbox in argmts['paths']:
+        try:
+            if not os.path.isdir(inbox):
+                raise ValueError(f"No such directory: {inbox}")
+            if not {**argmts, **load_profile(inbox, argmts)}['outputdir']:
+                raise ValueError(f"{inbox}: an output folder is required, "
+                                 f"with -o or the profile of the inbox")
+        except ValueError as err:
+            sys.stderr.write(f"ERROR: {err}\n")
+            return 1
+
+    # stops as Ctrl+C does, the interrupted album is resumed later
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    watcher = WatchFolders(argmts['paths'], argmts['settle'],
+                           argmts['interval'])
+    print(_("Watching {0} ({1}), press Ctrl+C to stop").format(
+        ', '.join(watcher.inboxes),
+        'inotify' if watcher.inotify else _('polling')))
+    try:
+        while True:
+            albums = watcher.ready()
+            queue = JobQueue()  # not persistent
+            owner = {}
+            for inbox, cuefile, sources in albums:
+                try:
+                    profile = load_profile(inbox, argmts)
+                except ValueError as err:
+                    sys.stderr.write(f"\nERROR: {err}\n")
+                    archive(watcher, (inbox, cuefile, sources), False)
+                    continue
+                job = queue.add(cuefile, job_options({**argmts, **profile}))
+                owner[job['id']] = (inbox, cuefile, sources)
+                print(f"[{job['id']}] {cuefile}")
+            if owner:
+                logname = run_queue(queue, appdata, argmts,
+                                    os.path.basename(cuefile))[1]
+                for job in queue.snapshot():
+                    if job['status'] not in (DONE, FAILED):
+                        watcher.retry(job['cuefile'])  # never started
+                        continue
+                    if job['status'] == FAILED:
+                        sys.stderr.write(_("See Logs for details: {0}\n"
+                                           ).format(logname))
+                    archive(watcher, owner[job['id']], job['status'] == DONE)
+            watcher.wait()
+    except KeyboardInterrupt:
+        sys.stderr.write(_("\n...Stopped watching\n"))
+        return 130
+    finally:
+        watcher.close()
+# ------------------------------------------------------------------------
+
+
+def scan(argmts):
+    """
+    Runs the `scan` command, which updates the library
+    index of the given folders, see `Library`. Returns
+    the exit status code.
+    """
+    from ffaudiocue.ffc_core.library import Library
+
+    appdata = DataSource(argmts).get_configuration()
+    if appdata.get('ERROR'):
+        sys.stderr.write(f"FATAL: {appdata['ERROR']}\n")
+        return 1
+
+    gettext.translation('ffaudiocue', appdata['localepath'],
+                        fallback=True).install()
+
+    roots = [path for path in argmts['paths'] if os.path.isdir(path)]
+    for path in set(argmts['paths']).difference(roots):
+        sys.stderr.write(f"ERROR: No such directory: {path}\n")
+    if not roots:
+        return 1
+
+    library = Library(os.path.join(appdata['confdir'], 'library.sqlite'))
+    try:
+        stats = library.scan(roots, argmts['workers'], argmts['full'])
+        albums = library.albums(roots)
+    finally:
+        library.close()
+
+    done = [a for a in albums if a['split']]
+    pending = [a for a in albums if not a['split'] and a['sources']
+               and not a['missing']]
+    missing = [a for a in albums if not a['split'] and (
+        a['missing'] or not a['sources'])]
+    if argmts['pending']:
+        for album in pending:
+            print(album['cuefile'])
+    if argmts['missing']:
+        for album in missing:
+            names = ', '.join(album['missing']) or _('no FILE found')
+            print(f"{album['cuefile']}: {names}")
+    sys.stderr.write(_("{0} folders scanned ({1} listed, {2} CUE files "
+                       "parsed) in {3}s\n{4} CUE files: {5} split, {6} "
+                       "pending, {7} with missing audio files\n").format(
+                           stats['dirs'], stats['listed'], stats['parsed'],
+                           stats['elapsed'], len(albums),
+                           len(done),
+                           len(pending), len(missing)))
+    return 0
+# ------------------------------------------------------------------------
+
+
+def run_command(kwargs):
+    """
+    Runs the headless command of the given command line
+    arguments. Returns its exit status code, None if no
+    command is given.
+    """
+    commands = {'split': split, 'scan': scan, 'watch': watch}
+    if kwargs['command'] in ('split', 'watch') and not kwargs['copy']:
+        try:
+            check_quality(kwargs['format'], kwargs['quality'])
+        except ValueError as err:  # as the usage errors of argparse
+            sys.stderr.write(f"ffaudiocue {kwargs['command']}: error: "
+                             f"argument -q/--quality: {err}\n")
+            return 2
+    if kwargs['command'] in commands:
+        return commands[kwargs['command']](kwargs)
+    return None
+# ------------------------------------------------------------------------
+
+
+def main():
+    """
+    Without arguments starts the graphical interface,
+    the `split`, `scan` and `watch` commands run in
+    headless mode instead.
+    """
+    if not sys.argv[1:]:
+        kwargs = {'make_portable': None}
+    else:
+        kwargs = arguments()
+        if kwargs['command']:
+            sys.exit(run_command(kwargs))
+
+    from ffaudiocue import gui_app
+    gui_app.main(kwargs)
+# ------------------------------------------------------------------------
+
+
+def console_main():
+    """
+    Entry point of the `ffaudiocue-cli` console script,
+    which never starts the graphical interface: without a
+    command it shows the usage.
+    """
+    kwargs = arguments(sys.argv[1:] or ['--help'])
+    status = run_command(kwargs)
+    sys.exit(2 if status is None else status)
@@ -0,0 +1,178 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: charset_cache.py
+Porpose: remembers the character encoding of the CUE sheets
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import hashlib
+from threading import Lock
+
+# byte order marks, longest first since UTF-32LE starts as UTF-16LE
+BOMS = ((b'\x00\x00\xfe\xff', 'utf-32'),
+        (b'\xff\xfe\x00\x00', 'utf-32'),
+        (b'\xef\xbb\xbf', 'utf-8-sig'),
+        (b'\xfe\xff', 'utf-16'),
+        (b'\xff\xfe', 'utf-16'),
+        )
+
+
+def sniff_encoding(data):
+    """
+    Returns the encoding of the given bytes when it is
+    certain without detection, i.e. they start with a byte
+    order mark or are pure ASCII, None otherwise.
+    """
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+    if data.isascii():
+        return 'ascii'
+    return None
+# ------------------------------------------------------------------------
+
+
+class CharsetCache:
+    """
+    Keeps on disk the character encoding of the CUE sheets,
+    so that the encoding detection of ffcuesplitter runs
+    only once for each CUE sheet and the encoding confirmed
+    by the user is not forgotten.
+
+    Entries are keyed by the SHA-1 hash of the file content,
+    so they follow the CUE sheets when moved or renamed.
+    Files starting with a byte order mark or pure ASCII
+    are never detected nor stored (see `sniff_encoding`).
+    Up to `maxentries` entries are kept, the least recently
+    used ones are discarded first. All methods are
+    thread-safe.
+
+    Usage:
+        >>> cache = CharsetCache('/path/to/charsets.json')
+        >>> encoding = cache.encoding(filename)
+        >>> cache.confirm(filename, 'cp1251')  # chosen by user
+    """
+
+    def __init__(self, filename=None, maxentries=2000):
+        """
+        filename: pathname of the JSON file or None
+        maxentries: max number of files kept
+        """
+        self.filename = filename
+        self.maxentries = maxentries
+        self.lock = Lock()
+        self.entries = {}  # ordered from least to most recently used
+        if filename and os.path.exists(filename):
+            try:
+                with open(filename, 'r', encoding='utf-8') as fjson:
+                    self.entries = json.load(fjson)
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+    # --------------------------------------------------------------------#
+
+    def save(self):
+        """
+        Writes the cache to the JSON file, if any.
+        """
+        if not self.filename:
+            return
+        tmp = f'{self.filename}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fjson:
+            json.dump(self.entries, fjson)
+        os.replace(tmp, self.filename)
+    # --------------------------------------------------------------------#
+
+    def put(self, key, encoding, confirmed):
+        """
+        Stores the encoding of the given hash key,
+        discarding the least recently used entries.
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = {'encoding': encoding,
+                                 'confirmed': confirmed}
+            while len(self.entries) > self.maxentries:
+                del self.entries[next(iter(self.entries))]
+            try:
+                self.save()
+            except OSError:
+                pass  # the cache is optional
+    # --------------------------------------------------------------------#
+
+    def encoding(self, filename):
+        """
+        Returns the character encoding of the given CUE file:
+        the one confirmed by the user, if any, otherwise the
+        one of its byte order mark, 'ascii' or the detected one.
+        """
+        with open(filename, 'rb') as fcue:
+            data = fcue.read()
+        key = hashlib.sha1(data).hexdigest()
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry:
+                self.entries[key] = entry  # most recently used
+        if entry and entry['confirmed']:
+            return entry['encoding']
+        sniffed = sniff_encoding(data)
+        if sniffed:
+            return sniffed
+        if entry:
+            return entry['encoding']
+
+        from charset_normalizer import detect  # on first use
+        detected = detect(data)['encoding'] or 'utf-8'
+        self.put(key, detected, False)
+        return detected
+    # --------------------------------------------------------------------#
+
+    @staticmethod
+    def key(filename):
+        """
+        Returns the hash key of the given file
+        """
+        with open(filename, 'rb') as fcue:
+            return hashlib.sha1(fcue.read()).hexdigest()
+    # --------------------------------------------------------------------#
+
+    def confirm(self, filename, encoding):
+        """
+        Stores the encoding of the given CUE file chosen
+        by the user, which always takes precedence.
+        """
+        self.put(self.key(filename), encoding, True)
+    # --------------------------------------------------------------------#
+
+    def forget(self, filename):
+        """
+        Discards the encoding stored for the given CUE file,
+        it is detected again next time.
+        """
+        key = self.key(filename)
+        with self.lock:
+            if self.entries.pop(key, None):
+                try:
+                    self.save()
+                except OSError:
+                    pass  # the cache is optional
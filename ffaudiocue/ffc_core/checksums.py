@@ -0,0 +1,299 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: checksums.py
+Porpose: computes the checksums of the PCM audio of each track
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import zlib
+import hashlib
+import tempfile
+import subprocess
+from ffaudiocue.ffc_utils.recipes import track_filename
+from ffaudiocue.ffc_core.process_limits import ProcessLimits
+try:
+    import numpy
+except ModuleNotFoundError:
+    numpy = None  # the AccurateRip checksums are not computed
+
+# AccurateRip skips about 5 sectors on the first and last track
+AR_SKIP = 5 * 588
+
+# frames read from ffmpeg at once
+CHUNK_FRAMES = 1 << 20
+
+# suffix of the sidecar file written next to the tracks
+SIDECAR_SUFFIX = '.checksums.json'
+
+
+def pcm_format(probe):
+    """
+    Returns the tuple (bits, rate, channels) of the PCM data
+    decoded from the first audio stream of the given ffprobe
+    data: 16 bits unless the source has more, in which case
+    24 or 32, 44100 Hz and 2 channels if unknown.
+    """
+    stream = next((s for s in probe.get('streams', [])
+                   if s.get('codec_type') == 'audio'), {})
+    bits = int(stream.get('bits_per_raw_sample')
+               or stream.get('bits_per_sample') or 16)
+    bits = 16 if bits <= 16 else 24 if bits <= 24 else 32
+    return (bits, int(stream.get('sample_rate') or 44100),
+            int(stream.get('channels') or 2))
+# ------------------------------------------------------------------------
+
+
+def checksum_plan(data):
+    """
+    Returns the list of the sources of the given FFCueSplitter
+    instance, with their PCM format and their tracks cut at
+    the CUE boundaries, for `compute_checksums`.
+    """
+    probes = {os.path.abspath(probe['format']['filename']): probe
+              for probe in data.probedata if 'format' in probe}
+    sources = {}
+    for track in data.audiotracks:
+        path = os.path.abspath(os.path.join(data.kwargs['dirname'],
+                                            track['FILE']))
+        if path not in sources:
+            sources[path] = {'source': path,
+                             'format': pcm_format(probes.get(path, {})),
+                             'tracks': [],
+                             }
+        suffix = data.codec_setup(track['FILE'])[1]
+        sources[path]['tracks'].append({'name': track_filename(track,
+                                                               suffix),
+                                        'start': track['START'],
+                                        'end': track.get('END'),
+                                        })
+    return list(sources.values())
+# ------------------------------------------------------------------------
+
+
+def accuraterip_skipped(pcmformat):
+    """
+    Returns the reason why the AccurateRip CRCs are not
+    computed for the given (bits, rate, channels) format,
+    None if they are.
+    """
+    if tuple(pcmformat) != (16, 44100, 2):
+        return 'not CD audio (16 bit, 44100 Hz, stereo)'
+    if numpy is None:
+        return 'NumPy is not installed'
+    return None
+# ------------------------------------------------------------------------
+
+
+class TrackSums:
+    """
+    The checksums of the PCM data of a track, updated with
+    consecutive pieces of it:
+        - MD5 and CRC32 of the PCM bytes.
+        - AccurateRip v1 and v2 CRCs, only for CD audio (16
+          bits, 44100 Hz, stereo) with NumPy available, with
+          the samples skipped on the `first` and `last` track
+          of the disc. The samples are multiplied by their
+          position with NumPy vector operations.
+    """
+
+    def __init__(self, name, framesize, first, last, accuraterip):
+        """
+        name: the output file name of the track
+        framesize: bytes of each sample frame
+        first, last: True for the first and last track of the disc
+        accuraterip: if True computes the AccurateRip CRCs
+        """
+        self.name = name
+        self.framesize = framesize
+        self.frames = 0
+        self.md5 = hashlib.md5()
+        self.crc32 = 0
+        self.accuraterip = accuraterip
+        # first position counted, as the AccurateRip reference code
+        self.start = AR_SKIP - 1 if first else 1
+        self.last = last
+        self.tail = b''  # the frames held back on the last track
+        self.position = 0  # AccurateRip position of the last frame
+        self.v1 = self.v2 = 0
+    # --------------------------------------------------------------------#
+
+    def update(self, piece):
+        """
+        Adds the given bytes-like object, a whole number
+        of frames
+        """
+        self.frames += len(piece) // self.framesize
+        self.md5.update(piece)
+        self.crc32 = zlib.crc32(piece, self.crc32)
+        if not self.accuraterip:
+            return
+        if self.last:  # the last frames are known only at the end
+            piece = self.tail + piece
+            cut = max(0, len(piece) - AR_SKIP * 4)
+            piece, self.tail = piece[:cut], piece[cut:]
+        self.add_accuraterip(piece)
+    # --------------------------------------------------------------------#
+
+    def add_accuraterip(self, piece):
+        """
+        Adds the given frames to the AccurateRip CRCs
+        """
+        samples = numpy.frombuffer(piece, dtype='<u4').astype(numpy.uint64)
+        first = self.position + 1
+        self.position += len(samples)
+        if first < self.start:
+            samples = samples[self.start - first:]
+            first = self.start
+        if not len(samples):
+            return
+        products = samples * numpy.arange(first, first + len(samples),
+                                          dtype=numpy.uint64)
+        # the sums wrap around modulo 2**64, a multiple of 2**32
+        low = int((products & numpy.uint64(0xFFFFFFFF)).sum())
+        high = int((products >> numpy.uint64(32)).sum())
+        self.v1 = (self.v1 + low) & 0xFFFFFFFF
+        self.v2 = (self.v2 + low + high) & 0xFFFFFFFF
+    # --------------------------------------------------------------------#
+
+    def result(self):
+        """
+        Returns the dict of the checksums
+        """
+        sums = {'file': self.name,
+                'frames': self.frames,
+                'md5': self.md5.hexdigest(),
+                'crc32': f'{self.crc32:08X}',
+                }
+        if self.accuraterip:
+            sums['accuraterip_v1'] = f'{self.v1:08X}'
+            sums['accuraterip_v2'] = f'{self.v2:08X}'
+        return sums
+# ------------------------------------------------------------------------
+
+
+def decode_source(source, tracks, ffmpeg_cmd, limits):
+    """
+    Decodes the given source of `checksum_plan` once with
+    ffmpeg, streaming its raw PCM through a pipe, and feeds
+    each `TrackSums` of `tracks` with its frames. Yields the
+    bytes of each chunk (e.g. for the whole rip CRC).
+    Raises OSError if ffmpeg fails.
+    """
+    bits, rate, channels = source['format']
+    framesize = bits // 8 * channels
+    bounds = []
+    for track, sums in zip(source['tracks'], tracks):
+        end = track['end']
+        bounds.append((round(track['start'] * rate / 44100),
+                       None if end is None else round(end * rate / 44100),
+                       sums))
+    cmd = limits.command([ffmpeg_cmd, '-nostdin', '-hide_banner',
+                          '-v', 'error', '-i', source['source'],
+                          '-map', '0:a:0', '-c:a', f'pcm_s{bits}le',
+                          '-ar', str(rate), '-ac', str(channels),
+                          '-f', f's{bits}le', '-'])
+    with tempfile.TemporaryFile() as errlog, \
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errlog,
+                             **limits.popen_kwargs()) as proc:
+        limits.apply(proc.pid)
+        pos = 0  # position in frames of the chunk on the source
+        while True:
+            chunk = proc.stdout.read(CHUNK_FRAMES * framesize)
+            if not chunk:
+                break
+            count = len(chunk) // framesize
+            for start, end, sums in bounds:
+                first = max(start, pos)
+                last = pos + count if end is None else min(end, pos + count)
+                if first < last:
+                    piece = memoryview(chunk)[(first - pos) * framesize:
+                                              (last - pos) * framesize]
+                    sums.update(piece)
+                    yield piece
+            pos += count
+        proc.wait()
+        errlog.seek(0)
+        errors = errlog.read().decode('utf-8', 'replace').strip()
+    if proc.returncode:
+        raise OSError(f"ffmpeg: {source['source']}: {errors}")
+# ------------------------------------------------------------------------
+
+
+def compute_checksums(plan, ffmpeg_cmd='ffmpeg', limits=None):
+    """
+    Computes the checksums of the PCM audio of all tracks of
+    the given `checksum_plan`, decoding each source once.
+    Returns a dict with the 'tracks' sums (see `TrackSums`)
+    and the 'crc32' of the whole rip, i.e. of the PCM data
+    of all tracks in a row (the "Copy CRC" of the rip logs),
+    plus the 'accuraterip_skipped' reason if the AccurateRip
+    CRCs are not computed (see `accuraterip_skipped`).
+    Raises OSError if ffmpeg fails.
+    """
+    limits = limits or ProcessLimits()
+    ntracks = sum(len(source['tracks']) for source in plan)
+    results, crc32, num, skipped = [], 0, 0, None
+    for source in plan:
+        bits, rate, channels = source['format']
+        reason = accuraterip_skipped(source['format'])
+        skipped = skipped or reason
+        accuraterip = reason is None
+        tracks = []
+        for track in source['tracks']:
+            num += 1
+            tracks.append(TrackSums(track['name'], bits // 8 * channels,
+                                    num == 1, num == ntracks, accuraterip))
+        for piece in decode_source(source, tracks, ffmpeg_cmd, limits):
+            crc32 = zlib.crc32(piece, crc32)
+        results.extend(sums.result() for sums in tracks)
+
+    sums = {'version': 1,
+            'format': dict(zip(('bits', 'rate', 'channels'),
+                               plan[0]['format'])) if plan else {},
+            'crc32': f'{crc32:08X}',
+            'tracks': results,
+            }
+    if skipped:
+        sums['accuraterip_skipped'] = skipped
+    return sums
+# ------------------------------------------------------------------------
+
+
+def write_checksums(cuefile, plan, outputdir, ffmpeg_cmd='ffmpeg',
+                    limits=None):
+    """
+    Computes the checksums of the given `checksum_plan` and
+    writes them to the sidecar JSON file of the CUE sheet
+    on `outputdir`, named after it. Returns its pathname.
+    Raises OSError on failing.
+    """
+    sums = compute_checksums(plan, ffmpeg_cmd, limits)
+    sums['cuefile'] = os.path.basename(cuefile)
+    name = os.path.splitext(os.path.basename(cuefile))[0] + SIDECAR_SUFFIX
+    filename = os.path.join(outputdir, name)
+    tmp = f'{filename}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fjson:
+        json.dump(sums, fjson, ensure_ascii=False, indent=4)
+    os.replace(tmp, filename)
+    return filename
@@ -0,0 +1,100 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: finalize.py
+Porpose: moves the split tracks to the output folder
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import errno
+import shutil
+import tempfile
+
+
+def make_staging_dir(outputdir):
+    """
+    Creates the temporary folder where the tracks are
+    written before moving them to `outputdir`. It is made
+    on the nearest existing folder of `outputdir` path, i.e.
+    on the same filesystem, so that moving the tracks is just
+    an atomic rename. If that folder is not writable it falls
+    back to the system temporary folder.
+    Returns the pathname of the folder created.
+    """
+    parent = os.path.abspath(outputdir)
+    while not os.path.isdir(parent):
+        upper = os.path.dirname(parent)
+        if upper == parent:
+            break
+        parent = upper
+    try:
+        return tempfile.mkdtemp(suffix=None, prefix='.FFaudiocue_',
+                                dir=parent)
+    except OSError:
+        return tempfile.mkdtemp(suffix=None, prefix='FFaudiocue_', dir=None)
+# ------------------------------------------------------------------------
+
+
+def existing_tracks(outputdir, tmpdir):
+    """
+    Returns a tuple of two lists, the names of all tracks
+    found in the `tmpdir` folder and the pathnames of those
+    that already exist on the `outputdir` folder.
+    """
+    tracklist = []
+    existslist = []
+
+    for track in sorted(os.listdir(tmpdir)):
+        tracklist.append(track)
+        fdest = os.path.join(outputdir, track)
+        if os.path.exists(fdest):
+            existslist.append(fdest)
+
+    return tracklist, existslist
+# ------------------------------------------------------------------------
+
+
+def move_tracks(outputdir, tmpdir, tracklist, overwrite=True):
+    """
+    Moves the given `tracklist` from the `tmpdir` folder to
+    the `outputdir` folder. If `overwrite` is False, tracks
+    already existing on the output folder are left untouched.
+    Tracks are renamed when both folders are on the same
+    filesystem (see `make_staging_dir`), otherwise copied.
+    Returns None on success, the exception object otherwise.
+    """
+    for track in tracklist:
+        orig = os.path.join(tmpdir, track)
+        dest = os.path.join(outputdir, track)
+        if not overwrite and os.path.exists(dest):
+            continue
+        try:
+            os.replace(orig, dest)
+        except OSError as error:
+            if error.errno != errno.EXDEV:
+                return error
+            try:
+                shutil.move(orig, dest)
+            except Exception as err:
+                return err
+
+    return None
@@ -0,0 +1,672 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: flac_split.py
+Porpose: splits FLAC sources copying their frames losslessly
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import mmap
+import struct
+import subprocess
+import platform
+from functools import lru_cache
+from ffcuesplitter.utils import Popen
+from ffaudiocue.ffc_utils.recipes import track_metadata, track_filename
+from ffaudiocue.ffc_core.process_limits import ProcessLimits
+
+# metadata block types
+STREAMINFO, PADDING, SEEKTABLE, VORBIS_COMMENT = 0, 1, 3, 4
+
+# the smallest block size allowed but for the last frame
+MIN_BLOCKSIZE = 16
+
+# bytes of padding left for tag editors, as ffmpeg does
+PADDING_SIZE = 8192
+
+# Vorbis comment names written by ffmpeg for the tags
+VORBIS_KEYS = {'TRACK': 'TRACKNUMBER', 'COMMENT': 'DESCRIPTION'}
+
+# block sizes of the frame header codes 1-5 and 8-15
+BLOCKSIZES = {1: 192, 2: 576, 3: 1152, 4: 2304, 5: 4608,
+              **{code: 256 << (code - 8) for code in range(8, 16)}}
+
+# generator polynomials of the CRC-8 and CRC-16 of the frames
+CRC8_POLY, CRC16_POLY = 0x107, 0x18005
+
+# the multiplicative order of x modulo CRC16_POLY
+CRC16_ORDER = 32767
+
+
+class FlacError(Exception):
+    """
+    Raised when a FLAC file cannot be split
+    """
+# ------------------------------------------------------------------------
+
+
+def _crc_table(poly, width):
+    """
+    Returns the table of the MSB-first CRC of the
+    given polynomial and width in bits
+    """
+    table = []
+    top = 1 << (width - 1)
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _bit in range(8):
+            crc = (crc << 1) ^ poly if crc & top else crc << 1
+        table.append(crc & ((1 << width) - 1))
+    return table
+# ------------------------------------------------------------------------
+
+
+CRC8_TABLE = _crc_table(CRC8_POLY, 8)
+CRC16_TABLE = _crc_table(CRC16_POLY, 16)
+
+
+def crc8(data):
+    """
+    Returns the CRC-8 of a frame header
+    """
+    crc = 0
+    for byte in data:
+        crc = CRC8_TABLE[crc ^ byte]
+    return crc
+# ------------------------------------------------------------------------
+
+
+def crc16(data):
+    """
+    Returns the CRC-16 of the given bytes of a frame
+    """
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ CRC16_TABLE[(crc >> 8) ^ byte]
+    return crc
+# ------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=None)
+def _xpow_table():
+    """
+    Returns the list of x^k modulo CRC16_POLY for each k
+    less than its order, i.e. x^k == x^(k % CRC16_ORDER)
+    """
+    table = [1]
+    for _k in range(1, CRC16_ORDER):
+        value = table[-1] << 1
+        table.append(value ^ CRC16_POLY if value & 0x10000 else value)
+    return table
+# ------------------------------------------------------------------------
+
+
+def _mulmod(poly_a, poly_b):
+    """
+    Returns the product of two polynomials of degree less
+    than 16 over GF(2) modulo CRC16_POLY
+    """
+    result = 0
+    for bit in range(15, -1, -1):
+        result <<= 1
+        if result & 0x10000:
+            result ^= CRC16_POLY
+        if poly_a >> bit & 1:
+            result ^= poly_b
+    return result
+# ------------------------------------------------------------------------
+
+
+def update_crc16(crc, oldhead, newhead, bodysize):
+    """
+    Returns the CRC-16 of a frame whose header `oldhead` is
+    replaced by `newhead`, given its previous `crc` and the
+    size of the rest of the frame, without reading it: as the
+    CRC is linear, crc(H + B) = crc(H) * x^(8 * len(B)) + crc(B)
+    """
+    shift = _xpow_table()[8 * bodysize % CRC16_ORDER]
+    return crc ^ _mulmod(crc16(oldhead) ^ crc16(newhead), shift)
+# ------------------------------------------------------------------------
+
+
+def utf8_number(value):
+    """
+    Returns the "UTF-8" coding of the frame or sample
+    number of a frame header (up to 36 bits).
+    """
+    if value < 0x80:
+        return bytes([value])
+    length = 2
+    while value >= 1 << (5 * length + 1):
+        length += 1
+    coded = [0x80 | (value >> (6 * num) & 0x3F)
+             for num in range(length - 2, -1, -1)]
+    first = (0xFF00 >> length & 0xFF) | value >> (6 * (length - 1))
+    return bytes([first] + coded)
+# ------------------------------------------------------------------------
+
+
+def parse_frame_header(buf, pos):
+    """
+    Parses the frame header at `pos` of the buffer, returns
+    a dict of its fields or None if there is no valid header.
+    """
+    try:
+        if buf[pos] != 0xFF or buf[pos + 1] & 0xFE != 0xF8:
+            return None
+        code, ratecode = buf[pos + 2] >> 4, buf[pos + 2] & 0x0F
+        if not code or ratecode == 0x0F or buf[pos + 3] & 0x01:
+            return None
+        first, length = buf[pos + 4], 1
+        if first < 0x80:
+            number = first
+        else:
+            while length < 8 and first << length & 0x80:
+                length += 1
+            if length in (1, 8):  # a continuation byte or 0xFF
+                return None
+            number = first & (0x7F >> length)
+            for byte in buf[pos + 5:pos + 4 + length]:
+                if byte & 0xC0 != 0x80:
+                    return None
+                number = number << 6 | byte & 0x3F
+        end = pos + 4 + length
+        if code == 6:
+            blocksize, end = buf[end] + 1, end + 1
+        elif code == 7:
+            blocksize, end = (buf[end] << 8 | buf[end + 1]) + 1, end + 2
+        else:
+            blocksize = BLOCKSIZES[code]
+        end += {12: 1, 13: 2, 14: 2}.get(ratecode, 0)
+        if crc8(buf[pos:end]) != buf[end]:
+            return None
+    except IndexError:  # truncated header
+        return None
+
+    return {'offset': pos,
+            'variable': bool(buf[pos + 1] & 0x01),
+            'number': number,
+            'blocksize': blocksize,
+            'head': bytes(buf[pos:end + 1]),
+            'extra': bytes(buf[pos + 4 + length:end]),
+            }
+# ------------------------------------------------------------------------
+
+
+def frame_header(head, sample, extra):
+    """
+    Returns the given frame header `head` rewritten for a
+    variable block size stream starting at `sample`, with
+    the `extra` bytes of the block size and sample rate.
+    """
+    data = (bytes([0xFF, 0xF9]) + head[2:4] + utf8_number(sample)
+            + extra)
+    return data + bytes([crc8(data)])
+# ------------------------------------------------------------------------
+
+
+def read_streaminfo(buf):
+    """
+    Parses the metadata blocks of the FLAC stream of the
+    given buffer. Returns a dict with the 'streaminfo' raw
+    block and its values, the 'seekpoints' list of tuples
+    (sample, offset) and the 'offset' of the first frame.
+    Raises FlacError if it is not a FLAC stream.
+    """
+    if buf[:4] != b'fLaC':
+        raise FlacError('Not a FLAC stream')
+    pos, info, seekpoints = 4, None, []
+    while True:
+        if pos + 4 > len(buf):
+            raise FlacError('Truncated FLAC metadata')
+        kind = buf[pos] & 0x7F
+        size = int.from_bytes(buf[pos + 1:pos + 4], 'big')
+        block = bytes(buf[pos + 4:pos + 4 + size])
+        if kind == STREAMINFO:
+            info = block
+        elif kind == SEEKTABLE:
+            for num in range(0, size - size % 18, 18):
+                sample, offset = struct.unpack('>QQ', block[num:num + 16])
+                if sample != 0xFFFFFFFFFFFFFFFF:  # placeholder point
+                    seekpoints.append((sample, offset))
+        last = buf[pos] & 0x80
+        pos += 4 + size
+        if last:
+            break
+    if not info or len(info) < 34:
+        raise FlacError('No STREAMINFO block found')
+
+    bits = int.from_bytes(info[10:18], 'big')
+    return {'streaminfo': info,
+            'maxblocksize': int.from_bytes(info[2:4], 'big'),
+            'rate': bits >> 44,
+            'channels': (bits >> 41 & 0x07) + 1,
+            'bits': (bits >> 36 & 0x1F) + 1,
+            'samples': bits & 0xFFFFFFFFF,
+            'seekpoints': sorted(seekpoints),
+            'offset': pos,
+            }
+# ------------------------------------------------------------------------
+
+
+def streaminfo_block(info, samples, blocksizes, framesizes, last=False):
+    """
+    Returns a STREAMINFO metadata block with the stream
+    parameters of `info` (see `read_streaminfo`) for the
+    given number of `samples`, min/max block sizes and
+    frame sizes. The MD5 signature is left unset.
+    """
+    bits = (info['rate'] << 44 | (info['channels'] - 1) << 41
+            | (info['bits'] - 1) << 36 | samples)
+    body = (struct.pack('>HH', *blocksizes)
+            + min(framesizes[0], 0xFFFFFF).to_bytes(3, 'big')
+            + min(framesizes[1], 0xFFFFFF).to_bytes(3, 'big')
+            + bits.to_bytes(8, 'big') + bytes(16))
+    return bytes([0x80 if last else 0]) + len(body).to_bytes(3, 'big') + body
+# ------------------------------------------------------------------------
+
+
+def vorbis_comment_block(tags):
+    """
+    Returns the VORBIS_COMMENT metadata block of the given
+    tags, named as ffmpeg does (see VORBIS_KEYS).
+    """
+    vendor = b'FFaudiocue'
+    comments = [f'{VORBIS_KEYS.get(key, key)}={val}'.encode('utf-8')
+                for key, val in tags.items() if val]
+    body = struct.pack('<I', len(vendor)) + vendor
+    body += struct.pack('<I', len(comments))
+    for comment in comments:
+        body += struct.pack('<I', len(comment)) + comment
+    return bytes([VORBIS_COMMENT]) + len(body).to_bytes(3, 'big') + body
+# ------------------------------------------------------------------------
+
+
+class FlacFrames:
+    """
+    Walks the frames of a FLAC file mapped in memory. Frames
+    are found looking for the sync code of the stream and
+    validating the CRC-8 and the frame or sample number of
+    their header, so that the compressed data is never
+    decoded. The SEEKTABLE, if any, is used to skip the
+    frames before the wanted sample.
+
+    Usage:
+        >>> with FlacFrames(filename) as flac:
+        ...     frames = flac.frames(start, end)
+    """
+
+    def __init__(self, filename):
+        """
+        filename: pathname of the FLAC file
+        """
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        try:
+            self.buf = mmap.mmap(self.file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+        except ValueError as err:  # empty file
+            self.file.close()
+            raise FlacError(f'{err}: "{filename}"') from err
+        try:
+            self.info = read_streaminfo(self.buf)
+            head = parse_frame_header(self.buf, self.info['offset'])
+            if not head:
+                raise FlacError(f'No FLAC frames found: "{filename}"')
+        except Exception:
+            self.close()
+            raise
+        self.sync = bytes(self.buf[head['offset']:head['offset'] + 2])
+        self.variable = head['variable']
+    # --------------------------------------------------------------------#
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+    # --------------------------------------------------------------------#
+
+    def close(self):
+        """
+        Unmaps and closes the file
+        """
+        self.buf.close()
+        self.file.close()
+    # --------------------------------------------------------------------#
+
+    def first_sample(self, head):
+        """
+        Returns the number of the first sample of a frame
+        """
+        if self.variable:
+            return head['number']
+        return head['number'] * self.info['maxblocksize']
+    # --------------------------------------------------------------------#
+
+    def frame_at(self, offset, sample):
+        """
+        Returns the frame header at `offset` if it starts
+        with the given `sample`, otherwise None.
+        """
+        head = parse_frame_header(self.buf, offset)
+        if head and self.first_sample(head) == sample:
+            head['sample'] = sample
+            return head
+        return None
+    # --------------------------------------------------------------------#
+
+    def next_frame(self, frame):
+        """
+        Returns the frame following the given one, with the
+        'end' offset of the given frame set, None at the end
+        of the stream.
+        """
+        sample = frame['sample'] + frame['blocksize']
+        pos = frame['offset'] + len(frame['head'])
+        while True:
+            pos = self.buf.find(self.sync, pos)
+            if pos < 0:
+                frame['end'] = len(self.buf)
+                return None
+            following = self.frame_at(pos, sample)
+            if following:
+                frame['end'] = pos
+                return following
+            pos += 1
+    # --------------------------------------------------------------------#
+
+    def frames(self, start, end=None):
+        """
+        Returns the list of the frames including the samples
+        from `start` up to `end` (the end of the stream if
+        None), each one a dict of `parse_frame_header` with
+        the 'sample' and 'end' keys added.
+        """
+        frame = self.frame_at(self.info['offset'], 0)
+        if not frame:
+            raise FlacError(f'The first frame does not start at sample '
+                            f'0: "{self.filename}"')
+        for sample, offset in self.info['seekpoints']:
+            if sample > start:
+                break
+            point = self.frame_at(self.info['offset'] + offset, sample)
+            frame = point or frame
+
+        found = []
+        while frame:
+            following = self.next_frame(frame)
+            if frame['sample'] + frame['blocksize'] > start:
+                found.append(frame)
+            if end is not None and frame['sample'] + frame['blocksize'] >= end:
+                break
+            frame = following
+        if not found:
+            raise FlacError(f'Sample {start} is beyond the end of the '
+                            f'stream: "{self.filename}"')
+        return found
+    # --------------------------------------------------------------------#
+
+    def frame_data(self, frames):
+        """
+        Returns the bytes of the given consecutive frames
+        """
+        return self.buf[frames[0]['offset']:frames[-1]['end']]
+# ------------------------------------------------------------------------
+
+
+def run_ffmpeg(args, data, limits=None):
+    """
+    Runs ffmpeg with the given arguments list feeding `data`
+    to its stdin, returns its stdout. `limits` is the optional
+    ProcessLimits of the process. Raises FlacError if ffmpeg
+    exits with error.
+    """
+    limits = limits or ProcessLimits()
+    args = limits.command(args)
+    if platform.system() == 'Windows':
+        args = subprocess.list2cmdline(args)
+    with Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+               stderr=subprocess.PIPE, **limits.popen_kwargs()) as proc:
+        limits.apply(proc.pid)
+        out, err = proc.communicate(data)
+    if proc.returncode:
+        raise FlacError(f"ffmpeg: {err.decode('utf-8', 'replace')}")
+    return out
+# ------------------------------------------------------------------------
+
+
+def reencode(flac, frames, start, end, ffmpeg, limits=None):
+    """
+    Decodes the given frames with ffmpeg and encodes again
+    the samples from `start` to `end` as FLAC frames, with
+    the optional ProcessLimits `limits`. Returns the list of
+    tuples (frame header dict, frame bytes).
+    """
+    info = flac.info
+    stream = (b'fLaC' + streaminfo_block(info, 0, (info['maxblocksize'],) * 2,
+                                         (0, 0), last=True)
+              + flac.frame_data(frames))
+    pcmfmt = 's16le' if info['bits'] == 16 else 's32le'
+    width = info['channels'] * (2 if info['bits'] == 16 else 4)
+    pcm = run_ffmpeg([ffmpeg, '-v', 'error', '-f', 'flac', '-i', 'pipe:0',
+                      '-f', pcmfmt, 'pipe:1'], stream, limits)
+    pcm = pcm[(start - frames[0]['sample']) * width:
+              (end - frames[0]['sample']) * width]
+    if len(pcm) != (end - start) * width:
+        raise FlacError(f'Cannot decode the samples {start}-{end}: '
+                        f'"{flac.filename}"')
+    args = [ffmpeg, '-v', 'error', '-f', pcmfmt, '-ar', str(info['rate']),
+            '-ac', str(info['channels']), '-i', 'pipe:0', '-c:a', 'flac']
+    if info['bits'] == 24:
+        args += ['-bits_per_raw_sample', '24']
+    if end - start >= MIN_BLOCKSIZE:
+        args += ['-frame_size', str(end - start)]  # a single frame
+    encoded = run_ffmpeg(args + ['-f', 'flac', 'pipe:1'], pcm, limits)
+
+    newinfo = read_streaminfo(encoded)
+    if (newinfo['rate'], newinfo['channels'], newinfo['bits']) != \
+            (info['rate'], info['channels'], info['bits']):
+        raise FlacError('The frames re-encoded by ffmpeg do not match '
+                        'the source stream parameters')
+    found = []
+    pos, number = newinfo['offset'], 0
+    while pos < len(encoded):
+        head = parse_frame_header(encoded, pos)
+        if not head or head['number'] != number:
+            raise FlacError('Invalid FLAC frames written by ffmpeg')
+        nextpos = encoded.find(head['head'][:2], pos + len(head['head']))
+        while nextpos >= 0:
+            following = parse_frame_header(encoded, nextpos)
+            if following and following['number'] == number + 1:
+                break
+            nextpos = encoded.find(head['head'][:2], nextpos + 1)
+        if nextpos < 0:
+            nextpos = len(encoded)
+        found.append((head, encoded[pos:nextpos]))
+        pos, number = nextpos, number + 1
+    return found
+# ------------------------------------------------------------------------
+
+
+def split_track(native):
+    """
+    Writes a track of the given `native` recipe dict (see
+    `flac_commandargs`): the frames within the track are
+    copied as they are, just renumbered, while the frames
+    across the track boundaries are re-encoded with the
+    samples of the track only. The output is a variable
+    block size stream, as the first and last frames are
+    shorter than the others.
+    This is a generator yielding the bytes of the source
+    frames done so far.
+    """
+    start, end = native['start'], native['end']
+    with FlacFrames(native['source']) as flac, \
+            open(native['output'], 'wb') as out:
+        frames = flac.frames(start, end)
+        stop = frames[-1]['sample'] + frames[-1]['blocksize']
+        end = stop if end is None else min(end, stop)
+        if end - start < MIN_BLOCKSIZE:  # not decoded by ffmpeg
+            raise FlacError(f'The track of {end - start} samples is '
+                            f'shorter than a FLAC frame: "{flac.filename}"')
+        parts = []  # (frames, first sample, end sample or None if copied)
+        first = 0
+        if start > frames[0]['sample']:
+            first = 1  # the partial frame is too short unless the last
+            while (first < len(frames) and frames[first - 1]['sample']
+                   + frames[first - 1]['blocksize'] - start < MIN_BLOCKSIZE):
+                first += 1
+            parts.append((frames[:first], start,
+                          min(end, frames[first - 1]['sample']
+                              + frames[first - 1]['blocksize'])))
+        last = len(frames)
+        if last > first and end < stop:
+            last -= 1
+        parts.append((frames[first:last], None, None))
+        if last < len(frames) and last >= first:
+            parts.append((frames[last:], frames[last]['sample'], end))
+
+        out.write(b'fLaC' + bytes(38) + vorbis_comment_block(native['tags']))
+        out.write(bytes([0x80 | PADDING]) + PADDING_SIZE.to_bytes(3, 'big'))
+        out.write(bytes(PADDING_SIZE))
+        done, sample = 0, 0
+        blocksizes, framesizes = [], []
+        for part, begin, until in parts:
+            if begin is None:
+                pieces = [(frm, flac.frame_data([frm])) for frm in part]
+            else:
+                pieces = reencode(flac, part, begin, until,
+                                  native['ffmpeg_cmd'], native.get('limits'))
+            for head, data in pieces:
+                newhead = frame_header(head['head'], sample, head['extra'])
+                body = data[len(head['head']):-2]
+                crc = update_crc16(int.from_bytes(data[-2:], 'big'),
+                                   head['head'], newhead, len(body))
+                out.write(newhead + body + crc.to_bytes(2, 'big'))
+                sample += head['blocksize']
+                blocksizes.append(head['blocksize'])
+                framesizes.append(len(newhead) + len(body) + 2)
+                if begin is None:
+                    done += len(data)
+                    yield done
+            if begin is not None:
+                done += len(flac.frame_data(part))
+                yield done
+
+        if sample != end - start:
+            raise FlacError(f'{sample} samples written instead of '
+                            f'{end - start}: "{native["output"]}"')
+        out.seek(4)
+        out.write(streaminfo_block(flac.info, sample,
+                                   (min(blocksizes[:-1] or blocksizes),
+                                    max(blocksizes)),
+                                   (min(framesizes), max(framesizes))))
+# ------------------------------------------------------------------------
+
+
+def flac_eligible(data):
+    """
+    Returns True if the tracks of the given FFCueSplitter
+    instance, already set up for the codec copy, can be cut
+    by `split_track`, that is when all sources are 16 or 24
+    bit FLAC files of one or two channels.
+    """
+    kwargs = data.kwargs
+    if kwargs['ffmpeg_add_params'].strip() not in ('-c copy', '-c:a copy'):
+        return False
+    for source in {track['FILE'] for track in data.audiotracks}:
+        if not source.lower().endswith('.flac'):
+            return False
+        try:
+            with FlacFrames(os.path.join(kwargs['dirname'], source)) as flac:
+                info = flac.info
+        except (OSError, FlacError):
+            return False
+        if info['bits'] not in (16, 24) or info['channels'] > 2:
+            return False
+    return True
+# ------------------------------------------------------------------------
+
+
+def flac_commandargs(splitter, audiotracks, total=None):
+    """
+    Builds the native recipes cutting the given tracks out
+    of their FLAC sources (see `flac_eligible`). The CUE
+    times, given as samples at 44.1kHz by ffcuesplitter, are
+    turned into samples of the source.
+
+    Each recipe has a 'native' dict in place of the ffmpeg
+    command (see `pcm_commandargs`), whose 'size' is just an
+    estimate of the bytes of the source frames of the track.
+    The tracks shorter than `MIN_BLOCKSIZE` samples, which
+    `split_track` cannot write, get the ffmpeg recipe. The
+    ffmpeg processes re-encoding the boundary frames get the
+    ProcessLimits 'limits' of the splitter kwargs, if any.
+
+    Returns:
+        dict(recipes) in the same form of `commandargs`.
+    """
+    kwargs = splitter.kwargs
+    total = total or len(audiotracks)
+    sources = {}
+    data = []
+    fallback = None  # the ffmpeg recipes of the tracks by name
+    for track in audiotracks:
+        fpath = os.path.join(kwargs['dirname'], track['FILE'])
+        if fpath not in sources:
+            with FlacFrames(fpath) as flac:
+                sources[fpath] = dict(flac.info, size=len(flac.buf))
+        info = sources[fpath]
+        start = round(track['START'] * info['rate'] / 44100)
+        end = None
+        if 'END' in track:
+            end = round(track['END'] * info['rate'] / 44100)
+        samples = (end or info['samples']) - start
+        rate = (info['size'] - info['offset']) / (info['samples'] or 1)
+        name = track_filename(track, splitter.codec_setup(track['FILE'])[1])
+        if samples < MIN_BLOCKSIZE:
+            if fallback is None:
+                recipes = splitter.commandargs(splitter.audiotracks)
+                fallback = {rec[1]['titletrack']: rec
+                            for rec in recipes['recipes']}
+            data.append(fallback[name])
+            continue
+        output = os.path.join(kwargs['tempdir'], name)
+        native = {'split': split_track,
+                  'source': fpath,
+                  'start': start,
+                  'end': end,
+                  'output': output,
+                  'tags': track_metadata(track, total),
+                  'ffmpeg_cmd': kwargs['ffmpeg_cmd'],
+                  'limits': kwargs.get('limits'),
+                  'size': max(round(samples * rate), 1),
+                  }
+        cmd = (f'FLAC frame copy "{fpath}" samples {start}-{end or ""} '
+               f'"{output}"')
+        data.append((cmd, {'duration': track['DURATION'],
+                           'titletrack': name,
+                           'native': native,
+                           }))
+
+    return {'recipes': data}
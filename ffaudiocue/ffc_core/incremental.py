@@ -0,0 +1,196 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: incremental.py
+Porpose: skips the tracks unchanged since the last split
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import hashlib
+from ffaudiocue.ffc_utils.recipes import track_metadata, track_filename
+from ffaudiocue.ffc_core.finalize import move_tracks
+
+# the manifest file name on the destination folder
+MANIFEST_NAME = '.ffaudiocue.json'
+
+# what to do with a track, see `Manifest.state`
+ENCODE, RETAG, SKIP = 'encode', 'retag', 'skip'
+
+
+def digest(obj):
+    """
+    Returns the SHA-1 hex digest of the given
+    JSON serializable object.
+    """
+    text = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+# ------------------------------------------------------------------------
+
+
+def track_fingerprints(data):
+    """
+    Returns a dict with the output file name of each track
+    of the given FFCueSplitter instance as key and its
+    fingerprint as value, that is a dict of two digests:
+        'encode': the source file identity (pathname, size
+                  and modification time), the time range
+                  and the codec parameters of the track.
+        'tags': the metadata written to the track.
+    """
+    kwargs = data.kwargs
+    sources = {}
+    fingerprints = {}
+    for track in data.audiotracks:
+        codec, suffix = data.codec_setup(track['FILE'])
+        fpath = os.path.abspath(os.path.join(kwargs['dirname'],
+                                             track['FILE']))
+        if fpath not in sources:
+            stat = os.stat(fpath)
+            sources[fpath] = [fpath, stat.st_size, stat.st_mtime_ns]
+        encode = {'source': sources[fpath],
+                  'start': track['START'],
+                  'end': track.get('END'),
+                  'codec': codec,
+                  'params': kwargs['ffmpeg_add_params'],
+                  }
+        tags = track_metadata(track, len(data.audiotracks))
+        name = track_filename(track, suffix)
+        fingerprints[name] = {'encode': digest(encode), 'tags': digest(tags)}
+
+    return fingerprints
+# ------------------------------------------------------------------------
+
+
+class Manifest:
+    """
+    The manifest of the tracks written by FFaudiocue on a
+    destination folder, stored on it as `MANIFEST_NAME`:
+
+        {'01 - Title.flac': {'encode': digest,
+                             'tags': digest,
+                             'size': 1234,
+                             'mtime_ns': 1700000000000000000,
+                             },
+         ...}
+
+    The size and modification time tell whether the track was
+    changed since then, e.g. by a tag editor, in that case it
+    is no longer considered written by FFaudiocue.
+
+    Usage:
+        >>> manifest = Manifest(outputdir)
+        >>> args = get_recipes(data, singlepass, manifest)
+        ...
+        >>> manifest.replace_owned(tmpdir)
+        >>> move_tracks(outputdir, tmpdir, tracklist, overwrite)
+        >>> manifest.commit(args['fingerprints'], tmpdir)
+    """
+
+    def __init__(self, outputdir):
+        """
+        outputdir: the destination folder of the tracks
+        """
+        self.outputdir = outputdir
+        self.filename = os.path.join(outputdir, MANIFEST_NAME)
+        self.entries = {}
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as fjson:
+                self.entries = json.load(fjson)
+        except (OSError, ValueError):
+            pass
+    # --------------------------------------------------------------------#
+
+    def owned(self, name):
+        """
+        Returns True if the track `name` on the destination
+        folder is unchanged since FFaudiocue wrote it.
+        """
+        entry = self.entries.get(name)
+        try:
+            stat = os.stat(os.path.join(self.outputdir, name))
+        except OSError:
+            return False
+        return bool(entry and entry['size'] == stat.st_size
+                    and entry['mtime_ns'] == stat.st_mtime_ns)
+    # --------------------------------------------------------------------#
+
+    def state(self, name, fingerprint):
+        """
+        Returns SKIP if the track `name` on the destination
+        folder has the given fingerprint, RETAG if only its
+        tags differ, ENCODE otherwise.
+        """
+        if not self.owned(name):
+            return ENCODE
+        entry = self.entries[name]
+        if entry['encode'] != fingerprint['encode']:
+            return ENCODE
+        if entry['tags'] != fingerprint['tags']:
+            return RETAG
+        return SKIP
+    # --------------------------------------------------------------------#
+
+    def replace_owned(self, tmpdir):
+        """
+        Moves the tracks of `tmpdir` replacing those owned on
+        the destination folder, which are just new versions of
+        the same tracks, so that only the tracks written by
+        someone else need to be confirmed by the user.
+        Returns None on success, the exception object otherwise.
+        """
+        owned = [name for name in sorted(os.listdir(tmpdir))
+                 if self.owned(name)]
+        return move_tracks(self.outputdir, tmpdir, owned)
+    # --------------------------------------------------------------------#
+
+    def commit(self, fingerprints, tmpdir, failed=()):
+        """
+        Records the tracks written to `tmpdir` and then moved to
+        the destination folder with the given fingerprints (see
+        `get_recipes`), then saves the manifest. Tracks left on
+        `tmpdir`, i.e. not overwritten, are not recorded. The
+        `failed` tracks (e.g. that failed verification) are
+        still owned but never match a fingerprint, so they are
+        encoded and replaced next time.
+        """
+        left = set(os.listdir(tmpdir)) if os.path.isdir(tmpdir) else set()
+        for name, fingerprint in fingerprints.items():
+            if name in left:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.outputdir, name))
+            except OSError:
+                continue
+            self.entries[name] = {'size': stat.st_size,
+                                  'mtime_ns': stat.st_mtime_ns,
+                                  **fingerprint,
+                                  }
+        for name in failed:
+            if name in self.entries:
+                self.entries[name]['encode'] = None
+        if not os.path.isdir(self.outputdir):
+            return
+        tmp = f'{self.filename}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fjson:
+            json.dump(self.entries, fjson, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.filename)
@@ -0,0 +1,345 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_logs.py
+Porpose: rotating log files of the split jobs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import gzip
+import json
+import time
+import shutil
+from contextlib import contextmanager
+from threading import Lock
+from ffaudiocue.ffc_core.journal import lock_file
+
+LOGSUBDIR = 'jobs'  # sub-directory of the log directory
+INDEXNAME = 'index.json'
+
+
+class RotatingLog:
+    """
+    A text log file which is rotated as soon as its size
+    exceeds `maxbytes`: the file is renamed to `.1`, the
+    previous `.1` to `.2` and so on, while the ones beyond
+    `backups` are removed. The rotated files can be
+    compressed with gzip (e.g. `.1.gz`). Thus a log never
+    takes more than about `maxbytes * (backups + 1)` bytes.
+    Writing is thread-safe.
+
+    Usage:
+        >>> log = RotatingLog('/path/to/file.log', maxbytes=1048576)
+        >>> log.write('some text')
+    """
+
+    def __init__(self, filename, maxbytes=1048576, backups=3,
+                 compress=False):
+        """
+        filename: pathname of the log file
+        maxbytes: size of the rotated files, 0 means no rotation
+        backups: max number of rotated files kept
+        compress: if True the rotated files are compressed
+        """
+        self.filename = filename
+        self.maxbytes = maxbytes
+        self.backups = backups
+        self.compress = compress
+        self.lock = Lock()
+    # --------------------------------------------------------------------#
+
+    def segment(self, num):
+        """
+        Returns the pathname of the rotated file `num`
+        """
+        suffix = '.gz' if self.compress else ''
+        return f'{self.filename}.{num}{suffix}'
+    # --------------------------------------------------------------------#
+
+    def segments(self):
+        """
+        Returns the pathnames of the rotated files
+        still existing, from the most recent one.
+        """
+        found = []
+        for num in range(1, self.backups + 1):
+            for name in (f'{self.filename}.{num}',
+                         f'{self.filename}.{num}.gz'):
+                if os.path.exists(name):
+                    found.append(name)
+        return found
+    # --------------------------------------------------------------------#
+
+    def rotate(self):
+        """
+        Renames the log file to the first rotated file,
+        shifting the others. Call it holding the lock.
+        """
+        if self.backups < 1:
+            os.remove(self.filename)
+            return
+        for name in (f'{self.filename}.{self.backups}',
+                     f'{self.filename}.{self.backups}.gz'):
+            if os.path.exists(name):
+                os.remove(name)
+        for num in range(self.backups - 1, 0, -1):
+            for suffix in ('', '.gz'):
+                name = f'{self.filename}.{num}{suffix}'
+                if os.path.exists(name):
+                    os.replace(name, f'{self.filename}.{num + 1}{suffix}')
+        if self.compress:
+            with open(self.filename, 'rb') as src, \
+                    gzip.open(self.segment(1), 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.filename)
+        else:
+            os.replace(self.filename, self.segment(1))
+    # --------------------------------------------------------------------#
+
+    def write(self, text):
+        """
+        Appends the given text to the log file, the file
+        is rotated first if the text does not fit into it.
+        """
+        data = text.encode('utf-8')
+        with self.lock:
+            try:
+                size = os.path.getsize(self.filename)
+            except OSError:
+                size = 0
+            if self.maxbytes and size and size + len(data) > self.maxbytes:
+                self.rotate()
+            with open(self.filename, 'ab') as log:
+                log.write(data)
+# ------------------------------------------------------------------------
+
+
+def read_segment(filename):
+    """
+    Returns the text of a rotated log file,
+    whether it is compressed or not.
+    """
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(filename, 'rb') as log:
+        return log.read().decode('utf-8', errors='replace')
+# ------------------------------------------------------------------------
+
+
+class JobLogs:
+    """
+    Manages the log files of the split jobs, one for each
+    job, inside the `jobs` sub-directory of the log directory.
+    An index of the jobs is kept in `index.json`, so that the
+    log viewer can list them without scanning the directory.
+    Each entry of the index is a dict like this:
+
+        {'id': '20261018-101500-1',
+         'title': 'album.cue',
+         'logfile': '20261018-101500-1.log',  # relative to the dir
+         'started': 1700000000.0,
+         'finished': 1700000100.0,  # or None if running
+         'status': 'done',  # or 'running', 'failed', 'aborted'
+         'metrics': {...},  # summary of the metrics, see `summarize`
+         }
+
+    Beyond `maxjobs` entries the oldest jobs are removed
+    with their log files. The index is read again before
+    each change holding the `index.lock` file, so the GUI,
+    the command line and the watch daemon can share it.
+
+    Usage:
+        >>> joblogs = JobLogs('/path/to/logdir')
+        >>> log = joblogs.open('album.cue')
+        >>> log.write('some text')
+        >>> joblogs.close(log, engine.run())
+    """
+
+    def __init__(self, logdir, maxbytes=1048576, backups=3,
+                 compress=False, maxjobs=50):
+        """
+        logdir: the log directory of the application
+        maxbytes, backups, compress: see `RotatingLog`
+        maxjobs: max number of jobs kept
+        """
+        self.dirname = os.path.join(logdir, LOGSUBDIR)
+        self.indexname = os.path.join(self.dirname, INDEXNAME)
+        self.lockname = f'{os.path.splitext(self.indexname)[0]}.lock'
+        self.maxbytes = maxbytes
+        self.backups = backups
+        self.compress = compress
+        self.maxjobs = maxjobs
+        self.lock = Lock()
+    # --------------------------------------------------------------------#
+
+    @contextmanager
+    def locked(self):
+        """
+        Holds the index against the other threads and
+        processes around its read-modify-write.
+        """
+        with self.lock, open(self.lockname, 'a+b') as lockfile:
+            lock_file(lockfile)
+            yield
+    # --------------------------------------------------------------------#
+
+    def jobs(self):
+        """
+        Returns the list of the index entries,
+        from the most recent one.
+        """
+        try:
+            with open(self.indexname, 'r', encoding='utf-8') as fjson:
+                entries = json.load(fjson)
+        except (OSError, json.JSONDecodeError):
+            entries = []
+        return sorted(entries, key=lambda ent: ent['started'], reverse=True)
+    # --------------------------------------------------------------------#
+
+    def save(self, entries):
+        """
+        Writes the index entries to the JSON file
+        """
+        tmp = f'{self.indexname}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fjson:
+            json.dump(entries, fjson, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.indexname)
+    # --------------------------------------------------------------------#
+
+    def logfile(self, entry):
+        """
+        Returns the pathname of the log file of the given entry
+        """
+        return os.path.join(self.dirname, entry['logfile'])
+    # --------------------------------------------------------------------#
+
+    def metricsfile(self, entry):
+        """
+        Returns the pathname of the JSON lines metrics
+        file of the given entry, see `RecipeMetrics`.
+        """
+        name = os.path.splitext(entry['logfile'])[0]
+        return os.path.join(self.dirname, f'{name}.metrics.jsonl')
+    # --------------------------------------------------------------------#
+
+    def rotating_log(self, entry):
+        """
+        Returns the RotatingLog object of the given entry
+        """
+        return RotatingLog(self.logfile(entry), self.maxbytes,
+                           self.backups, self.compress)
+    # --------------------------------------------------------------------#
+
+    def open(self, title):
+        """
+        Adds a new job entry to the index and returns its
+        RotatingLog, whose `jobid` attribute is the job id
+        and `metricsfile` the pathname of its metrics file.
+        """
+        os.makedirs(self.dirname, exist_ok=True)
+        with self.locked():
+            entries = self.jobs()
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            ids = {ent['id'] for ent in entries}
+            num = 1
+            while f'{stamp}-{num}' in ids:
+                num += 1
+            entry = {'id': f'{stamp}-{num}',
+                     'title': title,
+                     'logfile': f'{stamp}-{num}.log',
+                     'started': time.time(),
+                     'finished': None,
+                     'status': 'running',
+                     'metrics': None,
+                     }
+            entries.insert(0, entry)
+            for old in entries[self.maxjobs:]:
+                self.delete_files(old)
+            self.save(entries[:self.maxjobs])
+
+        log = self.rotating_log(entry)
+        log.jobid = entry['id']
+        log.metricsfile = self.metricsfile(entry)
+        subline = '-----------------------------'
+        log.write(f'\nFFaudiocue: Creating log file\nDate: '
+                  f'{time.strftime("%c")}\nJob: {title}\n{subline}\n\n')
+        return log
+    # --------------------------------------------------------------------#
+
+    def close(self, log, status):
+        """
+        Sets the final status of the job of the given log
+        and its metrics summary, `status` is the dict returned
+        by `SplitEngine.run`.
+        """
+        summary = status.get('metrics')
+        if status['aborted']:
+            status = 'aborted'
+        elif (status['failed'] or status['errors']
+              or status.get('albums_failed')):
+            status = 'failed'
+        else:
+            status = 'done'
+        with self.locked():
+            entries = self.jobs()
+            for entry in entries:
+                if entry['id'] == log.jobid:
+                    entry.update(status=status, finished=time.time(),
+                                 metrics=summary)
+            self.save(entries)
+    # --------------------------------------------------------------------#
+
+    def delete_files(self, entry):
+        """
+        Removes the log files of the given entry
+        """
+        log = self.rotating_log(entry)
+        for name in [log.filename, self.metricsfile(entry)] + log.segments():
+            if os.path.exists(name):
+                os.remove(name)
+    # --------------------------------------------------------------------#
+
+    def remove(self, jobids):
+        """
+        Removes the given jobs and their log files
+        """
+        if not os.path.isdir(self.dirname):
+            return
+        with self.locked():
+            entries = self.jobs()
+            for entry in entries:
+                if entry['id'] in jobids:
+                    self.delete_files(entry)
+            self.save([ent for ent in entries if ent['id'] not in jobids])
+# ------------------------------------------------------------------------
+
+
+def get_joblogs(appdata):
+    """
+    Returns the JobLogs object set up with the
+    logging options of the application settings.
+    """
+    return JobLogs(appdata['logdir'],
+                   maxbytes=appdata['logmaxsize'] * 1024,
+                   backups=appdata['logbackups'],
+                   compress=appdata['logcompress'],
+                   maxjobs=appdata['logmaxjobs'],
+                   )
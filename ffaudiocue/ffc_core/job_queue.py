@@ -0,0 +1,222 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_queue.py
+Porpose: persistent queue of CUE sheets to split
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import glob
+import json
+import time
+import sys
+from threading import RLock
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def find_cuesheets(paths):
+    """
+    Returns the list of the CUE files pathnames given by
+    `paths`, which can be CUE files, directories to be
+    searched recursively or glob patterns.
+    """
+    found = []
+    for path in paths:
+        items = glob.glob(path, recursive=True) if glob.has_magic(path) \
+            else [path]
+        for item in sorted(items):
+            if os.path.isdir(item):
+                for root, dirs, files in os.walk(item):
+                    dirs.sort()
+                    found.extend(os.path.join(root, f) for f in sorted(files)
+                                 if f.lower().endswith('.cue'))
+            elif item.lower().endswith('.cue'):
+                found.append(item)
+            else:
+                sys.stderr.write(f"Warning: skipping '{item}', "
+                                 f"not a CUE file\n")
+
+    return list(dict.fromkeys(os.path.abspath(f) for f in found))
+# ------------------------------------------------------------------------
+
+
+class JobQueue:
+    """
+    A list of split jobs, one for each CUE sheet, shared
+    by the GUI and the `QueueEngine`. Each job is a dict
+    like this:
+
+        {'id': 1,
+         'cuefile': '/path/to/album.cue',
+         'options': {...},  # see `setup_splitter`
+         'status': 'queued',  # or 'running', 'done', 'failed'
+         'progress': 0,  # percentage
+         'message': '',  # error message or output folder
+         'added': 1700000000.0,
+         }
+
+    If `filename` is given the queue is saved as JSON on each
+    change, so that it survives application restarts. Jobs
+    left running by a previous session are queued again.
+    All methods are thread-safe.
+
+    Usage:
+        >>> queue = JobQueue('/path/to/jobqueue.json')
+        >>> job = queue.add('/path/to/album.cue', options)
+        >>> job = queue.next_job()  # the job is set as running
+    """
+
+    def __init__(self, filename=None):
+        """
+        filename: pathname of the JSON file or None
+        """
+        self.filename = filename
+        self.lock = RLock()
+        self.jobs = []
+        if filename and os.path.exists(filename):
+            try:
+                with open(filename, 'r', encoding='utf-8') as fjson:
+                    self.jobs = json.load(fjson)
+            except (OSError, json.JSONDecodeError):
+                self.jobs = []
+            for job in self.jobs:
+                if job['status'] == RUNNING:
+                    job.update(status=QUEUED, progress=0)
+    # --------------------------------------------------------------------#
+
+    def save(self):
+        """
+        Writes the queue to the JSON file, if any.
+        """
+        if not self.filename:
+            return
+        with self.lock:
+            tmp = f'{self.filename}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as fjson:
+                json.dump(self.jobs, fjson, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.filename)
+    # --------------------------------------------------------------------#
+
+    def add(self, cuefile, options):
+        """
+        Appends a new job for `cuefile` using the `options`
+        dict and returns it. Returns None if the same CUE
+        file is already waiting or running.
+        """
+        cuefile = os.path.abspath(cuefile)
+        with self.lock:
+            for job in self.jobs:
+                if (job['cuefile'] == cuefile
+                        and job['status'] in (QUEUED, RUNNING)):
+                    return None
+            jobid = max((job['id'] for job in self.jobs), default=0) + 1
+            job = {'id': jobid,
+                   'cuefile': cuefile,
+                   'options': dict(options),
+                   'status': QUEUED,
+                   'progress': 0,
+                   'message': '',
+                   'added': time.time(),
+                   }
+            self.jobs.append(job)
+            self.save()
+        return job
+    # --------------------------------------------------------------------#
+
+    def get(self, jobid):
+        """
+        Returns the job with the given id or None
+        """
+        with self.lock:
+            for job in self.jobs:
+                if job['id'] == jobid:
+                    return job
+        return None
+    # --------------------------------------------------------------------#
+
+    def update(self, jobid, save=True, **fields):
+        """
+        Updates the given fields of the job, e.g.
+        `queue.update(1, status=DONE, message='')`
+        """
+        with self.lock:
+            job = self.get(jobid)
+            if job:
+                job.update(fields)
+                if save:
+                    self.save()
+    # --------------------------------------------------------------------#
+
+    def remove(self, jobids):
+        """
+        Removes the given jobs, except those running.
+        """
+        with self.lock:
+            self.jobs = [job for job in self.jobs if job['id'] not in jobids
+                         or job['status'] == RUNNING]
+            self.save()
+    # --------------------------------------------------------------------#
+
+    def clear_finished(self):
+        """
+        Removes all the jobs successfully done.
+        """
+        with self.lock:
+            self.jobs = [job for job in self.jobs if job['status'] != DONE]
+            self.save()
+    # --------------------------------------------------------------------#
+
+    def retry(self, jobids):
+        """
+        Queues again the given failed or done jobs.
+        """
+        with self.lock:
+            for job in self.jobs:
+                if job['id'] in jobids and job['status'] in (FAILED, DONE):
+                    job.update(status=QUEUED, progress=0, message='')
+            self.save()
+    # --------------------------------------------------------------------#
+
+    def next_job(self):
+        """
+        Returns the first job waiting, setting it as running,
+        or None if there are no more jobs waiting.
+        """
+        with self.lock:
+            for job in self.jobs:
+                if job['status'] == QUEUED:
+                    job.update(status=RUNNING, progress=0, message='')
+                    self.save()
+                    return job
+        return None
+    # --------------------------------------------------------------------#
+
+    def snapshot(self):
+        """
+        Returns a copy of the jobs list
+        """
+        with self.lock:
+            return [dict(job) for job in self.jobs]
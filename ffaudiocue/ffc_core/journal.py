@@ -0,0 +1,340 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: journal.py
+Porpose: crash-safe journal of the split jobs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import glob
+import shutil
+import hashlib
+import tempfile
+import platform
+from threading import Lock
+if platform.system() == 'Windows':
+    import msvcrt
+else:
+    import fcntl
+
+# name prefixes of the temporary folders, see `make_staging_dir`
+TEMP_PREFIXES = ('.FFaudiocue_', 'FFaudiocue_')
+
+
+def file_checksum(filename):
+    """
+    Returns the SHA-256 hex digest of the given file
+    """
+    sha = hashlib.sha256()
+    with open(filename, 'rb') as fbin:
+        for chunk in iter(lambda: fbin.read(1048576), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+# ------------------------------------------------------------------------
+
+
+def recipe_outputs(recipe):
+    """
+    Returns the file names written by the given recipe
+    """
+    return recipe[1].get('outputs', [recipe[1]['titletrack']])
+# ------------------------------------------------------------------------
+
+
+def try_lock(fileobj):
+    """
+    Locks the given open file without waiting, returns
+    False if it is already locked by another process.
+    The lock is released when the file is closed or
+    the process terminates.
+    """
+    try:
+        if platform.system() == 'Windows':
+            msvcrt.locking(fileobj.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fileobj.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+# ------------------------------------------------------------------------
+
+
+def lock_file(fileobj):
+    """
+    Locks the given open file, waiting for other processes
+    to release it (on MS Windows up to about 10 seconds,
+    then OSError is raised). The lock is released when the
+    file is closed or the process terminates.
+    """
+    if platform.system() == 'Windows':
+        msvcrt.locking(fileobj.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        fcntl.flock(fileobj.fileno(), fcntl.LOCK_EX)
+# ------------------------------------------------------------------------
+
+
+class JobJournal:
+    """
+    The journal of a single split job, a JSON file like this:
+
+        {'cuefile': '/path/to/album.cue',
+         'options': {...},  # see `setup_splitter`
+         'outputdir': '/path/to/destination',
+         'tempdir': '/path/to/.FFaudiocue_xxxx',
+         'started': 1700000000.0,
+         'recipes': [{'outputs': ['01 - Title.flac'],
+                      'done': {'01 - Title.flac': [size, sha256]},
+                      },  # 'done' is None until the recipe ends
+                     ...],
+         }
+
+    The file is rewritten atomically as each recipe ends, so
+    after a crash it tells which tracks on the temporary folder
+    are complete. A companion `.lock` file is kept locked while
+    the job is running, so a journal whose lock can be taken
+    belongs to an interrupted job (see `Journals`).
+    """
+
+    def __init__(self, filename, data, lockfile):
+        """
+        filename: pathname of the JSON file
+        data: the journal dict
+        lockfile: the open and locked `.lock` file
+        """
+        self.filename = filename
+        self.data = data
+        self.lockfile = lockfile
+        self.lock = Lock()
+    # --------------------------------------------------------------------#
+
+    def save(self):
+        """
+        Writes the journal to disk, flushing it before
+        replacing the previous one. Call it holding the lock.
+        """
+        tmp = f'{self.filename}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fjson:
+            json.dump(self.data, fjson, ensure_ascii=False, indent=1)
+            fjson.flush()
+            os.fsync(fjson.fileno())
+        os.replace(tmp, self.filename)
+    # --------------------------------------------------------------------#
+
+    def record_done(self, index):
+        """
+        Records the recipe `index` as done, with the size
+        and checksum of its files on the temporary folder.
+        """
+        recipe = self.data['recipes'][index]
+        files = {}
+        for name in recipe['outputs']:
+            fname = os.path.join(self.data['tempdir'], name)
+            files[name] = [os.path.getsize(fname), file_checksum(fname)]
+        with self.lock:
+            recipe['done'] = files
+            self.save()
+    # --------------------------------------------------------------------#
+
+    def completed(self, recipes):
+        """
+        Returns the set of indexes of the given `recipes`
+        already done, whose files are still unchanged on the
+        temporary folder. Nothing is done if the recipes do
+        not write the same files as the journaled ones.
+        """
+        journaled = [rec['outputs'] for rec in self.data['recipes']]
+        if journaled != [recipe_outputs(rec) for rec in recipes]:
+            return set()
+        done = set()
+        for index, recipe in enumerate(self.data['recipes']):
+            if not recipe['done']:
+                continue
+            for name, (size, checksum) in recipe['done'].items():
+                fname = os.path.join(self.data['tempdir'], name)
+                if (not os.path.isfile(fname)
+                        or os.path.getsize(fname) != size
+                        or file_checksum(fname) != checksum):
+                    break
+            else:
+                done.add(index)
+        return done
+    # --------------------------------------------------------------------#
+
+    def release(self):
+        """
+        Unlocks the journal, leaving it on disk
+        so that the job can be resumed.
+        """
+        if self.lockfile:
+            self.lockfile.close()
+            self.lockfile = None
+    # --------------------------------------------------------------------#
+
+    def close(self):
+        """
+        Removes the journal, e.g. when the job is finished.
+        """
+        for name in (self.filename, f'{self.filename}.tmp'):
+            if os.path.exists(name):
+                os.remove(name)
+        self.release()
+        lockname = f'{os.path.splitext(self.filename)[0]}.lock'
+        if os.path.exists(lockname):
+            try:
+                os.remove(lockname)
+            except OSError:  # e.g. locked again on MS Windows
+                pass
+    # --------------------------------------------------------------------#
+
+    def discard(self):
+        """
+        Removes the journal and the temporary folder
+        """
+        shutil.rmtree(self.data['tempdir'], ignore_errors=True)
+        self.close()
+# ------------------------------------------------------------------------
+
+
+class Journals:
+    """
+    Manages the journals of the split jobs, stored as
+    `<id>.json` files on the given folder (see `JobJournal`).
+
+    Usage:
+        >>> journals = Journals('/path/to/confdir/journal')
+        >>> journal = journals.begin(cuefile, options, outputdir,
+                                     tempdir, recipes)
+        >>> journal.record_done(0)
+        >>> journal.close()  # the job is finished
+
+        After a crash:
+
+        >>> for journal in journals.interrupted():
+        ...     done = journal.completed(recipes)
+    """
+
+    def __init__(self, dirname):
+        """
+        dirname: the folder of the journals
+        """
+        self.dirname = dirname
+    # --------------------------------------------------------------------#
+
+    def begin(self, cuefile, options, outputdir, tempdir, recipes):
+        """
+        Creates the journal of a new job writing the given
+        recipes to `tempdir`, returns the JobJournal.
+        """
+        os.makedirs(self.dirname, exist_ok=True)
+        name = os.path.basename(tempdir).lstrip('.')
+        filename = os.path.join(self.dirname, f'{name}.json')
+        lockfile = open(os.path.join(self.dirname, f'{name}.lock'), 'a+b')
+        try_lock(lockfile)
+        data = {'cuefile': cuefile,
+                'options': options,
+                'outputdir': outputdir,
+                'tempdir': tempdir,
+                'started': time.time(),
+                'recipes': [{'outputs': recipe_outputs(rec), 'done': None}
+                            for rec in recipes],
+                }
+        journal = JobJournal(filename, data, lockfile)
+        with journal.lock:
+            journal.save()
+        return journal
+    # --------------------------------------------------------------------#
+
+    def interrupted(self):
+        """
+        Returns the list of the JobJournal of the interrupted
+        jobs, that is those no process is running, locking
+        them. Journals unreadable are removed.
+        """
+        found = []
+        for filename in sorted(glob.glob(os.path.join(self.dirname,
+                                                      '*.json'))):
+            lockname = f'{os.path.splitext(filename)[0]}.lock'
+            lockfile = open(lockname, 'a+b')
+            if not try_lock(lockfile):
+                lockfile.close()  # still running
+                continue
+            try:
+                with open(filename, 'r', encoding='utf-8') as fjson:
+                    data = json.load(fjson)
+            except (OSError, json.JSONDecodeError):
+                JobJournal(filename, {}, lockfile).close()
+                continue
+            found.append(JobJournal(filename, data, lockfile))
+        return found
+    # --------------------------------------------------------------------#
+
+    def find(self, cuefile, options):
+        """
+        Returns the JobJournal of an interrupted job of the
+        same CUE file and options whose temporary folder still
+        exists, otherwise None.
+        """
+        found = None
+        for journal in self.interrupted():
+            if (not found and journal.data['cuefile'] == cuefile
+                    and journal.data['options'] == options
+                    and os.path.isdir(journal.data['tempdir'])):
+                found = journal
+            else:
+                journal.release()
+        return found
+    # --------------------------------------------------------------------#
+
+    def sweep(self, dirs=(), maxage=3600):
+        """
+        Removes the journals whose temporary folder no longer
+        exists, and the temporary folders left by crashed jobs
+        on the system temporary folder and on the given `dirs`
+        which are not referenced by any journal and older than
+        `maxage` seconds.
+        """
+        used = set()
+        for journal in self.interrupted():
+            if os.path.isdir(journal.data['tempdir']):
+                used.add(os.path.abspath(journal.data['tempdir']))
+                journal.release()
+            else:
+                journal.close()
+        for filename in glob.glob(os.path.join(self.dirname, '*.json')):
+            try:  # jobs of other running processes
+                with open(filename, 'r', encoding='utf-8') as fjson:
+                    used.add(os.path.abspath(json.load(fjson)['tempdir']))
+            except (OSError, ValueError, KeyError):
+                pass
+
+        now = time.time()
+        for dirname in {tempfile.gettempdir(), *dirs}:
+            if not dirname or not os.path.isdir(dirname):
+                continue
+            for entry in os.scandir(dirname):
+                if (entry.name.startswith(TEMP_PREFIXES)
+                        and entry.is_dir(follow_symlinks=False)
+                        and os.path.abspath(entry.path) not in used
+                        and now - entry.stat().st_mtime > maxage):
+                    shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,400 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: library.py
+Porpose: indexes the CUE sheets of a music library
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import ntpath
+import json
+import time
+import sqlite3
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from ffaudiocue.ffc_core.incremental import MANIFEST_NAME
+
+# the FILE command of a CUE sheet, the name may be unquoted
+CUE_FILE = re.compile(rb'^(?:\xef\xbb\xbf)?\s*FILE\s+(?:"([^"]*)"|(\S+))',
+                      re.M | re.I)
+
+# the text encodings tried to decode the FILE names
+ENCODINGS = ('utf-8', 'cp1252')
+
+# extensions of the audio files an image may have been converted to
+AUDIO_EXT = ('.flac', '.wav', '.ape', '.wv', '.m4a', '.tta', '.ogg',
+             '.opus', '.mp3', '.aiff', '.aif')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS albums (
+    cuefile TEXT PRIMARY KEY,
+    dirname TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sources TEXT NOT NULL,
+    missing TEXT NOT NULL,
+    split REAL,
+    outputdir TEXT
+);
+CREATE INDEX IF NOT EXISTS albums_dirname ON albums (dirname);
+"""
+
+
+def subtree(column, root):
+    """
+    Returns the SQL condition and its arguments which select
+    the rows whose `column` is the `root` folder or is under
+    it, the LIKE wildcards of the pathname are escaped.
+    """
+    escaped = re.sub(r'([\\%_])', r'\\\1', os.path.join(root, ''))
+    return (f"({column} = ? OR {column} LIKE ? ESCAPE '\\')",
+            [root, f'{escaped}%'])
+# ------------------------------------------------------------------------
+
+
+def find_entry(name, entries, lower):
+    """
+    Returns the name of `entries` matching `name`, exactly,
+    ignoring the case or with another audio file extension
+    (CUE sheets often keep the name of the ripped WAV file
+    after the image was compressed), None otherwise.
+    """
+    if name in entries:
+        return name
+    if name.lower() in lower:
+        return lower[name.lower()]
+    stem = os.path.splitext(name)[0].lower()
+    for ext in AUDIO_EXT:
+        if f'{stem}{ext}' in lower:
+            return lower[f'{stem}{ext}']
+    return None
+# ------------------------------------------------------------------------
+
+
+def resolve_sources(cuefile, entries):
+    """
+    Returns the tuple (sources, missing) with the lists of
+    the audio files referenced by the FILE commands of the
+    given CUE sheet found on its folder and of those not
+    found. `entries` is the set of the names on the folder.
+    The name bytes are decoded as UTF-8 first, as cp1252 if
+    that fails or matches nothing.
+    """
+    with open(cuefile, 'rb') as cue:
+        data = cue.read()
+    lower = {name.lower(): name for name in entries}
+    sources, missing = [], []
+    for match in CUE_FILE.finditer(data):
+        raw = match.group(1) if match.group(1) is not None else \
+            match.group(2)
+        for encoding in ENCODINGS:
+            try:
+                # the name may be a Windows pathname
+                name = ntpath.basename(raw.decode(encoding).strip())
+            except UnicodeDecodeError:
+                continue
+            found = find_entry(name, entries, lower)
+            if found:
+                sources.append(found)
+                break
+        else:
+            missing.append(raw.decode('utf-8', 'replace'))
+    return sources, missing
+# ------------------------------------------------------------------------
+
+
+def scan_dir(path, known):
+    """
+    Scans the given folder, `known` is its record of the
+    index or None. If the folder modification time equals
+    that of the record, only the CUE sheets it records are
+    checked and the folder is not listed again.
+    Runs on the worker threads, returns a dict with:
+        'path', 'mtime_ns', 'subdirs': the folder record
+        'cuefiles': dict of the CUE sheets with their record
+                    of `resolve_sources`, only if changed
+        'manifest': True if the folder has a `MANIFEST_NAME`
+        'listed': False if the folder was not listed
+    or None if the folder no longer exists.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    result = {'path': path, 'mtime_ns': mtime, 'cuefiles': {},
+              'listed': True}
+    if known and known['mtime_ns'] == mtime:
+        result['subdirs'] = known['subdirs']
+        result['listed'] = False
+        result['manifest'] = os.path.exists(os.path.join(path,
+                                                         MANIFEST_NAME))
+        for cuefile, album in known['albums'].items():
+            try:
+                stat = os.stat(cuefile)
+            except OSError:
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != album:
+                result['cuefiles'][cuefile] = stat
+        if not result['cuefiles']:
+            return result
+        entries = set(os.listdir(path))
+    else:
+        entries, subdirs, cuefiles = set(), [], {}
+        with os.scandir(path) as items:
+            for item in items:
+                entries.add(item.name)
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        subdirs.append(item.path)
+                    elif item.name.lower().endswith('.cue'):
+                        cuefiles[item.path] = item.stat()
+                except OSError:
+                    continue
+        result['subdirs'] = sorted(subdirs)
+        result['manifest'] = MANIFEST_NAME in entries
+        result['cuefiles'] = cuefiles
+
+    for cuefile, stat in result['cuefiles'].items():
+        try:
+            sources, missing = resolve_sources(cuefile, entries)
+        except OSError:
+            sources, missing = [], []
+        result['cuefiles'][cuefile] = {'size': stat.st_size,
+                                       'mtime_ns': stat.st_mtime_ns,
+                                       'sources': sources,
+                                       'missing': missing,
+                                       }
+    return result
+# ------------------------------------------------------------------------
+
+
+class Library:
+    """
+    A persistent SQLite index of the CUE sheets found on
+    the music library folders, with the audio files they
+    reference and whether they were split already.
+
+    Folders are scanned by a pool of threads. Rescans are
+    incremental: each folder is listed again only if its
+    modification time changed (i.e. files were added,
+    removed or renamed), otherwise only the folder and its
+    known CUE sheets are stat'ed.
+
+    An album is recorded as split when its job is done
+    (see `mark_split`) or when its folder has the manifest
+    of an incremental split. The index is safe to use
+    from any thread.
+
+    Usage:
+        >>> library = Library('/path/to/library.sqlite')
+        >>> stats = library.scan(['/media/music'])
+        >>> pending = library.albums(['/media/music'], pending=True)
+    """
+
+    def __init__(self, filename):
+        """
+        filename: pathname of the SQLite database
+        """
+        self.filename = filename
+        self.lock = Lock()
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        with self.lock, self.db:
+            self.db.executescript(SCHEMA)
+    # --------------------------------------------------------------------#
+
+    def close(self):
+        """
+        Closes the database
+        """
+        with self.lock:
+            self.db.close()
+    # --------------------------------------------------------------------#
+
+    def known_dirs(self, root):
+        """
+        Returns the records of the folders under `root`
+        with the size and modification time of their CUE
+        sheets, keyed by pathname.
+        """
+        known = {}
+        where, args = subtree('path', root)
+        with self.lock:
+            rows = self.db.execute(f'SELECT * FROM dirs WHERE {where}',
+                                   args).fetchall()
+            where, args = subtree('dirname', root)
+            albums = self.db.execute(f'SELECT cuefile, dirname, size, '
+                                     f'mtime_ns FROM albums WHERE {where}',
+                                     args).fetchall()
+        for row in rows:
+            known[row['path']] = {'mtime_ns': row['mtime_ns'],
+                                  'subdirs': json.loads(row['subdirs']),
+                                  'albums': {},
+                                  }
+        for row in albums:
+            if row['dirname'] in known:
+                known[row['dirname']]['albums'][row['cuefile']] = (
+                    row['size'], row['mtime_ns'])
+        return known
+    # --------------------------------------------------------------------#
+
+    def scan(self, roots, workers=8, full=False):
+        """
+        Scans the given folders recursively and updates the
+        index. With `full` all folders are listed again.
+        Returns a dict with the number of 'dirs' visited, of
+        those 'listed' and of the CUE sheets 'parsed', and
+        the 'elapsed' seconds.
+        """
+        started = time.monotonic()
+        stats = {'dirs': 0, 'listed': 0, 'parsed': 0}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for root in roots:
+                root = os.path.abspath(root)
+                known = {} if full else self.known_dirs(root)
+                visited = set()
+                pending = {pool.submit(scan_dir, root, known.get(root))}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        if not result:
+                            continue
+                        self.store(result)
+                        visited.add(result['path'])
+                        stats['dirs'] += 1
+                        stats['listed'] += result['listed']
+                        stats['parsed'] += len(result['cuefiles'])
+                        pending.update(pool.submit(scan_dir, path,
+                                                   known.get(path))
+                                       for path in result['subdirs'])
+                self.prune(root, visited)
+        stats['elapsed'] = round(time.monotonic() - started, 3)
+        return stats
+    # --------------------------------------------------------------------#
+
+    def store(self, result):
+        """
+        Stores the result of `scan_dir` on the index
+        """
+        path = result['path']
+        with self.lock, self.db:
+            self.db.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)',
+                            (path, result['mtime_ns'],
+                             json.dumps(result['subdirs'])))
+            if result['listed']:
+                kept = list(result['cuefiles'])
+                self.db.execute(f'DELETE FROM albums WHERE dirname = ? AND '
+                                f'cuefile NOT IN '
+                                f'({", ".join("?" * len(kept))})',
+                                [path] + kept)
+            for cuefile, album in result['cuefiles'].items():
+                self.db.execute('INSERT INTO albums (cuefile, dirname, size, '
+                                'mtime_ns, sources, missing) VALUES (?, ?, '
+                                '?, ?, ?, ?) ON CONFLICT (cuefile) DO UPDATE '
+                                'SET size = excluded.size, mtime_ns = '
+                                'excluded.mtime_ns, sources = '
+                                'excluded.sources, missing = '
+                                'excluded.missing',
+                                (cuefile, path, album['size'],
+                                 album['mtime_ns'],
+                                 json.dumps(album['sources']),
+                                 json.dumps(album['missing'])))
+            if result['manifest']:
+                self.db.execute('UPDATE albums SET split = ?, outputdir = ? '
+                                'WHERE dirname = ? AND split IS NULL',
+                                (time.time(), path, path))
+    # --------------------------------------------------------------------#
+
+    def prune(self, root, visited):
+        """
+        Removes from the index the folders under `root`, and
+        their CUE sheets, no longer found by the last scan.
+        """
+        where, args = subtree('path', root)
+        with self.lock, self.db:
+            rows = self.db.execute(f'SELECT path FROM dirs WHERE {where}',
+                                   args).fetchall()
+            gone = [(row['path'],) for row in rows
+                    if row['path'] not in visited]
+            self.db.executemany('DELETE FROM dirs WHERE path = ?', gone)
+            self.db.executemany('DELETE FROM albums WHERE dirname = ?', gone)
+    # --------------------------------------------------------------------#
+
+    def mark_split(self, cuefile, outputdir):
+        """
+        Records the given CUE sheet as split to `outputdir`,
+        it is added to the index if not scanned yet.
+        """
+        cuefile = os.path.abspath(cuefile)
+        try:
+            stat = os.stat(cuefile)
+        except OSError:
+            return
+        with self.lock, self.db:
+            self.db.execute('INSERT INTO albums VALUES (?, ?, ?, ?, ?, ?, '
+                            '?, ?) ON CONFLICT (cuefile) DO UPDATE SET '
+                            'split = excluded.split, outputdir = '
+                            'excluded.outputdir',
+                            (cuefile, os.path.dirname(cuefile),
+                             stat.st_size, stat.st_mtime_ns, '[]', '[]',
+                             time.time(), outputdir))
+    # --------------------------------------------------------------------#
+
+    def albums(self, roots=None, pending=False):
+        """
+        Returns the list of the albums indexed under the given
+        folders (all if None), only those not split yet and
+        with all audio files found if `pending`, each one a
+        dict with the keys 'cuefile', 'sources', 'missing',
+        'split' (time or None) and 'outputdir'.
+        """
+        query, args = 'SELECT * FROM albums', []
+        if roots:
+            where = []
+            for root in roots:
+                cond, params = subtree('dirname', os.path.abspath(root))
+                where.append(cond)
+                args += params
+            query += f' WHERE ({" OR ".join(where)})'
+        query += ' ORDER BY cuefile'
+        with self.lock:
+            rows = self.db.execute(query, args).fetchall()
+        found = []
+        for row in rows:
+            album = {'cuefile': row['cuefile'],
+                     'sources': json.loads(row['sources']),
+                     'missing': json.loads(row['missing']),
+                     'split': row['split'],
+                     'outputdir': row['outputdir'],
+                     }
+            if pending and (album['split'] or album['missing']
+                            or not album['sources']):
+                continue
+            found.append(album)
+        return found
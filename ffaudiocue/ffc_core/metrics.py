@@ -0,0 +1,222 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: metrics.py
+Porpose: timing and throughput metrics of the ffmpeg processes
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import json
+import time
+
+# keys of the recipe records added up by `summarize`
+SUMKEYS = ('duration', 'cpu_user', 'cpu_system', 'bytes_in', 'bytes_out')
+
+
+class RecipeMetrics:
+    """
+    Collects the metrics of the ffmpeg process of a single
+    recipe. The record is a dict like this:
+
+        {'type': 'recipe',
+         'index': 0,  # recipe index
+         'track': '01 - Title.flac',
+         'duration': 212.4,  # seconds of audio
+         'wall': 4.1,  # seconds elapsed
+         'cpu_user': 3.9,  # CPU seconds, None if unavailable
+         'cpu_system': 0.1,
+         'maxrss_kb': 30512,  # peak resident memory, None if unavailable
+         'bytes_in': 37473612,  # bytes read, None if unavailable
+         'bytes_out': 24309120,  # bytes written
+         'speed': 51.8,  # as reported by ffmpeg, None if not
+         'realtime': 51.8,  # duration / wall
+         'status': 0,  # exit status
+         'ffmpeg': '6.1.1',  # ffmpeg version, set by the engine
+         }
+
+    CPU times and peak memory are taken from `os.wait4` and
+    bytes read/written from `/proc/<pid>/io`, so they are
+    only available on some platforms, while speed and output
+    size come from the `speed=` and `total_size=` keys of
+    `-progress`.
+    """
+    IO_INTERVAL = 0.5  # min seconds between readings of /proc/<pid>/io
+
+    def __init__(self, index, recipe):
+        """
+        index: the recipe index
+        recipe: the dict of the recipe, see `commandargs`
+        """
+        self.started = time.monotonic()
+        self.iotime = 0.0
+        self.record = {'type': 'recipe',
+                       'index': index,
+                       'track': recipe.get('titletrack', ''),
+                       'duration': round(recipe['duration'], 3),
+                       'wall': None,
+                       'cpu_user': None,
+                       'cpu_system': None,
+                       'maxrss_kb': None,
+                       'bytes_in': None,
+                       'bytes_out': None,
+                       'speed': None,
+                       'realtime': None,
+                       'status': None,
+                       'ffmpeg': None,
+                       }
+        self.written = None  # bytes written from /proc/<pid>/io
+    # --------------------------------------------------------------------#
+
+    def progress(self, key, value):
+        """
+        Takes the interesting `-progress` keys of ffmpeg
+        """
+        if key == 'speed' and value.endswith('x'):
+            try:
+                self.record['speed'] = float(value[:-1])
+            except ValueError:
+                pass
+        elif key == 'total_size' and value.isdigit():
+            self.record['bytes_out'] = int(value)
+    # --------------------------------------------------------------------#
+
+    def sample_io(self, pid, force=False):
+        """
+        Reads the bytes read and written by the process
+        `pid` from /proc, at most every IO_INTERVAL seconds
+        unless `force` is True.
+        """
+        now = time.monotonic()
+        if not force and now - self.iotime < self.IO_INTERVAL:
+            return
+        self.iotime = now
+        try:
+            with open(f'/proc/{pid}/io', 'r', encoding='utf-8') as fio:
+                counters = dict(line.split(':') for line in fio)
+        except (OSError, ValueError):
+            return
+        self.record['bytes_in'] = int(counters['rchar'])
+        self.written = int(counters['wchar'])
+    # --------------------------------------------------------------------#
+
+    def wait(self, proc):
+        """
+        Waits for the process to terminate and returns its
+        exit status. Where possible the process is reaped by
+        `os.wait4` to get its CPU times, reading its I/O
+        counters just before.
+        """
+        if hasattr(os, 'wait4') and proc.returncode is None:
+            if hasattr(os, 'waitid'):
+                try:  # wait without reaping, /proc/<pid> still exists
+                    os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+                    self.sample_io(proc.pid, force=True)
+                except ChildProcessError:
+                    pass
+            try:
+                pid, status, usage = os.wait4(proc.pid, 0)
+            except ChildProcessError:
+                pid = 0
+            if pid:
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                self.record['cpu_user'] = round(usage.ru_utime, 3)
+                self.record['cpu_system'] = round(usage.ru_stime, 3)
+                maxrss = usage.ru_maxrss  # bytes on macOS
+                if sys.platform == 'darwin':
+                    maxrss //= 1024
+                self.record['maxrss_kb'] = maxrss
+        return proc.wait()
+    # --------------------------------------------------------------------#
+
+    def finish(self, status):
+        """
+        Completes the record with the exit `status`
+        and the time elapsed, and returns it.
+        """
+        wall = time.monotonic() - self.started
+        self.record['wall'] = round(wall, 3)
+        self.record['status'] = status
+        if self.record['bytes_out'] is None:
+            self.record['bytes_out'] = self.written
+        if wall > 0:
+            self.record['realtime'] = round(self.record['duration'] / wall, 2)
+        return self.record
+# ------------------------------------------------------------------------
+
+
+def ffmpeg_version(line):
+    """
+    Returns the version from the first line of the
+    ffmpeg log, i.e. "ffmpeg version X Copyright...",
+    otherwise None.
+    """
+    if line.startswith('ffmpeg version '):
+        return line.split()[2]
+    return None
+# ------------------------------------------------------------------------
+
+
+def summarize(records, wall):
+    """
+    Returns the summary dict of the given recipe records,
+    `wall` is the seconds elapsed by the whole job, which
+    is less than the sum of the recipes running at once.
+    """
+    summary = {'type': 'summary', 'recipes': len(records)}
+    for key in SUMKEYS:
+        values = [rec[key] for rec in records if rec[key] is not None]
+        summary[key] = round(sum(values), 3) if values else None
+    peaks = [rec['maxrss_kb'] for rec in records if rec['maxrss_kb']]
+    summary['maxrss_kb'] = max(peaks) if peaks else None
+    summary['wall'] = round(wall, 3)
+    summary['realtime'] = None
+    summary['recipes_per_sec'] = None
+    if wall > 0:
+        summary['realtime'] = round((summary['duration'] or 0) / wall, 2)
+        summary['recipes_per_sec'] = round(len(records) / wall, 3)
+    summary['errors'] = len([rec for rec in records if rec['status']])
+    summary['ffmpeg'] = next((rec['ffmpeg'] for rec in records
+                              if rec['ffmpeg']), None)
+    return summary
+# ------------------------------------------------------------------------
+
+
+def format_summary(summary):
+    """
+    Returns a short description of the given summary
+    """
+    text = _("{0} s of audio processed in {1} s"
+             ).format(round(summary['duration'] or 0, 1),
+                      round(summary['wall'], 1))
+    if summary['realtime']:
+        text += _(", {0}x realtime").format(summary['realtime'])
+    return text
+# ------------------------------------------------------------------------
+
+
+def append_jsonl(filename, record):
+    """
+    Appends the record to the given JSON lines file
+    """
+    with open(filename, 'a', encoding='utf-8') as jsonl:
+        jsonl.write(json.dumps(record, ensure_ascii=False) + '\n')
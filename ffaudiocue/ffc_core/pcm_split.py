@@ -0,0 +1,273 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: pcm_split.py
+Porpose: splits PCM WAV sources without running ffmpeg
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import errno
+import struct
+from ffaudiocue.ffc_utils.recipes import track_metadata, track_filename
+
+# bytes copied by each system call, i.e. between progress updates
+CHUNKSIZE = 8 * 1024 * 1024
+
+# errors of copy_file_range/sendfile meaning "not supported here"
+FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                   errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+# WAVE_FORMAT_PCM and the PCM sub-format of WAVE_FORMAT_EXTENSIBLE
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+KSDATAFORMAT_SUBTYPE_PCM = (b'\x01\x00\x00\x00\x00\x00\x10\x00'
+                            b'\x80\x00\x00\xaa\x00\x38\x9b\x71')
+
+# RIFF INFO chunks written by the ffmpeg wav muxer for each tag
+INFO_TAGS = (('INAM', 'TITLE'),
+             ('IART', 'ARTIST'),
+             ('IPRD', 'ALBUM'),
+             ('IPRT', 'TRACK'),
+             ('ICRD', 'DATE'),
+             ('IGNR', 'GENRE'),
+             ('ICMT', 'COMMENT'),
+             )
+
+
+class WavError(Exception):
+    """
+    Raised when a file is not a PCM WAV file
+    """
+# ------------------------------------------------------------------------
+
+
+def read_wav_header(filename):
+    """
+    Parses the RIFF chunks of the given WAV file up to its
+    'data' chunk. Returns a dict with the raw 'fmt' chunk
+    and the 'channels', 'rate', 'bits', 'block_align' values
+    of it, the 'offset' and the 'size' of the PCM data.
+    Raises WavError if the file is not an integer PCM WAV file.
+    """
+    fmt = None
+    with open(filename, 'rb') as wav:
+        riff = wav.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:] != b'WAVE':
+            raise WavError(f'Not a RIFF WAVE file: "{filename}"')
+        while True:
+            head = wav.read(8)
+            if len(head) < 8:
+                raise WavError(f'No data chunk found: "{filename}"')
+            chunkid, size = head[:4], struct.unpack('<I', head[4:])[0]
+            if chunkid == b'data':
+                break
+            body = wav.read(size + size % 2)  # chunks are word aligned
+            if chunkid == b'fmt ':
+                fmt = body[:size]
+        offset = wav.tell()
+
+    if not fmt or len(fmt) < 16:
+        raise WavError(f'No format chunk found: "{filename}"')
+    tag, channels, rate, align, bits = struct.unpack('<HHI4xHH', fmt[:16])
+    if (tag == WAVE_FORMAT_EXTENSIBLE
+            and fmt[24:40] == KSDATAFORMAT_SUBTYPE_PCM):
+        tag = WAVE_FORMAT_PCM
+    if tag != WAVE_FORMAT_PCM or not align or not rate:
+        raise WavError(f'Not an integer PCM WAV file: "{filename}"')
+    # the size may be wrong on files still being written
+    size = min(size, os.path.getsize(filename) - offset)
+
+    return {'fmt': fmt,
+            'channels': channels,
+            'rate': rate,
+            'bits': bits,
+            'block_align': align,
+            'offset': offset,
+            'size': size - size % align,
+            }
+# ------------------------------------------------------------------------
+
+
+def info_chunk(tags):
+    """
+    Returns the LIST INFO chunk of the given tags dict,
+    as written by ffmpeg, empty if there are no tags.
+    """
+    body = b''
+    for chunkid, key in INFO_TAGS:
+        value = str(tags.get(key, '')).encode('utf-8')
+        if not value:
+            continue
+        value += b'\x00'  # zero terminated string
+        body += chunkid.encode('ascii') + struct.pack('<I', len(value))
+        body += value + b'\x00' * (len(value) % 2)
+    if not body:
+        return b''
+    return b'LIST' + struct.pack('<I', len(body) + 4) + b'INFO' + body
+# ------------------------------------------------------------------------
+
+
+def wav_header(fmt, datasize, tags):
+    """
+    Returns a new WAV header up to the 'data' chunk
+    header for `datasize` bytes of PCM data.
+    """
+    fmtchunk = b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+    fmtchunk += b'\x00' * (len(fmt) % 2)
+    chunks = fmtchunk + info_chunk(tags)
+    riffsize = 4 + len(chunks) + 8 + datasize + datasize % 2
+    return (b'RIFF' + struct.pack('<I', riffsize) + b'WAVE' + chunks
+            + b'data' + struct.pack('<I', datasize))
+# ------------------------------------------------------------------------
+
+
+def copy_range(src, dst, offset, count):
+    """
+    Copies `count` bytes from the `offset` of the `src` file
+    to the current position of the `dst` file, both opened
+    unbuffered. The data never passes through userspace where
+    `os.copy_file_range` or `os.sendfile` are available,
+    otherwise it is read and written in chunks.
+    This is a generator yielding the bytes copied so far.
+    """
+    infd, outfd = src.fileno(), dst.fileno()
+    methods = []
+    if hasattr(os, 'copy_file_range'):
+        methods.append('copy_file_range')
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        methods.append('sendfile')  # to regular files on Linux only
+    copied = 0
+    while copied < count:
+        size = min(CHUNKSIZE, count - copied)
+        try:
+            if methods and methods[0] == 'copy_file_range':
+                sent = os.copy_file_range(infd, outfd, size, offset + copied)
+            elif methods:
+                sent = os.sendfile(outfd, infd, offset + copied, size)
+            else:
+                src.seek(offset + copied)
+                sent = dst.write(src.read(size))
+        except OSError as err:
+            if not methods or err.errno not in FALLBACK_ERRNOS:
+                raise
+            methods.pop(0)
+            continue
+        if not sent:
+            raise WavError(f'Unexpected end of file: "{src.name}"')
+        copied += sent
+        yield copied
+# ------------------------------------------------------------------------
+
+
+def split_track(pcm):
+    """
+    Writes a track of the given `pcm` recipe dict (see
+    `pcm_commandargs`) with a new header. This is a
+    generator yielding the bytes of PCM data written so far.
+    """
+    wav = pcm['wav']
+    begin, end = pcm['begin'], pcm['end']
+    with open(pcm['source'], 'rb', buffering=0) as src, \
+            open(pcm['output'], 'wb', buffering=0) as dst:
+        dst.write(wav_header(wav['fmt'], end - begin, pcm['tags']))
+        yield from copy_range(src, dst, begin, end - begin)
+        if (end - begin) % 2:
+            dst.write(b'\x00')  # pad byte of the data chunk
+# ------------------------------------------------------------------------
+
+
+def pcm_eligible(data):
+    """
+    Returns True if the tracks of the given FFCueSplitter
+    instance, already set up for the split, can be cut by
+    `split_track` with the same PCM data written by ffmpeg,
+    that is when all sources are integer PCM WAV files and
+    either the codec is copied or the output format is WAV
+    with default parameters and the source is 16 bit 44.1kHz.
+    """
+    kwargs = data.kwargs
+    params = kwargs['ffmpeg_add_params'].strip()
+    copy = params in ('-c copy', '-c:a copy')
+    if not copy and (params or kwargs.get('outputformat') != 'wav'):
+        return False
+    for source in {track['FILE'] for track in data.audiotracks}:
+        if not source.lower().endswith('.wav'):
+            return False
+        try:
+            wav = read_wav_header(os.path.join(kwargs['dirname'], source))
+        except (OSError, WavError):
+            return False
+        if not copy and (wav['rate'], wav['bits']) != (44100, 16):
+            return False
+    return True
+# ------------------------------------------------------------------------
+
+
+def pcm_commandargs(splitter, audiotracks, total=None):
+    """
+    Builds the native recipes cutting the given tracks out
+    of their WAV sources (see `pcm_eligible`). The CUE times,
+    given as samples at 44.1kHz by ffcuesplitter, are turned
+    into byte offsets of whole samples.
+
+    Each recipe has a 'native' dict in place of the ffmpeg
+    command, which is just a description for the log: its
+    'split' generator writes the track from the dict itself
+    and yields the bytes done out of 'size' (see `SplitEngine`).
+
+    Returns:
+        dict(recipes) in the same form of `commandargs`.
+    """
+    kwargs = splitter.kwargs
+    total = total or len(audiotracks)
+    sources = {}
+    data = []
+    for track in audiotracks:
+        fpath = os.path.join(kwargs['dirname'], track['FILE'])
+        if fpath not in sources:
+            sources[fpath] = read_wav_header(fpath)
+        wav = sources[fpath]
+        align, rate = wav['block_align'], wav['rate']
+        begin = round(track['START'] * rate / 44100) * align
+        end = wav['size']
+        if 'END' in track:
+            end = min(round(track['END'] * rate / 44100) * align, end)
+        name = track_filename(track, splitter.codec_setup(track['FILE'])[1])
+        output = os.path.join(kwargs['tempdir'], name)
+        pcm = {'split': split_track,
+               'source': fpath,
+               'wav': wav,
+               'begin': wav['offset'] + begin,
+               'end': wav['offset'] + max(end, begin),
+               'output': output,
+               'tags': track_metadata(track, total),
+               }
+        pcm['size'] = pcm['end'] - pcm['begin']
+        cmd = (f'PCM copy "{fpath}" bytes {pcm["begin"]}-{pcm["end"]} '
+               f'"{output}"')
+        data.append((cmd, {'duration': track['DURATION'],
+                           'titletrack': name,
+                           'native': pcm,
+                           }))
+
+    return {'recipes': data}
@@ -0,0 +1,135 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: probe_cache.py
+Porpose: persistent cache of the ffprobe results
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+from threading import Lock
+
+
+class ProbeCache:
+    """
+    Keeps the ffprobe data of the audio files on disk, so
+    that reloading a CUE sheet (e.g. with another character
+    encoding) does not run ffprobe again on the same large
+    CD image.
+
+    Entries are keyed by the absolute pathname and are valid
+    as long as size, modification time and inode of the file
+    are unchanged. Up to `maxentries` entries are kept, the
+    least recently used ones are discarded first. All methods
+    are thread-safe.
+
+    Usage:
+        >>> cache = ProbeCache('/path/to/probecache.json')
+        >>> probe = cache.ffprobe(filename, cmd='ffprobe')
+    """
+
+    def __init__(self, filename=None, maxentries=500):
+        """
+        filename: pathname of the JSON file or None
+        maxentries: max number of files kept
+        """
+        self.filename = filename
+        self.maxentries = maxentries
+        self.lock = Lock()
+        self.entries = {}  # ordered from least to most recently used
+        if filename and os.path.exists(filename):
+            try:
+                with open(filename, 'r', encoding='utf-8') as fjson:
+                    self.entries = json.load(fjson)
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+    # --------------------------------------------------------------------#
+
+    @staticmethod
+    def identity(filename):
+        """
+        Returns the identity of the given file as
+        list of [size, mtime_ns, inode].
+        """
+        stat = os.stat(filename)
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    # --------------------------------------------------------------------#
+
+    def save(self):
+        """
+        Writes the cache to the JSON file, if any.
+        """
+        if not self.filename:
+            return
+        tmp = f'{self.filename}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fjson:
+            json.dump(self.entries, fjson, ensure_ascii=False)
+        os.replace(tmp, self.filename)
+    # --------------------------------------------------------------------#
+
+    def get(self, filename):
+        """
+        Returns the cached ffprobe data of the given file
+        or None if missing or out of date.
+        """
+        key = os.path.abspath(filename)
+        try:
+            ident = self.identity(key)
+        except OSError:
+            return None
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if not entry or entry['identity'] != ident:
+                return None
+            self.entries[key] = entry  # most recently used
+            return entry['probe']
+    # --------------------------------------------------------------------#
+
+    def put(self, filename, probe):
+        """
+        Stores the ffprobe data of the given file,
+        discarding the least recently used entries.
+        """
+        key = os.path.abspath(filename)
+        ident = self.identity(key)
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = {'identity': ident, 'probe': probe}
+            while len(self.entries) > self.maxentries:
+                del self.entries[next(iter(self.entries))]
+            try:
+                self.save()
+            except OSError:
+                pass  # the cache is optional
+    # --------------------------------------------------------------------#
+
+    def ffprobe(self, filename, cmd='ffprobe'):
+        """
+        Same as `ffcuesplitter.ffprobe.ffprobe`,
+        but uses the cached data if available.
+        """
+        probe = self.get(filename)
+        if probe is None:
+            from ffcuesplitter.ffprobe import ffprobe  # on first use
+            probe = ffprobe(filename, cmd=cmd)
+            self.put(filename, probe)
+        return probe
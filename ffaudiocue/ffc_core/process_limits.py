@@ -0,0 +1,206 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: process_limits.py
+Porpose: limits the resources used by the ffmpeg processes
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import ctypes
+import platform
+import subprocess
+
+# I/O scheduling classes of ionice(1) that need no privileges
+IOCLASSES = ('default', 'best-effort', 'idle')
+
+# ioprio_set(2) arguments, see linux/ioprio.h
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_CLASS = {'best-effort': 2, 'idle': 3}
+
+# ioprio_set(2) system call numbers, which glibc does not wrap
+IOPRIO_SET_NR = {'x86_64': 251, 'amd64': 251, 'i386': 289, 'i686': 289,
+                 'aarch64': 30, 'arm64': 30, 'riscv64': 30,
+                 'armv7l': 314, 'ppc64le': 273, 's390x': 282,
+                 }
+
+
+def parse_cpulist(text):
+    """
+    Parses a list of CPU numbers and ranges in the form
+    of `taskset -c`, e.g. "0-3,6". Returns a set of CPU
+    numbers, empty if `text` is empty.
+    Raises ValueError if `text` is not a valid list.
+    """
+    cpus = set()
+    for item in text.replace(' ', '').split(','):
+        if not item:
+            continue
+        first, _sep, last = item.partition('-')
+        first, last = int(first), int(last or first)
+        if first < 0 or last < first:
+            raise ValueError(f'Invalid CPU range: "{item}"')
+        cpus.update(range(first, last + 1))
+    return cpus
+# ------------------------------------------------------------------------
+
+
+class ProcessLimits:
+    """
+    Limits the CPU and I/O resources of each ffmpeg process
+    run by the split engine, so that a batch split in the
+    background does not starve the rest of the machine:
+
+        nice: the niceness added to the process (0-19). On
+              MS Windows it is turned into a lower priority
+              class of the process.
+        ioclass: the I/O scheduling class (see IOCLASSES),
+                 on Linux only.
+        affinity: the CPUs the process may run on (see
+                  `parse_cpulist`), empty for all of them.
+                  Not available on MS Windows and macOS.
+        threads: the max number of threads of each ffmpeg
+                 decoder and filter graph, 0 for automatic.
+                 The audio encoders run a single thread.
+
+    The priority, I/O class and affinity are applied right
+    after the process starts, as they cannot be set safely
+    before `exec` from a multithreaded program.
+
+    Usage:
+        >>> limits = ProcessLimits.from_settings(appdata)
+        >>> cmdargs = limits.command(cmdargs)
+        >>> proc = Popen(cmdargs, **limits.popen_kwargs())
+        >>> warnings = limits.apply(proc.pid)
+    """
+
+    def __init__(self, nice=0, ioclass='default', affinity='', threads=0):
+        """
+        See the class docstring, `affinity` may be given
+        as a string or as a collection of CPU numbers.
+        Raises ValueError on invalid values.
+        """
+        if ioclass not in IOCLASSES:
+            raise ValueError(f'Invalid I/O class: "{ioclass}"')
+        self.nice = min(max(int(nice), 0), 19)
+        self.ioclass = ioclass
+        if isinstance(affinity, str):
+            affinity = parse_cpulist(affinity)
+        self.affinity = set(affinity)
+        self.threads = max(int(threads), 0)
+    # --------------------------------------------------------------------#
+
+    @classmethod
+    def from_settings(cls, appdata):
+        """
+        Returns a new instance from the `ffmpegnice`,
+        `ffmpegioclass`, `ffmpegaffinity` and `ffmpegthreads`
+        settings. Invalid settings are ignored.
+        """
+        try:
+            return cls(appdata.get('ffmpegnice', 0),
+                       appdata.get('ffmpegioclass', 'default'),
+                       appdata.get('ffmpegaffinity', ''),
+                       appdata.get('ffmpegthreads', 0))
+        except (ValueError, TypeError):
+            return cls()
+    # --------------------------------------------------------------------#
+
+    def command(self, cmdargs):
+        """
+        Returns the given ffmpeg command, a list of arguments
+        or a string on MS Windows, with the thread options
+        added after the executable.
+        """
+        if not self.threads:
+            return cmdargs
+        opts = ['-threads', str(self.threads),
+                '-filter_threads', str(self.threads),
+                '-filter_complex_threads', str(self.threads)]
+        if isinstance(cmdargs, str):  # starts with the quoted executable
+            head, sep, rest = cmdargs.partition('" ')
+            return f'{head}{sep}{" ".join(opts)} {rest}'
+        return cmdargs[:1] + opts + cmdargs[1:]
+    # --------------------------------------------------------------------#
+
+    def popen_kwargs(self):
+        """
+        Returns the keyword arguments of `Popen` setting the
+        priority class of the process on MS Windows.
+        """
+        if platform.system() != 'Windows' or not self.nice:
+            return {}
+        if self.nice >= 15:
+            return {'creationflags': subprocess.IDLE_PRIORITY_CLASS}
+        return {'creationflags': subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+    # --------------------------------------------------------------------#
+
+    def apply(self, pid):
+        """
+        Applies the niceness, the I/O class and the CPU
+        affinity to the running process `pid`. Returns the
+        list of the error messages of those that failed,
+        the process keeps running anyway.
+        """
+        errors = []
+        if platform.system() == 'Windows':
+            return errors
+        if self.nice:
+            try:
+                prio = os.getpriority(os.PRIO_PROCESS, pid)
+                os.setpriority(os.PRIO_PROCESS, pid,
+                               min(prio + self.nice, 19))
+            except OSError as err:
+                errors.append(f'nice: {err}')
+        if self.affinity:
+            try:
+                if not hasattr(os, 'sched_setaffinity'):
+                    raise OSError('CPU affinity is not supported')
+                os.sched_setaffinity(pid, self.affinity)
+            except OSError as err:
+                errors.append(f'affinity: {err}')
+        if self.ioclass != 'default':
+            try:
+                set_ioclass(pid, self.ioclass)
+            except OSError as err:
+                errors.append(f'ionice: {err}')
+        return errors
+# ------------------------------------------------------------------------
+
+
+def set_ioclass(pid, ioclass):
+    """
+    Sets the I/O scheduling class of the process `pid`
+    through the Linux ioprio_set(2) system call, with the
+    default priority level (4) of the best-effort class.
+    Raises OSError on failure or on other platforms.
+    """
+    number = IOPRIO_SET_NR.get(platform.machine().lower())
+    if not sys.platform.startswith('linux') or number is None:
+        raise OSError('I/O scheduling classes are not supported')
+    level = 4 if ioclass == 'best-effort' else 0
+    ioprio = IOPRIO_CLASS[ioclass] << IOPRIO_CLASS_SHIFT | level
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.syscall(number, IOPRIO_WHO_PROCESS, pid, ioprio) < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
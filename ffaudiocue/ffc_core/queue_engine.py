@@ -0,0 +1,426 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: queue_engine.py
+Porpose: splits many CUE sheets sharing the same workers
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import BoundedSemaphore
+from concurrent.futures import ThreadPoolExecutor
+import shutil
+import time
+from ffcuesplitter.utils import makeoutputdirs
+from ffaudiocue.ffc_core.split_engine import SplitEngine
+from ffaudiocue.ffc_core.split_args import (open_cuesheet,
+                                            setup_splitter,
+                                            get_recipes,
+                                            )
+from ffaudiocue.ffc_core.finalize import (existing_tracks,
+                                          move_tracks,
+                                          make_staging_dir,
+                                          )
+from ffaudiocue.ffc_core.incremental import Manifest
+from ffaudiocue.ffc_core.verify import (expected_tracks,
+                                        verify_tracks,
+                                        failures,
+                                        failed_names,
+                                        )
+from ffaudiocue.ffc_core.checksums import (checksum_plan,
+                                           write_checksums,
+                                           accuraterip_skipped,
+                                           )
+from ffaudiocue.ffc_core.job_queue import QUEUED, DONE, FAILED, RUNNING
+
+
+class QueueEngine(SplitEngine):
+    """
+    Splits all the jobs waiting on a `JobQueue`, spreading
+    the tracks of several albums over the same pool of
+    `workers`: the next album is loaded and its tracks are
+    scheduled while the last tracks of the previous one are
+    still running, so no worker is left idle at the end of
+    each album. Each album is moved to its destination as
+    soon as all its tracks are done. With the 'incremental'
+    option of the job, the tracks unchanged since the last
+    split are skipped (see `Manifest`). With the 'verify'
+    option, the tracks are decoded once moved and the job
+    fails if any of them is broken (see `verify_tracks`).
+    With the 'checksums' option, the PCM checksums of the
+    tracks are written next to them (see `write_checksums`).
+
+    In addition to the `SplitEngine` events, it notifies
+    the "JOB_EVT" topic with the keyword arguments `jobid`,
+    `status`, `progress` and `message` for each album.
+
+    Usage:
+        >>> engine = QueueEngine(queue, log, workers=4,
+                                 notify=callback,
+                                 ffmpeg_cmd='ffmpeg',
+                                 ffprobe_cmd='ffprobe',
+                                 ffmpeg_loglevel='info',
+                                 )
+        >>> status = engine.run()  # blocking
+    """
+
+    def __init__(self, queue, log, workers=1, notify=None, fps=10,
+                 probecache=None, metricsfile=None, journals=None,
+                 limits=None, library=None, charsets=None, **cmds):
+        """
+        queue: the JobQueue instance
+        log: the RotatingLog of the job, see `JobLogs`.
+        workers: max number of ffmpeg processes running at once.
+        notify: callable receiving the progress events.
+        fps: max number of progress events per second.
+        probecache: optional ProbeCache instance
+        metricsfile: pathname of the JSON lines metrics file.
+        journals: optional Journals instance, the albums
+                  interrupted are resumed from their journal.
+        limits: optional ProcessLimits of the ffmpeg processes.
+        library: optional Library instance, the albums done
+                 are recorded as split on it.
+        charsets: optional CharsetCache of the CUE sheets
+        cmds: ffmpeg_cmd, ffprobe_cmd and ffmpeg_loglevel
+        """
+        SplitEngine.__init__(self, {'recipes': []}, log, workers,
+                             notify, fps, metricsfile, limits=limits)
+        self.queue = queue
+        self.probecache = probecache
+        self.journals = journals
+        self.library = library
+        self.charsets = charsets
+        self.cmds = cmds
+        # ffmpeg processes running, shared by the recipes and the
+        # checks of the albums done, so they never exceed workers
+        self.procs = BoundedSemaphore(self.workers)
+        self.albums = []  # the albums scheduled
+        self.owner = {}  # the album of each recipe index
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Run all jobs waiting on the queue, including those
+        added while running, and wait for them to finish.
+        Returns the same dict of `SplitEngine.run` with the
+        number of albums 'done' and 'failed' in addition.
+        """
+        self.started = time.monotonic()
+        self.notify("COUNT_EVT", msg='', end='')
+        # recipes queued ahead of the workers, it bounds the albums
+        # loaded in advance
+        slots = BoundedSemaphore(self.workers * 2)
+        futures = []
+        jobs = []  # ids of the jobs taken from the queue
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while not (self.stop_work_thread or self.failed):
+                job = self.queue.next_job()
+                if not job:
+                    break
+                jobs.append(job['id'])
+                self.send_job(job['id'], RUNNING, 0)
+                album = self.prepare(job)
+                if not album:
+                    continue
+                if not album['recipes']:  # all tracks are unchanged
+                    self.finalize(album)
+                    continue
+                for num, recipe in enumerate(album['recipes']):
+                    slots.acquire()
+                    if self.stop_work_thread or self.failed:
+                        slots.release()
+                        break
+                    with self.lock:
+                        index = len(self.args['recipes'])
+                        self.args['recipes'].append(recipe)
+                        self.countmax += 1
+                        self.totalsecs += recipe[1]['duration']
+                        self.owner[index] = album
+                        album['indexes'].append(index)
+                        if num in album['resumed']:
+                            self.resumed.add(index)
+                    fut = pool.submit(self.encode_track, index, recipe, album)
+                    fut.add_done_callback(lambda fut: slots.release())
+                    futures.append(fut)
+
+        errors = [fut.exception() for fut in futures if fut.exception()]
+        if errors:  # unexpected exceptions raised by the workers
+            self.failed = True
+            self.notify("COUNT_EVT", msg=f'{errors[0]}', end='error')
+
+        for album in self.albums:  # albums not completed
+            if not album['finished']:
+                if self.stop_work_thread and album['journal']:
+                    album['journal'].release()  # resumed next time
+                elif album['journal']:
+                    album['journal'].discard()
+                else:
+                    shutil.rmtree(album['tempdir'], ignore_errors=True)
+                if self.stop_work_thread:
+                    self.send_job(album['job']['id'], QUEUED, 0)
+                else:
+                    self.send_job(album['job']['id'], FAILED, 0,
+                                  _("ERROR: See Logs for details"))
+
+        status = [self.queue.get(jobid)['status'] for jobid in jobs]
+        return {'aborted': self.stop_work_thread,
+                'failed': self.failed,
+                'errors': self.errors,
+                'done': status.count(DONE),
+                'albums_failed': status.count(FAILED),
+                'metrics': self.summarize_metrics(),
+                }
+    # --------------------------------------------------------------------#
+
+    def send_job(self, jobid, status, progress, message='', save=True):
+        """
+        Updates the job on the queue and notifies it.
+        """
+        self.queue.update(jobid, save=save, status=status,
+                          progress=progress, message=message)
+        self.notify("JOB_EVT", jobid=jobid, status=status,
+                    progress=progress, message=message)
+    # --------------------------------------------------------------------#
+
+    def prepare(self, job):
+        """
+        Loads the CUE sheet of the given job and builds its
+        recipes. Returns the album dict or None on error.
+        """
+        opts = job['options']
+        tmpdir, journal, resumed, manifest = None, None, set(), None
+        try:
+            data = open_cuesheet(job['cuefile'],
+                                 self.cmds['ffprobe_cmd'],
+                                 self.cmds['ffmpeg_cmd'],
+                                 self.cmds['ffmpeg_loglevel'],
+                                 opts.get('charset', 'auto'),
+                                 self.probecache,
+                                 self.charsets,
+                                 )
+            outputdir = setup_splitter(data,
+                                       ffmpeg_cmd=self.cmds['ffmpeg_cmd'],
+                                       ffmpeg_loglevel=self.cmds[
+                                           'ffmpeg_loglevel'],
+                                       limits=self.limits,
+                                       **opts)
+            if self.journals:
+                journal = self.journals.find(job['cuefile'], opts)
+            if journal and journal.data['outputdir'] == outputdir:
+                tmpdir = journal.data['tempdir']
+            elif journal:
+                journal.discard()
+                journal = None
+            if not tmpdir:
+                tmpdir = make_staging_dir(outputdir)
+            data.kwargs['tempdir'] = tmpdir
+            if opts.get('incremental'):
+                manifest = Manifest(outputdir)
+            args = get_recipes(data, opts.get('singlepass'), manifest)
+            recipes = args['recipes']
+            if journal:
+                resumed = journal.completed(recipes)
+                if not resumed:  # recipes changed, start over
+                    journal.close()
+                    journal = None
+            if self.journals and not journal:
+                journal = self.journals.begin(job['cuefile'], opts,
+                                              outputdir, tmpdir, recipes)
+        except Exception as err:
+            if journal:
+                journal.discard()
+            elif tmpdir:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+            with self.lock:
+                self.log.write(f"\n[ERROR]: {job['cuefile']}\n{err}\n")
+            self.send_job(job['id'], FAILED, 0, str(err))
+            return None
+
+        album = {'job': job,
+                 'recipes': recipes,
+                 'outputdir': outputdir,
+                 'tempdir': tmpdir,
+                 'journal': journal,
+                 'resumed': resumed,
+                 'manifest': manifest,
+                 'fingerprints': args.get('fingerprints', {}),
+                 'skipped': args.get('skipped', []),
+                 'tracks': (expected_tracks(data, outputdir)
+                            if opts.get('verify') else []),
+                 'plan': (checksum_plan(data)
+                          if opts.get('checksums') else None),
+                 'duration': sum(rec[1]['duration'] for rec in recipes),
+                 'indexes': [],
+                 'pending': len(recipes),
+                 'success': True,
+                 'progress': 0,
+                 'finished': False,
+                 }
+        self.albums.append(album)
+        return album
+    # --------------------------------------------------------------------#
+
+    def encode_track(self, index, recipe, album):
+        """
+        Runs a recipe of the given album on a worker thread,
+        the album is finalized by its last recipe, unless
+        interrupted by the user.
+        """
+        success = False
+        try:
+            with self.procs:
+                success = self.encode(index, recipe)
+        finally:
+            with self.lock:
+                album['pending'] -= 1
+                album['success'] = album['success'] and success
+                last = album['pending'] == 0
+            if last and (album['success'] or not self.stop_work_thread):
+                self.finalize(album)
+    # --------------------------------------------------------------------#
+
+    def finalize(self, album):
+        """
+        Moves the tracks of the given album to its destination
+        folder according to the 'overwrite' option of the job.
+        """
+        jobid = album['job']['id']
+        overwrite = album['job']['options'].get('overwrite') == 'always'
+        outputdir, tmpdir = album['outputdir'], album['tempdir']
+        try:
+            if not album['success']:
+                self.send_job(jobid, FAILED, album['progress'],
+                              _("ERROR: See Logs for details"))
+                return
+            makeoutputdirs(outputdir)  # if doesn't exists
+            manifest = album['manifest']
+            ret = manifest.replace_owned(tmpdir) if manifest else None
+            tracklist, existslist = existing_tracks(outputdir, tmpdir)
+            ret = ret or move_tracks(outputdir, tmpdir, tracklist, overwrite)
+            failed = self.verify(album) if album['tracks'] and not ret else []
+            if manifest:
+                manifest.commit(album['fingerprints'], tmpdir, failed)
+            if ret:
+                self.send_job(jobid, FAILED, 100, str(ret))
+                return
+            if failed:
+                return
+            if album['plan'] and not self.checksums(album):
+                return
+            if self.library:
+                self.library.mark_split(album['job']['cuefile'], outputdir)
+            if existslist and not overwrite:
+                msg = _("{0} tracks already exist, skipped: {1}"
+                        ).format(len(existslist), outputdir)
+                self.send_job(jobid, DONE, 100, msg)
+            elif album['skipped']:
+                msg = _("{0} unchanged tracks skipped: {1}"
+                        ).format(len(album['skipped']), outputdir)
+                self.send_job(jobid, DONE, 100, msg)
+            else:
+                self.send_job(jobid, DONE, 100, outputdir)
+        except Exception as err:
+            self.send_job(jobid, FAILED, album['progress'], str(err))
+        finally:
+            album['finished'] = True
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            if album['journal']:
+                album['journal'].close()
+    # --------------------------------------------------------------------#
+
+    def verify(self, album):
+        """
+        Decodes the tracks of the given album moved to its
+        destination, see `verify_tracks`. Returns the list of
+        the names of the tracks that failed, if any logs the
+        failures and sets the job as failed.
+        """
+        results = verify_tracks(album['tracks'], self.cmds['ffmpeg_cmd'],
+                                self.workers, limits=self.limits,
+                                semaphore=self.procs)
+        failed = failures(results)
+        if not failed:
+            return []
+        with self.lock:
+            self.log.write(f"\n[VERIFY]: {album['job']['cuefile']}\n"
+                           + '\n'.join(failed) + '\n')
+        self.send_job(album['job']['id'], FAILED, 100,
+                      _("{0} of {1} tracks failed verification, see Logs "
+                        "for details").format(len(failed), len(results)))
+        return failed_names(results)
+    # --------------------------------------------------------------------#
+
+    def checksums(self, album):
+        """
+        Writes the PCM checksums of the tracks of the given
+        album next to them, see `write_checksums`. Returns
+        True on success, otherwise logs the error, sets the
+        job as failed and returns False.
+        """
+        cuefile = album['job']['cuefile']
+        try:
+            with self.procs:
+                write_checksums(cuefile, album['plan'], album['outputdir'],
+                                self.cmds['ffmpeg_cmd'], self.limits)
+        except OSError as err:
+            with self.lock:
+                self.log.write(f"\n[CHECKSUMS]: {cuefile}\n{err}\n")
+            self.send_job(album['job']['id'], FAILED, 100,
+                          _("Checksums failed, see Logs for details"))
+            return False
+        skipped = {accuraterip_skipped(source['format'])
+                   for source in album['plan']}.difference([None])
+        if skipped:
+            with self.lock:
+                self.log.write(f"\n[CHECKSUMS]: {cuefile}\nAccurateRip "
+                               f"CRCs skipped: {', '.join(sorted(skipped))}"
+                               f"\n")
+        return True
+    # --------------------------------------------------------------------#
+
+    def journal_of(self, index):
+        """
+        Returns the journal of the album owning the given
+        recipe index and the index of the recipe on it.
+        """
+        with self.lock:
+            album = self.owner[index]
+            return album['journal'], album['indexes'].index(index)
+    # --------------------------------------------------------------------#
+
+    def update_progress(self, index, secs, track, force=False):
+        """
+        Notifies the progress percentage of the album owning
+        the given recipe index, only when it changes and
+        no more than `fps` times per second.
+        """
+        with self.lock:
+            self.elapsed[index] = secs
+            album = self.owner[index]
+            secs = sum(self.elapsed.get(idx, 0) for idx in album['indexes'])
+            percent = min(round(secs / max(album['duration'], 1) * 100), 99)
+            if percent == album['progress']:
+                return
+            if self.throttle() and not force:
+                return
+            album['progress'] = percent
+
+        self.send_job(album['job']['id'], RUNNING, percent, save=False)
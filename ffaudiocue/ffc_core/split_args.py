@@ -0,0 +1,238 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: split_args.py
+Porpose: sets up the ffcuesplitter API for the split
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import threading
+from ffcuesplitter import cuesplitter
+from ffcuesplitter.cuesplitter import FFCueSplitter
+from ffcuesplitter.utils import sanitize
+from ffaudiocue.ffc_utils.utils import get_codec_quality_items
+from ffaudiocue.ffc_utils.recipes import (single_pass_commandargs,
+                                          retag_commandargs,
+                                          )
+from ffaudiocue.ffc_core.pcm_split import pcm_eligible, pcm_commandargs
+from ffaudiocue.ffc_core.flac_split import flac_eligible, flac_commandargs
+from ffaudiocue.ffc_core.charset_cache import sniff_encoding
+from ffaudiocue.ffc_core.incremental import (track_fingerprints,
+                                             ENCODE,
+                                             RETAG,
+                                             SKIP,
+                                             )
+
+_probing = threading.local()  # the ProbeCache of the calling thread
+_ffprobe = cuesplitter.ffprobe
+
+
+def cached_ffprobe(filename, cmd='ffprobe'):
+    """
+    Replaces the `ffprobe` function used by ffcuesplitter,
+    taking the data from the ProbeCache of the running
+    `CachedCueSplitter.get_track_durations` if any.
+    """
+    probecache = getattr(_probing, 'probecache', None)
+    if probecache is None:
+        return _ffprobe(filename, cmd=cmd)
+    return probecache.ffprobe(filename, cmd=cmd)
+
+
+cuesplitter.ffprobe = cached_ffprobe
+# ------------------------------------------------------------------------
+
+
+class CachedCueSplitter(FFCueSplitter):
+    """
+    FFCueSplitter getting the ffprobe data from a `ProbeCache`.
+
+    Usage:
+        >>> data = CachedCueSplitter(cache, **kwargs)
+    """
+
+    def __init__(self, probecache, **kwargs):
+        """
+        probecache: the ProbeCache instance
+        kwargs: the FFCueSplitter keyword arguments
+        """
+        self.probecache = probecache
+        super().__init__(**kwargs)
+    # ----------------------------------------------------------------#
+
+    def get_track_durations(self, audiotracks):
+        """
+        Same as `FFCueSplitter.get_track_durations`
+        using the cached ffprobe data.
+        """
+        _probing.probecache = self.probecache
+        try:
+            return super().get_track_durations(audiotracks)
+        finally:
+            _probing.probecache = None
+# ------------------------------------------------------------------------
+
+
+def open_cuesheet(filename, ffprobe_cmd, ffmpeg_cmd,
+                  ffmpeg_loglevel='info', characters_encoding='auto',
+                  probecache=None, charsets=None):
+    """
+    Load the given CUE file using FFCueSplitter package.
+    If `probecache` is given, the ffprobe data are taken
+    from that `ProbeCache` when available. The 'auto'
+    encoding is taken from the `charsets` CharsetCache if
+    given, the detection of ffcuesplitter is skipped anyway
+    for files with byte order mark or pure ASCII.
+    Returns the FFCueSplitter instance, raise the exceptions
+    of ffcuesplitter on failing.
+    """
+    if characters_encoding == 'auto':
+        try:
+            if charsets:
+                characters_encoding = charsets.encoding(filename)
+            else:
+                with open(filename, 'rb') as fcue:
+                    characters_encoding = (sniff_encoding(fcue.read())
+                                           or 'auto')
+        except OSError:
+            pass  # reported by ffcuesplitter
+    kwargs = {'filename': filename,
+              'ffprobe_cmd': ffprobe_cmd,
+              'ffmpeg_cmd': ffmpeg_cmd,
+              'ffmpeg_loglevel': ffmpeg_loglevel,
+              'progress_meter': 'tqdm',
+              'characters_encoding': characters_encoding,
+              }  # for instance
+    if probecache:
+        return CachedCueSplitter(probecache, **kwargs)
+    return FFCueSplitter(**kwargs)
+# ------------------------------------------------------------------------
+
+
+def collection_dirname(destination, author, album):
+    """
+    Returns the `destination/Author/Album` folder pathname
+    used to arrange the tracks as a collection.
+    """
+    unkp, unka = 'Unknown Author', 'Unknown Album'
+    author = unkp if not sanitize(author) else author
+    album = unka if not sanitize(album) else album
+    return os.path.join(destination, sanitize(author), sanitize(album))
+# ------------------------------------------------------------------------
+
+
+def setup_splitter(data, **opts):
+    """
+    Set required arguments on ffcuesplitter API, where `data`
+    is the FFCueSplitter instance and `opts` are:
+
+        ffmpeg_cmd: pathname of the ffmpeg executable
+        ffmpeg_loglevel: the ffmpeg `-loglevel` value
+        outputformat: output format name, e.g. 'flac'
+        quality: key name of `get_codec_quality_items`
+        codec_copy: if True uses `-c copy` ignoring format/quality
+        destination: output folder, if empty uses the CUE folder
+        collection: if True adds the Author/Album folders
+        author, album: optional names of the collection folders,
+                       defaults to the PERFORMER/ALBUM of the CUE
+        limits: optional ProcessLimits of the ffmpeg processes
+                run by the native recipes
+
+    Returns the output folder pathname.
+    """
+    data.kwargs['ffmpeg_cmd'] = opts['ffmpeg_cmd']
+    data.kwargs['ffmpeg_loglevel'] = opts['ffmpeg_loglevel']
+    data.kwargs['limits'] = opts.get('limits')
+
+    if opts['codec_copy']:
+        data.kwargs['ffmpeg_add_params'] = "-c copy"
+    else:
+        data.kwargs['outputformat'] = opts['outputformat']
+        items = get_codec_quality_items(opts['outputformat'])
+        data.kwargs['ffmpeg_add_params'] = items[opts['quality']]
+
+    destination = opts['destination'] or data.kwargs['dirname']
+    if opts['collection']:
+        meta = data.cue.meta.data
+        destination = collection_dirname(destination,
+                                         opts.get('author',
+                                                  meta['PERFORMER']),
+                                         opts.get('album', meta['ALBUM']),
+                                         )
+    data.kwargs['outputdir'] = destination
+    data.kwargs['native_pcm'] = pcm_eligible(data)
+    data.kwargs['native_flac'] = flac_eligible(data)
+
+    return destination
+# ------------------------------------------------------------------------
+
+
+def get_recipes(data, singlepass=False, manifest=None):
+    """
+    Returns the dict of recipes for the split engine. The
+    single pass recipes are not used with the codec copy,
+    while WAV and FLAC sources are cut natively when eligible
+    (see `pcm_eligible`, `flac_eligible` and `setup_splitter`).
+
+    If the `Manifest` of the output folder is given, the
+    tracks unchanged since the last split are skipped and
+    those whose tags only are changed are remuxed. The dict
+    returned has also the 'fingerprints' of the tracks to
+    be written, to commit them to the manifest, and the
+    names of the tracks 'skipped'.
+    """
+    singlepass = singlepass and data.kwargs['ffmpeg_add_params'] != "-c copy"
+    native = None
+    if data.kwargs.get('native_pcm'):
+        native = pcm_commandargs
+    elif data.kwargs.get('native_flac'):
+        native = flac_commandargs
+    if not manifest:
+        if native:
+            return native(data, data.audiotracks)
+        if singlepass:
+            return single_pass_commandargs(data, data.audiotracks)
+        return data.commandargs(data.audiotracks)
+
+    fingerprints = track_fingerprints(data)
+    states = [manifest.state(name, fingerprint) for name, fingerprint
+              in fingerprints.items()]
+    tracks = data.audiotracks
+    encode = [trk for trk, state in zip(tracks, states) if state == ENCODE]
+    if native:
+        recipes = native(data, encode, len(tracks))
+    elif singlepass:
+        recipes = single_pass_commandargs(data, encode, len(tracks))
+    else:  # one recipe for each track
+        recipes = data.commandargs(tracks)
+        recipes['recipes'] = [rec for rec, state in
+                              zip(recipes['recipes'], states)
+                              if state == ENCODE]
+    retag = [trk for trk, state in zip(tracks, states) if state == RETAG]
+    recipes['recipes'] += retag_commandargs(data, retag,
+                                            len(tracks))['recipes']
+    recipes['fingerprints'] = {name: fingerprint for (name, fingerprint),
+                               state in zip(fingerprints.items(), states)
+                               if state != SKIP}
+    recipes['skipped'] = [name for name, state in
+                          zip(fingerprints, states) if state == SKIP]
+    return recipes
@@ -0,0 +1,417 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: split_engine.py
+Porpose: toolkit-free engine running the FFmpeg split recipes
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+import time
+import tempfile
+import subprocess
+import platform
+from ffcuesplitter.utils import Popen
+from ffaudiocue.ffc_utils.recipes import TAP_RATE
+from ffaudiocue.ffc_core.pcm_split import WavError
+from ffaudiocue.ffc_core.flac_split import FlacError
+from ffaudiocue.ffc_core.process_limits import ProcessLimits
+from ffaudiocue.ffc_core.metrics import (RecipeMetrics,
+                                         ffmpeg_version,
+                                         summarize,
+                                         append_jsonl,
+                                         )
+if not platform.system() == 'Windows':
+    import shlex
+
+
+def _no_notify(topic, **kwargs):
+    """
+    Default `notify` callable of the SplitEngine, does nothing.
+    """
+
+
+class SplitEngine:
+    """
+    Runs the ffmpeg processes of the split recipes without
+    depending on any GUI toolkit. It is driven by the
+    `Processing` thread of the GUI as well as by the command
+    line interface.
+
+    Recipes are dispatched to a pool of `workers` threads,
+    each one driving its own ffmpeg process. With workers=1
+    the recipes are processed one at a time. The progress of
+    all running processes is combined into a single overall
+    percentage.
+
+    Events are reported by calling `notify(topic, **kwargs)`,
+    where topic is one of the pubsub topics subscribed by the
+    GUI, i.e. "COUNT_EVT" and "UPDATE_EVT" (see `CueGui`).
+
+    The ffmpeg progress is parsed on the worker threads and
+    the progress of all running processes is coalesced into
+    at most `fps` "UPDATE_EVT" per second, whose keyword
+    arguments are:
+        track: str, e.g. '2/12'
+        percent: float, overall percentage
+        elapsed: float, overall seconds processed
+        duration: float, overall seconds to process
+        status: int, the ffmpeg exit status if not 0
+
+    The timing and throughput of each recipe are recorded
+    (see `RecipeMetrics`) and appended to the `metricsfile`
+    JSON lines file, if given, followed by their summary.
+
+    Native recipes, i.e. WAV and FLAC sources cut without
+    decoding them (see `pcm_commandargs` and `flac_commandargs`),
+    are run by the worker threads themselves.
+
+    If a `journal` is given (see `JobJournal`) each recipe
+    done is recorded on it, while the recipes it already
+    records as done, e.g. by a crashed session, are skipped.
+
+    Usage:
+        >>> engine = SplitEngine(args, log, workers=4,
+                                 notify=callback)
+        >>> status = engine.run()  # blocking
+    """
+
+    def __init__(self, args, log, workers=1, notify=None, fps=10,
+                 metricsfile=None, journal=None, limits=None):
+        """
+        args: dict of recipes as returned by `commandargs`
+        log: the RotatingLog of the job, see `JobLogs`.
+        workers: max number of ffmpeg processes running at once.
+        notify: callable receiving the progress events.
+        fps: max number of progress events per second.
+        metricsfile: pathname of the JSON lines metrics file.
+        journal: optional JobJournal of the job.
+        limits: optional ProcessLimits of the ffmpeg processes.
+        """
+        self.stop_work_thread = False  # if True the process terminates
+        self.args = args  # list of commands/aguments
+        self.log = log  # the job log
+        self.notify = notify if notify else _no_notify
+        self.count = 0  # count for loop
+        self.countmax = len(args['recipes'])  # length list
+        self.workers = max(1, int(workers))
+        self.lock = Lock()  # guards counters, progress and log writing
+        self.elapsed = {}  # seconds processed for each recipe index
+        self.totalsecs = sum(rec[1]['duration'] for rec in args['recipes'])
+        self.failed = False  # True if ffmpeg could not be run at all
+        self.errors = 0  # number of ffmpeg processes exited with error
+        self.interval = 1 / fps if fps > 0 else 0  # between progress events
+        self.lastsent = 0.0  # time of the last progress event
+        self.metricsfile = metricsfile
+        self.metrics = []  # the records of the recipes run
+        self.started = time.monotonic()
+        self.journal = journal
+        self.limits = limits or ProcessLimits()
+        self.resumed = set()  # indexes of the recipes done already
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Run all recipes and wait for them to finish.
+        Returns a dict with the final status:
+            'aborted': the user stopped the processing
+            'failed': an error prevented running ffmpeg
+            'errors': number of ffmpeg processes exited with error
+            'metrics': the summary of the metrics
+        """
+        self.started = time.monotonic()
+        self.notify("COUNT_EVT", msg='', end='')
+        if self.journal:
+            self.resumed = self.journal.completed(self.args['recipes'])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.encode, index, recipes) for
+                       index, recipes in enumerate(self.args['recipes'])]
+
+        errors = [fut.exception() for fut in futures if fut.exception()]
+        if errors:  # unexpected exceptions raised by the workers
+            self.failed = True
+            self.notify("COUNT_EVT", msg=f'{errors[0]}', end='error')
+
+        return {'aborted': self.stop_work_thread,
+                'failed': self.failed,
+                'errors': self.errors,
+                'metrics': self.summarize_metrics(),
+                }
+    # --------------------------------------------------------------------#
+
+    def summarize_metrics(self):
+        """
+        Returns the summary of the metrics of the recipes
+        run so far, also written to the metrics file.
+        """
+        summary = summarize(self.metrics, time.monotonic() - self.started)
+        if self.metricsfile:
+            append_jsonl(self.metricsfile, summary)
+        return summary
+    # --------------------------------------------------------------------#
+
+    def add_metrics(self, record):
+        """
+        Records the metrics of a recipe. Call it
+        holding the lock.
+        """
+        self.metrics.append(record)
+        if self.metricsfile:
+            append_jsonl(self.metricsfile, record)
+    # --------------------------------------------------------------------#
+
+    def encode(self, index, recipes):
+        """
+        Run the ffmpeg process of a single recipe. This method
+        is called by the worker threads of the pool. The stderr
+        is buffered to a temporary file and then appended to the
+        log as a whole, so that concurrent processes don't mix
+        their lines together.
+        Returns True if ffmpeg has finished successfully.
+        """
+        if self.stop_work_thread or self.failed:
+            return False
+
+        with self.lock:
+            self.count += 1
+            track = f'{self.count}/{self.countmax}'
+
+        if index in self.resumed:
+            self.update_progress(index, recipes[1]['duration'], track,
+                                 force=True)
+            return True
+
+        if 'native' in recipes[1]:  # see `pcm_commandargs`
+            return self.run_native(index, recipes, track)
+
+        cmdargs = recipes[0]
+        if not platform.system() == 'Windows':
+            cmdargs = shlex.split(recipes[0])
+        cmdargs = self.limits.command(cmdargs)
+        warnings = []
+
+        success = False
+        status = None  # exit status, None if ffmpeg could not be run
+        metrics = RecipeMetrics(index, recipes[1])
+        tapped = 'tap_start' in recipes[1]  # see recipes.py
+        textmode = {} if tapped else {'bufsize': 1,
+                                      'encoding': 'utf8',
+                                      'universal_newlines': True,
+                                      }
+        with tempfile.TemporaryFile(mode='w+', encoding='utf-8') as errlog:
+            try:
+                with Popen(cmdargs,
+                           stdout=subprocess.PIPE,
+                           stderr=errlog,
+                           **self.limits.popen_kwargs(),
+                           **textmode) as proc:
+                    warnings = self.limits.apply(proc.pid)
+                    if tapped:
+                        self.read_tap(proc, index, recipes, track, metrics)
+                    else:
+                        self.read_progress(proc, index, track, metrics)
+
+                    status = metrics.wait(proc)
+                    metrics.finish(status)
+                    if status:  # error
+                        with self.lock:
+                            self.errors += 1
+                        self.notify("UPDATE_EVT",
+                                    track=track,
+                                    percent=0.0,
+                                    elapsed=0.0,
+                                    duration=recipes[1]['duration'],
+                                    status=status,
+                                    )
+                    elif not self.stop_work_thread:
+                        self.update_progress(index, recipes[1]['duration'],
+                                             track, force=True)
+                        self.record_done(index)
+                        success = True
+
+            except (OSError, FileNotFoundError) as err:
+                msg = _("Is 'ffmpeg' installed on your system?")
+                excepterr = f"{err}\n  {msg}"
+                errlog.write(f'\nERROR: {excepterr}')
+                with self.lock:
+                    notify = not self.failed
+                    self.failed = True  # skip all remaining recipes
+                if notify:
+                    self.notify("COUNT_EVT", msg=excepterr, end='error')
+            errlog.seek(0)
+            version = ffmpeg_version(errlog.readline())
+            errlog.seek(0)
+            with self.lock:
+                if status is not None:
+                    metrics.record['ffmpeg'] = version
+                    self.add_metrics(metrics.record)
+                self.log.write(f"\n[INFO: COMMAND]: {recipes[0]}\n"
+                               f"{'=' * 94}\n\n")
+                for msg in warnings:
+                    self.log.write(f"[WARNING]: {msg}\n")
+                for chunk in iter(lambda: errlog.read(65536), ''):
+                    self.log.write(chunk)  # may rotate the log
+
+        return success
+    # --------------------------------------------------------------------#
+
+    def run_native(self, index, recipes, track):
+        """
+        Runs a native recipe on the worker thread in place
+        of ffmpeg, with the same events and metrics.
+        Returns True if the track has been written.
+        """
+        native, duration = recipes[1]['native'], recipes[1]['duration']
+        metrics = RecipeMetrics(index, recipes[1])
+        size = native['size'] or 1
+        copied, error = 0, ''
+        try:
+            for copied in native['split'](native):
+                self.update_progress(index, min(copied / size, 1.0)
+                                     * duration, track)
+                if self.stop_work_thread:
+                    break
+        except (OSError, WavError, FlacError) as err:
+            error = f'\nERROR: {err}\n'
+        metrics.record['bytes_in'] = metrics.record['bytes_out'] = copied
+        metrics.finish(1 if error else 0)
+        with self.lock:
+            self.add_metrics(metrics.record)
+            self.log.write(f"\n[INFO: COMMAND]: {recipes[0]}\n"
+                           f"{'=' * 94}\n{error}\n")
+            if error:
+                self.errors += 1
+        if error:
+            self.notify("UPDATE_EVT", track=track, percent=0.0,
+                        elapsed=0.0, duration=duration, status=1)
+            return False
+        if self.stop_work_thread:
+            return False
+        self.update_progress(index, duration, track, force=True)
+        self.record_done(index)
+        return True
+    # --------------------------------------------------------------------#
+
+    def journal_of(self, index):
+        """
+        Returns the journal of the given recipe index and
+        the index of the recipe on it.
+        """
+        return self.journal, index
+    # --------------------------------------------------------------------#
+
+    def record_done(self, index):
+        """
+        Records the given recipe as done on the journal
+        """
+        journal, num = self.journal_of(index)
+        if not journal:
+            return
+        try:
+            journal.record_done(num)
+        except OSError as err:  # it will be done again on resume
+            with self.lock:
+                self.log.write(f"\n[WARNING]: journal: {err}\n")
+    # --------------------------------------------------------------------#
+
+    def read_progress(self, proc, index, track, metrics):
+        """
+        Reads the `-progress pipe:1` lines of ffmpeg.
+        """
+        for line in proc.stdout:
+            key, value = line.strip().partition('=')[::2]
+            if key == "out_time_ms":
+                if value.isdigit():
+                    self.update_progress(index, int(value) / 1_000_000,
+                                         track)
+            elif key == "progress":  # end of each block of keys
+                metrics.sample_io(proc.pid)
+            else:
+                metrics.progress(key, value)
+            if self.stop_work_thread:
+                proc.terminate()
+                break  # break 'for' loop
+    # --------------------------------------------------------------------#
+
+    def read_tap(self, proc, index, recipes, track, metrics):
+        """
+        Reads the PCM tap of a single pass recipe, where the
+        amount of bytes received gives the source position.
+        """
+        received = 0
+        while True:
+            chunk = proc.stdout.read(65536)
+            if not chunk:
+                break
+            received += len(chunk)
+            secs = received / TAP_RATE - recipes[1]['tap_start']
+            secs = min(max(secs, 0), recipes[1]['duration'])
+            self.update_progress(index, secs, track)
+            metrics.sample_io(proc.pid)
+            if self.stop_work_thread:
+                proc.terminate()
+                break  # break 'while' loop
+    # --------------------------------------------------------------------#
+
+    def throttle(self):
+        """
+        Returns True if the last progress event was sent
+        less than 1/fps seconds ago, otherwise returns False
+        and restarts the timing. Call it holding the lock.
+        """
+        now = time.monotonic()
+        if now - self.lastsent < self.interval:
+            return True
+        self.lastsent = now
+        return False
+    # --------------------------------------------------------------------#
+
+    def update_progress(self, index, secs, track, force=False):
+        """
+        Combine the seconds processed of the given recipe
+        index with the progress of the other recipes and
+        send the overall time processed, unless the last
+        event was sent too recently. The `force` argument
+        sends it anyway, e.g. at the end of a recipe.
+        """
+        with self.lock:
+            self.elapsed[index] = secs
+            if self.throttle() and not force:
+                return
+            secs = sum(self.elapsed.values())
+
+        percent = secs / self.totalsecs * 100 if self.totalsecs else 0.0
+        self.notify("UPDATE_EVT",
+                    track=track,
+                    percent=min(percent, 100.0),
+                    elapsed=secs,
+                    duration=self.totalsecs,
+                    status=0,
+                    )
+    # --------------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.stop_work_thread = True
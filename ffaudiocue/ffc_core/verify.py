@@ -0,0 +1,140 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: verify.py
+Porpose: checks that the audio tracks produced decode properly
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import subprocess
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from ffaudiocue.ffc_utils.recipes import track_filename
+from ffaudiocue.ffc_core.process_limits import ProcessLimits
+
+# max difference in seconds between the decoded and expected
+# durations, allows for the encoder delay and frame padding
+TOLERANCE = 0.5
+
+
+def expected_tracks(data, outputdir):
+    """
+    Returns the list of (pathname, duration) of the tracks
+    written to `outputdir` for the given FFCueSplitter
+    instance, with the duration in seconds (or None) of
+    the 'DURATION' of its audio tracks.
+    """
+    tracks = []
+    for track in data.audiotracks:
+        suffix = data.codec_setup(track['FILE'])[1]
+        tracks.append((os.path.join(outputdir, track_filename(track, suffix)),
+                       track.get('DURATION')))
+    return tracks
+# ------------------------------------------------------------------------
+
+
+def verify_track(filename, duration, ffmpeg_cmd='ffmpeg',
+                 tolerance=TOLERANCE, limits=None, semaphore=None):
+    """
+    Decodes the given audio track with ffmpeg, discarding
+    the audio (`ffmpeg -v error -f null`), and compares the
+    decoded duration with `duration` (if not None). The
+    optional `semaphore` is held while ffmpeg runs, e.g. to
+    share the max number of processes of a running split.
+    Returns a dict with the keys:
+        'filename': the pathname of the track
+        'expected': the expected duration
+        'decoded': the decoded duration or None
+        'errors': the list of error messages
+    """
+    result = {'filename': filename, 'expected': duration,
+              'decoded': None, 'errors': []}
+    if not os.path.isfile(filename):
+        result['errors'].append('file not found')
+        return result
+    limits = limits or ProcessLimits()
+    cmd = limits.command([ffmpeg_cmd, '-nostdin', '-hide_banner',
+                          '-v', 'error', '-nostats', '-progress', 'pipe:1',
+                          '-i', filename, '-map', '0:a:0', '-f', 'null', '-'])
+    try:
+        with semaphore or nullcontext(), \
+                subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 encoding='utf-8', errors='replace',
+                                 **limits.popen_kwargs()) as proc:
+            limits.apply(proc.pid)
+            out, err = proc.communicate()
+    except OSError as error:
+        result['errors'].append(str(error))
+        return result
+
+    for line in out.splitlines():
+        if line.startswith('out_time_us=') and line[12:].isdigit():
+            result['decoded'] = int(line[12:]) / 1_000_000
+    result['errors'] = [line.strip() for line in err.splitlines()
+                        if line.strip()]
+    if proc.returncode and not result['errors']:
+        result['errors'].append(f'ffmpeg exit status {proc.returncode}')
+    if duration is not None and not result['errors']:
+        if result['decoded'] is None:
+            result['errors'].append('no audio decoded')
+        elif abs(result['decoded'] - duration) > tolerance:
+            result['errors'].append(f"duration {result['decoded']:.3f}s, "
+                                    f"expected {duration:.3f}s")
+    return result
+# ------------------------------------------------------------------------
+
+
+def verify_tracks(tracks, ffmpeg_cmd='ffmpeg', workers=1,
+                  tolerance=TOLERANCE, limits=None, semaphore=None):
+    """
+    Verifies the given list of (pathname, duration) tracks
+    (see `expected_tracks`) on a pool of `workers` threads,
+    one ffmpeg process each (see `verify_track` for the
+    `semaphore`). Returns the list of results of
+    `verify_track` in the same order.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(verify_track, filename, duration,
+                               ffmpeg_cmd, tolerance, limits, semaphore)
+                   for filename, duration in tracks]
+        return [future.result() for future in futures]
+# ------------------------------------------------------------------------
+
+
+def failures(results):
+    """
+    Returns the list of the lines describing the tracks
+    that failed the verification, empty if none failed.
+    """
+    return [f"{os.path.basename(res['filename'])}: "
+            f"{'; '.join(res['errors'])}" for res in results if res['errors']]
+# ------------------------------------------------------------------------
+
+
+def failed_names(results):
+    """
+    Returns the list of the file names of the tracks that
+    failed the verification.
+    """
+    return [os.path.basename(res['filename'])
+            for res in results if res['errors']]
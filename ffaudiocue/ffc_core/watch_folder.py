@@ -0,0 +1,380 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: watch_folder.py
+Porpose: watches inbox folders for new CUE sheets to split
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import errno
+import shutil
+import ctypes
+import select
+import platform
+from ffaudiocue.ffc_utils.utils import check_quality
+from ffaudiocue.ffc_core.library import resolve_sources
+
+# the per-folder profile, which overrides the split options
+PROFILE_NAME = 'ffaudiocue-profile.json'
+
+# the profile keys, as the long options of the split command
+PROFILE_KEYS = ('format', 'quality', 'copy', 'outputdir', 'collection',
+                'single_pass', 'incremental', 'charset', 'overwrite',
+                'verify', 'checksums')
+
+# the subfolders of each inbox where the sources are moved
+DONE_DIR, FAILED_DIR = 'done', 'failed'
+
+# inotify(7) flags
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_EVENTS = (0x00000002  # IN_MODIFY
+             | 0x00000008  # IN_CLOSE_WRITE
+             | 0x00000040  # IN_MOVED_FROM
+             | 0x00000080  # IN_MOVED_TO
+             | 0x00000100  # IN_CREATE
+             | 0x00000200  # IN_DELETE
+             )
+
+
+class Inotify:
+    """
+    A minimal inotify(7) binding through ctypes, which only
+    tells when something changed on the watched folders.
+    Raises OSError if inotify is not available.
+    """
+
+    def __init__(self):
+        if platform.system() != 'Linux':
+            raise OSError(errno.ENOSYS, 'inotify is Linux only')
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.libc.inotify_add_watch.argtypes = (ctypes.c_int,
+                                                ctypes.c_char_p,
+                                                ctypes.c_uint32)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.watched = set()
+    # --------------------------------------------------------------------#
+
+    def add(self, path):
+        """
+        Watches the given folder, once only
+        """
+        if path in self.watched:
+            return
+        if self.libc.inotify_add_watch(self.fd, os.fsencode(path),
+                                       IN_EVENTS) < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        self.watched.add(path)
+    # --------------------------------------------------------------------#
+
+    def forget(self, paths):
+        """
+        Forgets the folders no longer existing, the kernel
+        removes their watches by itself.
+        """
+        self.watched.difference_update(paths)
+    # --------------------------------------------------------------------#
+
+    def wait(self, timeout):
+        """
+        Waits up to `timeout` seconds for any change, returns
+        True if something changed.
+        """
+        ready = select.select([self.fd], [], [], timeout)[0]
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+    # --------------------------------------------------------------------#
+
+    def close(self):
+        """
+        Closes the inotify instance
+        """
+        os.close(self.fd)
+# ------------------------------------------------------------------------
+
+
+def load_profile(inbox, options=None):
+    """
+    Returns the dict of the split options found on the
+    `PROFILE_NAME` file of the given inbox folder, empty
+    if there is no profile. A relative 'outputdir' is taken
+    relative to the inbox. `options` are the split options
+    overridden by the profile, a 'format' or 'quality' of
+    the profile is checked with them. Raises ValueError
+    if invalid.
+    """
+    try:
+        with open(os.path.join(inbox, PROFILE_NAME),
+                  encoding='utf-8') as fin:
+            profile = json.load(fin)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as err:
+        raise ValueError(f'{PROFILE_NAME}: {err}') from err
+    if not isinstance(profile, dict):
+        raise ValueError(f'{PROFILE_NAME}: a JSON object is expected')
+    unknown = set(profile).difference(PROFILE_KEYS)
+    if unknown:
+        raise ValueError(f'{PROFILE_NAME}: unknown keys: '
+                         f'{", ".join(sorted(unknown))}')
+    merged = {'format': 'flac', 'quality': 'Auto', 'copy': False,
+              **(options or {}), **profile}
+    if {'format', 'quality'}.intersection(profile) and not merged['copy']:
+        try:
+            check_quality(merged['format'], merged['quality'])
+        except ValueError as err:
+            raise ValueError(f'{PROFILE_NAME}: {err}') from err
+    if profile.get('outputdir'):
+        profile['outputdir'] = os.path.join(inbox, profile['outputdir'])
+    return profile
+# ------------------------------------------------------------------------
+
+
+def unique_path(path):
+    """
+    Returns `path`, with a number appended if it exists
+    """
+    root, ext = os.path.splitext(path)
+    num = 1
+    while os.path.lexists(path):
+        path = f'{root} ({num}){ext}'
+        num += 1
+    return path
+# ------------------------------------------------------------------------
+
+
+class WatchFolders:
+    """
+    Watches inbox folders, where rippers drop CUE sheets and
+    their audio files, and tells which albums are complete:
+    those whose CUE sheet and audio files are all found and
+    have not changed for `settle` seconds.
+
+    Uses inotify on Linux to wake up as soon as something
+    changes, and polls the folders every `interval` seconds
+    anyway, without inotify or if it misses changes (e.g.
+    network file systems). The `DONE_DIR` and `FAILED_DIR`
+    subfolders of each inbox, where the albums are moved
+    once processed (see `archive`), are not watched.
+
+    Usage:
+        >>> watch = WatchFolders(['/srv/inbox'], settle=10)
+        >>> while True:
+        ...     for inbox, cuefile, sources in watch.ready():
+        ...         ...
+        ...     watch.wait()
+    """
+
+    def __init__(self, inboxes, settle=10, interval=5):
+        """
+        inboxes: the folders to be watched
+        settle: seconds the files of an album must stay
+                unchanged before it is ready
+        interval: max seconds between two polls
+        """
+        self.inboxes = [os.path.abspath(inbox) for inbox in inboxes]
+        self.settle = settle
+        self.interval = interval
+        self.seen = {}  # cuefile: (files state, monotonic time)
+        self.taken = set()  # albums already returned by `ready`
+        try:
+            self.inotify = Inotify()
+        except OSError:
+            self.inotify = None
+    # --------------------------------------------------------------------#
+
+    def close(self):
+        """
+        Stops watching
+        """
+        if self.inotify:
+            self.inotify.close()
+            self.inotify = None
+    # --------------------------------------------------------------------#
+
+    def walk(self, inbox):
+        """
+        Yields the folders of the given inbox with the set
+        of their file names, watching them with inotify.
+        """
+        for root, dirs, files in os.walk(inbox):
+            if root == inbox:
+                dirs[:] = [d for d in dirs if d not in (DONE_DIR,
+                                                        FAILED_DIR)]
+            dirs.sort()
+            if self.inotify:
+                try:
+                    self.inotify.add(root)
+                except OSError:
+                    self.close()  # e.g. max_user_watches, poll instead
+            yield root, set(files)
+    # --------------------------------------------------------------------#
+
+    def ready(self):
+        """
+        Returns the list of the albums ready to be split, as
+        tuples of (inbox, cuefile, sources), each one once.
+        """
+        now = time.monotonic()
+        found, albums = set(), []
+        for inbox in self.inboxes:
+            for root, files in self.walk(inbox):
+                for name in sorted(files):
+                    if not name.lower().endswith('.cue'):
+                        continue
+                    cuefile = os.path.join(root, name)
+                    found.add(cuefile)
+                    if cuefile in self.taken:
+                        continue
+                    album = self.check(cuefile, files, now)
+                    if album:
+                        self.taken.add(cuefile)
+                        del self.seen[cuefile]
+                        albums.append((inbox, cuefile, album))
+        for cuefile in set(self.seen).difference(found):
+            del self.seen[cuefile]
+        self.taken.intersection_update(found)
+        if self.inotify:
+            self.inotify.forget([path for path in self.inotify.watched
+                                 if not os.path.isdir(path)])
+        return albums
+    # --------------------------------------------------------------------#
+
+    def check(self, cuefile, files, now):
+        """
+        Returns the list of the audio files of the given CUE
+        sheet if they are all found and none of them, nor the
+        CUE sheet, changed for `settle` seconds.
+        """
+        try:
+            sources, missing = resolve_sources(cuefile, files)
+            if missing or not sources:
+                self.seen.pop(cuefile, None)
+                return None
+            dirname = os.path.dirname(cuefile)
+            state = []
+            for name in [os.path.basename(cuefile)] + sources:
+                stat = os.stat(os.path.join(dirname, name))
+                state.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            self.seen.pop(cuefile, None)
+            return None
+        last = self.seen.get(cuefile)
+        if not last or last[0] != state:
+            self.seen[cuefile] = (state, now)
+            return None
+        if now - last[1] < self.settle:
+            return None
+        return [os.path.join(dirname, name) for name in sources]
+    # --------------------------------------------------------------------#
+
+    def wait(self):
+        """
+        Waits for something to change on the inboxes or, while
+        some album is settling, for its settle time.
+        """
+        timeout = self.interval
+        if self.seen:
+            oldest = min(since for state, since in self.seen.values())
+            timeout = min(timeout, max(0.5, oldest + self.settle
+                                       - time.monotonic() + 0.1))
+        if self.inotify:
+            if self.inotify.wait(timeout):
+                time.sleep(0.5)  # coalesce the bursts of a copy
+        else:
+            time.sleep(timeout)
+    # --------------------------------------------------------------------#
+
+    def retry(self, cuefile):
+        """
+        Returns the given album to the inbox, to be split
+        again when `ready`.
+        """
+        self.taken.discard(cuefile)
+    # --------------------------------------------------------------------#
+
+    def archive(self, inbox, cuefile, sources, success):
+        """
+        Moves the given album out of the inbox, to its
+        `DONE_DIR` or `FAILED_DIR` subfolder depending on
+        `success`, keeping its relative folder. Only the CUE
+        sheet and its sources are moved while other CUE
+        sheets are left on its folder (or subfolders): the
+        last album moves the rest of the folder with it
+        (logs, covers etc.), then the parent folders left
+        empty are removed. Returns the new pathname of the
+        album folder, or of the CUE sheet if loose.
+        """
+        area = os.path.join(inbox, DONE_DIR if success else FAILED_DIR)
+        dirname = os.path.dirname(cuefile)
+        self.taken.discard(cuefile)
+        self.seen.pop(cuefile, None)
+        if dirname == inbox:
+            os.makedirs(area, exist_ok=True)
+            dest = unique_path(os.path.join(area, os.path.basename(cuefile)))
+            for path in sources:
+                shutil.move(path, unique_path(os.path.join(
+                    area, os.path.basename(path))))
+            shutil.move(cuefile, dest)
+            return dest
+
+        dest = os.path.join(area, os.path.relpath(dirname, inbox))
+        others = [os.path.join(root, name)
+                  for root, dirs, files in os.walk(dirname)
+                  for name in files if name.lower().endswith('.cue')]
+        others.remove(cuefile)
+        if not others and not os.path.lexists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.move(dirname, dest)
+        else:
+            os.makedirs(dest, exist_ok=True)
+            if others:
+                paths = sources + [cuefile]
+            else:  # the other albums went to the same folder
+                paths = [os.path.join(dirname, name)
+                         for name in sorted(os.listdir(dirname))]
+            for path in paths:
+                shutil.move(path, unique_path(os.path.join(
+                    dest, os.path.basename(path))))
+            if others:
+                return dest
+            os.rmdir(dirname)
+        parent = os.path.dirname(dirname)
+        while parent != inbox:
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+        return dest
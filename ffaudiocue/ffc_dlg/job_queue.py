@@ -0,0 +1,340 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_queue.py
+Porpose: manages the queue of CUE sheets to split
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import wx
+from pubsub import pub
+from ffaudiocue.ffc_core.job_queue import (JobQueue,
+                                           find_cuesheets,
+                                           QUEUED,
+                                           RUNNING,
+                                           DONE,
+                                           FAILED,
+                                           )
+from ffaudiocue.ffc_core.job_logs import get_joblogs
+from ffaudiocue.ffc_core.metrics import format_summary
+from ffaudiocue.ffc_core.process_limits import ProcessLimits
+from ffaudiocue.ffc_threads.ffmpeg_processing import QueueProcessing
+
+
+class QueueManager(wx.Dialog):
+    """
+    Shows the persistent queue of CUE sheets to split with
+    the status of each album. Albums are added using the
+    current options of the main panel and are processed
+    sharing the same workers (see Preferences).
+    """
+    STATUS = {QUEUED: _('Queued'),
+              RUNNING: _('Running'),
+              DONE: _('Done'),
+              FAILED: _('Failed'),
+              }
+
+    def __init__(self, parent):
+        """
+        The queue is stored on the configuration
+        directory as `jobqueue.json`.
+        """
+        self.parent = parent
+        get = wx.GetApp()  # get data from bootstrap
+        self.appdata = get.appset
+        vidicon = get.iconset['ffaudiocue']
+        self.queue = JobQueue(os.path.join(self.appdata['confdir'],
+                                           'jobqueue.json'))
+        self.thread_type = None
+
+        wx.Dialog.__init__(self, None,
+                           style=wx.DEFAULT_DIALOG_STYLE
+                           | wx.RESIZE_BORDER
+                           | wx.DIALOG_NO_PARENT
+                           )
+        # ----------------------Layout----------------------#
+        sizer_base = wx.BoxSizer(wx.VERTICAL)
+        self.joblist = wx.ListCtrl(self,
+                                   wx.ID_ANY,
+                                   style=wx.LC_REPORT
+                                   | wx.SUNKEN_BORDER
+                                   )
+        self.joblist.SetMinSize((750, 300))
+        self.joblist.InsertColumn(0, '#', width=40)
+        self.joblist.InsertColumn(1, _('CUE sheet'), width=300)
+        self.joblist.InsertColumn(2, _('Format'), width=70)
+        self.joblist.InsertColumn(3, _('Status'), width=100)
+        self.joblist.InsertColumn(4, _('Message'), width=300)
+        sizer_base.Add(self.joblist, 1, wx.ALL | wx.EXPAND, 5)
+        self.ckbx_overwrite = wx.CheckBox(self, wx.ID_ANY,
+                                          _('Overwrite existing tracks of '
+                                            'new albums'))
+        sizer_base.Add(self.ckbx_overwrite, 0, wx.ALL, 5)
+
+        # ----- buttons section
+        grdBtn = wx.GridSizer(1, 2, 0, 0)
+        grid_funcbtn = wx.BoxSizer(wx.HORIZONTAL)
+        self.btn_addfiles = wx.Button(self, wx.ID_ADD, _("Add CUE files"))
+        grid_funcbtn.Add(self.btn_addfiles, 0)
+        self.btn_addfolder = wx.Button(self, wx.ID_ANY, _("Add folder"))
+        grid_funcbtn.Add(self.btn_addfolder, 0, wx.LEFT, 5)
+        self.btn_remove = wx.Button(self, wx.ID_REMOVE, _("Remove"))
+        grid_funcbtn.Add(self.btn_remove, 0, wx.LEFT, 5)
+        self.btn_retry = wx.Button(self, wx.ID_ANY, _("Retry"))
+        grid_funcbtn.Add(self.btn_retry, 0, wx.LEFT, 5)
+        self.btn_clear = wx.Button(self, wx.ID_CLEAR, _("Clear finished"))
+        grid_funcbtn.Add(self.btn_clear, 0, wx.LEFT, 5)
+        grdBtn.Add(grid_funcbtn, 0, wx.ALL, 5)
+        grdexit = wx.BoxSizer(wx.HORIZONTAL)
+        self.btn_start = wx.Button(self, wx.ID_EXECUTE, _("Start"))
+        grdexit.Add(self.btn_start, 0)
+        self.btn_stop = wx.Button(self, wx.ID_STOP, _("Abort"))
+        grdexit.Add(self.btn_stop, 0, wx.LEFT, 5)
+        self.btn_close = wx.Button(self, wx.ID_CLOSE, "")
+        grdexit.Add(self.btn_close, 0, wx.LEFT, 5)
+        grdBtn.Add(grdexit, flag=wx.ALL | wx.ALIGN_RIGHT | wx.RIGHT, border=5)
+        sizer_base.Add(grdBtn, 0, wx.ALL | wx.EXPAND, 0)
+
+        # set caption and min size
+        self.SetTitle(_('Job queue'))
+        self.SetMinSize((750, 450))
+        icon = wx.Icon()
+        icon.CopyFromBitmap(wx.Bitmap(vidicon, wx.BITMAP_TYPE_ANY))
+        self.SetIcon(icon)
+        # ------ set sizer
+        self.SetSizer(sizer_base)
+        self.Fit()
+        self.Layout()
+
+        self.btn_stop.Disable()
+        self.populate_list()
+
+        # ----------------------Binding (EVT)----------------------#
+        self.Bind(wx.EVT_BUTTON, self.on_add_files, self.btn_addfiles)
+        self.Bind(wx.EVT_BUTTON, self.on_add_folder, self.btn_addfolder)
+        self.Bind(wx.EVT_BUTTON, self.on_remove, self.btn_remove)
+        self.Bind(wx.EVT_BUTTON, self.on_retry, self.btn_retry)
+        self.Bind(wx.EVT_BUTTON, self.on_clear, self.btn_clear)
+        self.Bind(wx.EVT_BUTTON, self.on_start, self.btn_start)
+        self.Bind(wx.EVT_BUTTON, self.on_stop, self.btn_stop)
+        self.Bind(wx.EVT_BUTTON, self.on_close, self.btn_close)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        pub.subscribe(self.update_job, "QUEUE_JOB_EVT")
+        pub.subscribe(self.update_count_items, "QUEUE_COUNT_EVT")
+        pub.subscribe(self.end_processing, "QUEUE_END_EVT")
+
+    # ----------------------Event handler (callback)----------------------#
+
+    def populate_list(self):
+        """
+        Populates the listctrl with the jobs of the queue
+        """
+        self.joblist.DeleteAllItems()
+        for num, job in enumerate(self.queue.snapshot()):
+            self.joblist.InsertItem(num, str(job['id']))
+            self.joblist.SetItemData(num, job['id'])
+            self.joblist.SetItem(num, 1, job['cuefile'])
+            fmt = ('copy' if job['options']['codec_copy'] else
+                   job['options']['outputformat'])
+            self.joblist.SetItem(num, 2, fmt)
+            self.set_status(num, job['status'], job['progress'],
+                            job['message'])
+    # --------------------------------------------------------------------#
+
+    def set_status(self, index, status, progress, message):
+        """
+        Sets the status columns of the given row
+        """
+        text = QueueManager.STATUS.get(status, status)
+        if status == RUNNING:
+            text = f'{text} {progress}%'
+        self.joblist.SetItem(index, 3, text)
+        self.joblist.SetItem(index, 4, message)
+    # --------------------------------------------------------------------#
+
+    def selected_jobs(self):
+        """
+        Returns the ids of the selected jobs
+        """
+        jobids = []
+        index = self.joblist.GetFirstSelected()
+        while index != -1:
+            jobids.append(self.joblist.GetItemData(index))
+            index = self.joblist.GetNextSelected(index)
+        return jobids
+    # --------------------------------------------------------------------#
+
+    def add_cuesheets(self, paths):
+        """
+        Adds the given CUE files to the queue using the
+        current options of the main panel.
+        """
+        options = self.parent.gui_panel.get_split_options()
+        if self.ckbx_overwrite.IsChecked():
+            options['overwrite'] = 'always'
+        for cuefile in find_cuesheets(paths):
+            self.queue.add(cuefile, options)
+        self.populate_list()
+    # --------------------------------------------------------------------#
+
+    def on_add_files(self, event):
+        """
+        Adds the CUE files selected by the user
+        """
+        wildcard = "Source (*.cue;*.CUE)|*.cue;*.CUE|All files (*.*)|*.*"
+
+        with wx.FileDialog(self, _("Open CUE sheets"),
+                           "", "", wildcard, wx.FD_OPEN
+                           | wx.FD_MULTIPLE
+                           | wx.FD_FILE_MUST_EXIST) as filedlg:
+
+            if filedlg.ShowModal() == wx.ID_CANCEL:
+                return
+            self.add_cuesheets(filedlg.GetPaths())
+    # --------------------------------------------------------------------#
+
+    def on_add_folder(self, event):
+        """
+        Adds all CUE files found on the folder selected
+        by the user, including sub-folders.
+        """
+        with wx.DirDialog(self, _("Choose a folder containing CUE sheets"),
+                          "", wx.DD_DEFAULT_STYLE) as dirdlg:
+
+            if dirdlg.ShowModal() == wx.ID_CANCEL:
+                return
+            self.add_cuesheets([dirdlg.GetPath()])
+    # --------------------------------------------------------------------#
+
+    def on_remove(self, event):
+        """
+        Removes the selected jobs, except those running
+        """
+        self.queue.remove(self.selected_jobs())
+        self.populate_list()
+    # --------------------------------------------------------------------#
+
+    def on_retry(self, event):
+        """
+        Queues again the selected jobs
+        """
+        self.queue.retry(self.selected_jobs())
+        self.populate_list()
+    # --------------------------------------------------------------------#
+
+    def on_clear(self, event):
+        """
+        Removes all jobs successfully done
+        """
+        self.queue.clear_finished()
+        self.populate_list()
+    # --------------------------------------------------------------------#
+
+    def on_start(self, event):
+        """
+        Starts processing all the queued jobs
+        """
+        if self.parent.gui_panel.thread_type is not None:
+            wx.MessageBox(_('A split operation is already running, please '
+                            'wait for it to finish before proceeding.'),
+                          "FFaudiocue - Information",
+                          wx.ICON_INFORMATION, self)
+            return
+
+        self.btn_start.Disable()
+        self.btn_stop.Enable()
+        cmds = {'ffmpeg_cmd': self.appdata['ffmpeg_cmd'],
+                'ffprobe_cmd': self.appdata['ffprobe_cmd'],
+                'ffmpeg_loglevel': self.appdata['ffmpegloglev'],
+                'probecache': self.parent.gui_panel.probecache,
+                'charsets': self.parent.gui_panel.charsets,
+                'journals': self.parent.gui_panel.journals,
+                'limits': ProcessLimits.from_settings(self.appdata),
+                'fps': self.appdata['progressfps'],
+                }
+        self.thread_type = QueueProcessing(self.queue,
+                                           get_joblogs(self.appdata),
+                                           self.appdata['maxworkers'],
+                                           **cmds)
+    # --------------------------------------------------------------------#
+
+    def on_stop(self, event):
+        """
+        The user wants to abort the jobs, the running
+        ones will be queued again.
+        """
+        self.thread_type.stop()
+        self.thread_type.join()
+    # --------------------------------------------------------------------#
+
+    def update_job(self, jobid, status, progress, message):
+        """
+        Updates the row of the given job, receiving
+        the "QUEUE_JOB_EVT" messages.
+        """
+        index = self.joblist.FindItem(-1, jobid)
+        if index == wx.NOT_FOUND:
+            return
+        self.set_status(index, status, progress, message)
+    # --------------------------------------------------------------------#
+
+    def update_count_items(self, msg, end):
+        """
+        Shows the errors preventing the processing
+        """
+        if end == 'error':
+            wx.MessageBox(f'{msg}', "FFaudiocue - Error", wx.ICON_ERROR, self)
+    # --------------------------------------------------------------------#
+
+    def end_processing(self, status):
+        """
+        At the end of the process
+        """
+        self.thread_type = None
+        self.btn_start.Enable()
+        self.btn_stop.Disable()
+        self.populate_list()
+        if status['aborted']:
+            return
+        msg = _("{0} albums done, {1} failed"
+                ).format(status['done'], status['albums_failed'])
+        if status['metrics']['recipes']:
+            msg += f" - {format_summary(status['metrics'])}"
+        self.parent.statusbar_msg(msg)
+    # --------------------------------------------------------------------#
+
+    def on_close(self, event):
+        """
+        Destroy this dialog
+        """
+        if self.thread_type is not None:
+            wx.MessageBox(_("There are still active windows with running "
+                            "processes, make sure you finish your work "
+                            "before exit."),
+                          _('FFaudiocue - Warning'), wx.ICON_WARNING, self)
+            return
+
+        pub.unsubscribe(self.update_job, "QUEUE_JOB_EVT")
+        pub.unsubscribe(self.update_count_items, "QUEUE_COUNT_EVT")
+        pub.unsubscribe(self.end_processing, "QUEUE_END_EVT")
+        pub.sendMessage("DESTROY_ORPHANED_WINDOWS", msg='QueueManager')
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.15.2025
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 ########################################################
 
@@ -31,6 +31,7 @@ import wx
 from ffaudiocue.ffc_sys.app_const import supLang
 from ffaudiocue.ffc_utils.utils import detect_binaries
 from ffaudiocue.ffc_sys.settings_manager import ConfigManager
+from ffaudiocue.ffc_core.process_limits import IOCLASSES, parse_cpulist
 from ffaudiocue.ffc_inout import io_tools
 
 
@@ -153,6 +154,78 @@ class SetUp(wx.Dialog):
         grid_ffprobe.Add(self.txtctrl_ffprobe, 1, wx.ALL, 5)
         grid_ffprobe.Add(self.btn_loc_ffprobe, 0, wx.RIGHT | wx.CENTER, 5)
         # ----
+        sizer_ffmpeg.Add((0, 20))
+        lab_workers = wx.StaticText(tab_three, wx.ID_ANY,
+                                    _('Audio tracks to process at the '
+                                      'same time:'))
+        self.spin_workers = wx.SpinCtrl(tab_three, wx.ID_ANY, "1",
+                                        min=1, max=os.cpu_count() or 1,
+                                        size=(-1, -1),
+                                        style=wx.TE_PROCESS_ENTER
+                                        )
+        grid_workers = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_ffmpeg.Add(grid_workers, 0, wx.ALL, 5)
+        grid_workers.Add(lab_workers, 0, wx.ALIGN_CENTER_VERTICAL)
+        grid_workers.Add(self.spin_workers, 0, wx.LEFT, 5)
+        lab_fps = wx.StaticText(tab_three, wx.ID_ANY,
+                                _('Progress updates per second:'))
+        self.spin_fps = wx.SpinCtrl(tab_three, wx.ID_ANY, "10",
+                                    min=1, max=60,
+                                    size=(-1, -1),
+                                    style=wx.TE_PROCESS_ENTER
+                                    )
+        grid_fps = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_ffmpeg.Add(grid_fps, 0, wx.ALL, 5)
+        grid_fps.Add(lab_fps, 0, wx.ALIGN_CENTER_VERTICAL)
+        grid_fps.Add(self.spin_fps, 0, wx.LEFT, 5)
+        # ----
+        sizer_ffmpeg.Add((0, 10))
+        lab_limits = wx.StaticText(tab_three, wx.ID_ANY,
+                                   _('Resources of each FFmpeg process '
+                                     '(lower priority for background '
+                                     'splitting)'))
+        sizer_ffmpeg.Add(lab_limits, 0, wx.ALL | wx.EXPAND, 5)
+        grid_limits = wx.FlexGridSizer(4, 2, 5, 5)
+        sizer_ffmpeg.Add(grid_limits, 0, wx.ALL, 5)
+        lab_nice = wx.StaticText(tab_three, wx.ID_ANY,
+                                 _('Niceness (0 = normal priority):'))
+        self.spin_nice = wx.SpinCtrl(tab_three, wx.ID_ANY, "0",
+                                     min=0, max=19,
+                                     size=(-1, -1),
+                                     style=wx.TE_PROCESS_ENTER
+                                     )
+        grid_limits.Add(lab_nice, 0, wx.ALIGN_CENTER_VERTICAL)
+        grid_limits.Add(self.spin_nice, 0)
+        lab_ioclass = wx.StaticText(tab_three, wx.ID_ANY,
+                                    _('I/O scheduling class:'))
+        self.cmbx_ioclass = wx.ComboBox(tab_three, wx.ID_ANY,
+                                        choices=list(IOCLASSES),
+                                        size=(160, -1),
+                                        style=wx.CB_DROPDOWN | wx.CB_READONLY
+                                        )
+        grid_limits.Add(lab_ioclass, 0, wx.ALIGN_CENTER_VERTICAL)
+        grid_limits.Add(self.cmbx_ioclass, 0)
+        lab_affinity = wx.StaticText(tab_three, wx.ID_ANY,
+                                     _('CPUs to use (e.g. 0-3,6; empty '
+                                       'for all):'))
+        self.txtctrl_affinity = wx.TextCtrl(tab_three, wx.ID_ANY, "",
+                                            size=(160, -1))
+        grid_limits.Add(lab_affinity, 0, wx.ALIGN_CENTER_VERTICAL)
+        grid_limits.Add(self.txtctrl_affinity, 0)
+        lab_threads = wx.StaticText(tab_three, wx.ID_ANY,
+                                    _('Threads (0 = automatic):'))
+        self.spin_threads = wx.SpinCtrl(tab_three, wx.ID_ANY, "0",
+                                        min=0, max=os.cpu_count() or 1,
+                                        size=(-1, -1),
+                                        style=wx.TE_PROCESS_ENTER
+                                        )
+        grid_limits.Add(lab_threads, 0, wx.ALIGN_CENTER_VERTICAL)
+        grid_limits.Add(self.spin_threads, 0)
+        if not sys.platform.startswith('linux'):
+            self.cmbx_ioclass.Disable()
+        if self.appdata['ostype'] in ('Windows', 'Darwin'):
+            self.txtctrl_affinity.Disable()
+        # ----
         tab_three.SetSizer(sizer_ffmpeg)
         notebook.AddPage(tab_three, _("FFmpeg"))
 
@@ -242,6 +315,41 @@ class SetUp(wx.Dialog):
                                            style=wx.RA_SPECIFY_COLS,
                                            )
         sizer_log.Add(self.rdbx_log_ffmpeg, 0, wx.ALL | wx.EXPAND, 5)
+        sizer_log.Add((0, 10))
+        grid_logs = wx.FlexGridSizer(3, 2, 5, 5)
+        sizer_log.Add(grid_logs, 0, wx.ALL, 5)
+        lab_logsize = wx.StaticText(tab_five, wx.ID_ANY,
+                                    _('Rotate the job log files beyond '
+                                      '(KiB):'))
+        grid_logs.Add(lab_logsize, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.spin_logsize = wx.SpinCtrl(tab_five, wx.ID_ANY, "1024",
+                                        min=64, max=1048576,
+                                        size=(-1, -1),
+                                        style=wx.TE_PROCESS_ENTER
+                                        )
+        grid_logs.Add(self.spin_logsize, 0)
+        lab_logbackups = wx.StaticText(tab_five, wx.ID_ANY,
+                                       _('Rotated log files to keep:'))
+        grid_logs.Add(lab_logbackups, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.spin_logbackups = wx.SpinCtrl(tab_five, wx.ID_ANY, "3",
+                                           min=0, max=100,
+                                           size=(-1, -1),
+                                           style=wx.TE_PROCESS_ENTER
+                                           )
+        grid_logs.Add(self.spin_logbackups, 0)
+        lab_logjobs = wx.StaticText(tab_five, wx.ID_ANY,
+                                    _('Job logs to keep:'))
+        grid_logs.Add(lab_logjobs, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.spin_logjobs = wx.SpinCtrl(tab_five, wx.ID_ANY, "50",
+                                        min=1, max=10000,
+                                        size=(-1, -1),
+                                        style=wx.TE_PROCESS_ENTER
+                                        )
+        grid_logs.Add(self.spin_logjobs, 0)
+        self.ckbx_logcompress = wx.CheckBox(tab_five, wx.ID_ANY,
+                                            _("Compress the rotated log "
+                                              "files (gzip)"))
+        sizer_log.Add(self.ckbx_logcompress, 0, wx.ALL, 5)
         tab_five.SetSizer(sizer_log)
         notebook.AddPage(tab_five, _("Logging levels"))
 
@@ -336,11 +444,26 @@ class SetUp(wx.Dialog):
         self.Bind(wx.EVT_BUTTON, self.open_path_ffmpeg, self.btn_loc_ffmpeg)
         self.Bind(wx.EVT_CHECKBOX, self.exec_ffprobe, self.ckbx_exe_ffprobe)
         self.Bind(wx.EVT_BUTTON, self.open_path_ffprobe, self.btn_loc_ffprobe)
+        self.Bind(wx.EVT_SPINCTRL, self.on_workers, self.spin_workers)
+        self.Bind(wx.EVT_SPINCTRL, self.on_progress_fps, self.spin_fps)
+        self.Bind(wx.EVT_SPINCTRL, self.on_process_limits, self.spin_nice)
+        self.Bind(wx.EVT_COMBOBOX, self.on_process_limits,
+                  self.cmbx_ioclass)
+        self.Bind(wx.EVT_TEXT, self.on_process_limits,
+                  self.txtctrl_affinity)
+        self.Bind(wx.EVT_SPINCTRL, self.on_process_limits,
+                  self.spin_threads)
 
         self.Bind(wx.EVT_COMBOBOX, self.on_iconthemes, self.cmbx_icons)
         self.Bind(wx.EVT_RADIOBOX, self.on_toolbar_pos, self.rdbx_tb_pos)
         self.Bind(wx.EVT_COMBOBOX, self.on_toolbar_size, self.cmbx_icon_size)
         self.Bind(wx.EVT_RADIOBOX, self.logging_ffmpeg, self.rdbx_log_ffmpeg)
+        self.Bind(wx.EVT_SPINCTRL, self.on_log_rotation, self.spin_logsize)
+        self.Bind(wx.EVT_SPINCTRL, self.on_log_rotation,
+                  self.spin_logbackups)
+        self.Bind(wx.EVT_SPINCTRL, self.on_log_rotation, self.spin_logjobs)
+        self.Bind(wx.EVT_CHECKBOX, self.on_log_rotation,
+                  self.ckbx_logcompress)
 
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
         self.Bind(wx.EVT_BUTTON, self.on_cancel, btn_cancel)
@@ -386,7 +509,17 @@ class SetUp(wx.Dialog):
             self.txtctrl_ffprobe.AppendText(self.appdata['ffprobe_cmd'])
             self.ckbx_exe_ffprobe.SetValue(True)
 
+        self.spin_workers.SetValue(self.appdata['maxworkers'])
+        self.spin_fps.SetValue(self.appdata['progressfps'])
+        self.spin_nice.SetValue(self.appdata['ffmpegnice'])
+        self.cmbx_ioclass.SetValue(self.appdata['ffmpegioclass'])
+        self.txtctrl_affinity.ChangeValue(self.appdata['ffmpegaffinity'])
+        self.spin_threads.SetValue(self.appdata['ffmpegthreads'])
         self.ckbx_logclear.SetValue(self.appdata['clearlogfiles'])
+        self.spin_logsize.SetValue(self.appdata['logmaxsize'])
+        self.spin_logbackups.SetValue(self.appdata['logbackups'])
+        self.spin_logjobs.SetValue(self.appdata['logmaxjobs'])
+        self.ckbx_logcompress.SetValue(self.appdata['logcompress'])
         self.ckbx_exit.SetValue(self.appdata['warnexiting'])
         # self.ckbx_mnhiden.SetValue(self.appdata['showhidenmenu'])
     # --------------------------------------------------------------------#
@@ -422,6 +555,16 @@ class SetUp(wx.Dialog):
         self.settings['ffmpegloglev'] = logg
     # --------------------------------------------------------------------#
 
+    def on_log_rotation(self, event):
+        """
+        Set the rotation of the job log files
+        """
+        self.settings['logmaxsize'] = self.spin_logsize.GetValue()
+        self.settings['logbackups'] = self.spin_logbackups.GetValue()
+        self.settings['logmaxjobs'] = self.spin_logjobs.GetValue()
+        self.settings['logcompress'] = self.ckbx_logcompress.IsChecked()
+    # --------------------------------------------------------------------#
+
     def exec_ffmpeg(self, event):
         """Enable or disable ffmpeg local binary"""
         if self.ckbx_exe_ffmpeg.IsChecked():
@@ -503,6 +646,42 @@ class SetUp(wx.Dialog):
                     self.settings['ffprobe_cmd'] = getpath
     # --------------------------------------------------------------------#
 
+    def on_workers(self, event):
+        """
+        Set the maximum number of ffmpeg processes
+        running at the same time
+        """
+        self.settings['maxworkers'] = self.spin_workers.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_progress_fps(self, event):
+        """
+        Set the maximum number of progress updates
+        per second during processing
+        """
+        self.settings['progressfps'] = self.spin_fps.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_process_limits(self, event):
+        """
+        Set the priority, the I/O class, the CPU affinity and
+        the threads of the ffmpeg processes. The CPU list is
+        stored only while it is valid.
+        """
+        self.settings['ffmpegnice'] = self.spin_nice.GetValue()
+        self.settings['ffmpegioclass'] = self.cmbx_ioclass.GetValue()
+        self.settings['ffmpegthreads'] = self.spin_threads.GetValue()
+        cpus = self.txtctrl_affinity.GetValue().strip()
+        try:
+            parse_cpulist(cpus)
+        except ValueError:
+            self.txtctrl_affinity.SetBackgroundColour(wx.Colour('#f28c8c'))
+        else:
+            self.txtctrl_affinity.SetBackgroundColour(wx.NullColour)
+            self.settings['ffmpegaffinity'] = cpus
+        self.txtctrl_affinity.Refresh()
+    # --------------------------------------------------------------------#
+
     def on_iconthemes(self, event):
         """
         Set themes of icons
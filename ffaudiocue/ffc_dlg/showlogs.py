@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.15.2025
+Rev: Oct.18.2026
 Code checker flake8, pylint
 #########################################################
 
@@ -25,30 +25,46 @@ This file is part of FFaudiocue.
    You should have received a copy of the GNU General Public License
    along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
 """
-import os
+import time
 import wx
 from pubsub import pub
+from ffaudiocue.ffc_utils.log_reader import LogReader
+from ffaudiocue.ffc_core.job_logs import get_joblogs, read_segment
 
 
 class ShowLogs(wx.Dialog):
     """
-    Displays log text and includes refreshing
-    and clearing features.
+    Displays the log of the split jobs listed by the
+    jobs index (see `JobLogs`) and includes refreshing
+    and clearing features. Only the last lines of the
+    selected log file are read, the earlier ones and the
+    rotated files are loaded on demand by scrolling up to
+    the top of the text, while the new lines are followed
+    by a timer.
     """
-    # list of logs files to include
-    LOGNAMES = ('ffmpeg.log',)
+    STATUS = {'running': _('Running'),
+              'done': _('Done'),
+              'failed': _('Failed'),
+              'aborted': _('Aborted'),
+              }
+    # milliseconds between readings of the new lines
+    FOLLOW_INTERVAL = 1000
 
-    def __init__(self, parent, dirlog):
+    def __init__(self, parent, appdata):
         """
         Attributes defined here:
-        self.dirlog > log location directory (depends from OS)
-        self.logdata > dict object {KEY=file name.log: VAL=log data, ...}
+        self.joblogs > JobLogs object of the log directory
+        self.entries > list of the jobs index entries
+        self.reader > LogReader object of the selected log file
+        self.segments > rotated files not yet read
         self.selected > None if item on listctrl is not selected
-        file > log file name to view
+        self.timer > wx.Timer to follow the new lines
 
         """
-        self.dirlog = dirlog
-        self.logdata = {}
+        self.joblogs = get_joblogs(appdata)
+        self.entries = []
+        self.reader = None
+        self.segments = []
         self.selected = None
         get = wx.GetApp()  # get data from bootstrap
         vidicon = get.iconset['ffaudiocue']
@@ -67,10 +83,18 @@ class ShowLogs(wx.Dialog):
                                       | wx.LC_SINGLE_SEL
                                       )
         self.log_select.SetMinSize((700, 130))
-        self.log_select.InsertColumn(0, _('Log file list'), width=500)
+        self.log_select.InsertColumn(0, _('Date'), width=170)
+        self.log_select.InsertColumn(1, _('Job'), width=400)
+        self.log_select.InsertColumn(2, _('Status'), width=100)
         sizer_base.Add(self.log_select, 0, wx.ALL | wx.EXPAND, 5)
+        sizer_lab = wx.BoxSizer(wx.HORIZONTAL)
         labtxt = wx.StaticText(self, label=_('Log messages'))
-        sizer_base.Add(labtxt, 0, wx.ALL, 5)
+        sizer_lab.Add(labtxt, 1, wx.ALIGN_CENTER_VERTICAL)
+        self.btn_earlier = wx.Button(self, wx.ID_ANY,
+                                     _("Load earlier messages"))
+        self.btn_earlier.Disable()
+        sizer_lab.Add(self.btn_earlier, 0)
+        sizer_base.Add(sizer_lab, 0, wx.ALL | wx.EXPAND, 5)
         self.textdata = wx.TextCtrl(self, wx.ID_ANY, "",
                                     style=wx.TE_MULTILINE
                                     | wx.TE_READONLY
@@ -84,6 +108,10 @@ class ShowLogs(wx.Dialog):
         else:
             self.textdata.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
         sizer_base.Add(self.textdata, 1, wx.ALL | wx.EXPAND, 5)
+        self.ckbx_follow = wx.CheckBox(self, wx.ID_ANY,
+                                       _('Follow new messages'))
+        self.ckbx_follow.SetValue(True)
+        sizer_base.Add(self.ckbx_follow, 0, wx.ALL, 5)
 
         # ----- confirm buttons section
         grdBtn = wx.GridSizer(1, 2, 0, 0)
@@ -111,18 +139,26 @@ class ShowLogs(wx.Dialog):
         self.Fit()
         self.Layout()
 
-        # populate ListCtrl and set self.logdata dict
+        self.timer = wx.Timer(self)
+
+        # populate ListCtrl and select the first log file
         self.on_update(self)
 
         # ----------------------Binding (EVT)----------------------#
         self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_select, self.log_select)
         self.Bind(wx.EVT_LIST_ITEM_DESELECTED, self.on_deselect,
                   self.log_select)
+        self.Bind(wx.EVT_BUTTON, self.on_earlier, self.btn_earlier)
+        self.textdata.Bind(wx.EVT_MOUSEWHEEL, self.on_wheel)
+        self.Bind(wx.EVT_CHECKBOX, self.on_follow, self.ckbx_follow)
+        self.Bind(wx.EVT_TIMER, self.on_timer, self.timer)
         self.Bind(wx.EVT_BUTTON, self.on_update, button_update)
         self.Bind(wx.EVT_BUTTON, self.on_clear, button_clear)
         self.Bind(wx.EVT_BUTTON, self.on_close, button_close)
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
+        self.on_follow(self)
+
     # ----------------------Event handler (callback)----------------------#
 
     def on_clear(self, event):
@@ -135,39 +171,37 @@ class ShowLogs(wx.Dialog):
                           'FFaudiocue - Information', wx.ICON_INFORMATION)
             return
 
-        index = self.log_select.GetFocusedItem()
-        name = self.log_select.GetItemText(index, 0)
-
         if wx.MessageBox(_('Are you sure you want to clear the selected '
                            'log file?'), "FFaudiocue - Confirm",
                          wx.ICON_QUESTION
                          | wx.YES_NO, self) == wx.NO:
             return
 
-        with open(os.path.join(self.dirlog, name),
-                  'w', encoding='utf8') as log:
-            log.write('')
-
+        try:
+            self.joblogs.remove([self.selected['id']])
+        except OSError as err:
+            wx.MessageBox(f'{err}', "FFaudiocue - Error",
+                          wx.ICON_ERROR, self)
         self.on_update(self)
     # --------------------------------------------------------------------#
 
     def on_update(self, event):
         """
-        update data with new incoming
+        update the list of jobs from the jobs index,
+        the log messages are read on selection.
 
         """
-        self.logdata.clear()
+        self.on_deselect(self)
         self.log_select.DeleteAllItems()
-        index = 0
-        for files in os.listdir(self.dirlog):
-            if os.path.basename(files) in ShowLogs.LOGNAMES:  # listed only
-                with open(os.path.join(self.dirlog, files),
-                          'r', encoding='utf8') as log:
-                    self.logdata[files] = log.read()  # set value
-                    self.log_select.InsertItem(index, files)
-                index += 1
-
-        if index:
+        self.entries = self.joblogs.jobs()
+        for index, entry in enumerate(self.entries):
+            started = time.strftime('%c', time.localtime(entry['started']))
+            self.log_select.InsertItem(index, started)
+            self.log_select.SetItem(index, 1, entry['title'])
+            self.log_select.SetItem(index, 2, ShowLogs.STATUS.get(
+                entry['status'], entry['status']))
+
+        if self.entries:
             self.log_select.Focus(0)  # make the line the current line
             self.log_select.Select(0, on=1)  # default event selection
             self.on_select(self)
@@ -180,23 +214,111 @@ class ShowLogs(wx.Dialog):
         """
         self.textdata.Clear()
         self.selected = None
+        self.reader = None
+        self.segments = []
+        self.btn_earlier.Disable()
     # ------------------------------------------------------------------#
 
     def on_select(self, event):
         """
-        show data during items selection
+        show the last lines of the log file of the
+        selected job and move the cursor to the end
+        of the text.
 
         """
-        self.textdata.Clear()  # delete previous append:
         index = self.log_select.GetFocusedItem()
-        name = self.log_select.GetItemText(index, 0)
-        self.selected = name
-        self.textdata.AppendText(self.logdata.get(name))
-        self.textdata.SetInsertionPoint(0)  # set cursor to initial point
+        self.selected = self.entries[index]
+        self.reader = LogReader(self.joblogs.logfile(self.selected))
+        self.segments = self.joblogs.rotating_log(self.selected).segments()
+        try:
+            text = self.reader.tail()
+        except OSError as err:
+            self.reader = None
+            text = f'{err}'
+        self.textdata.SetValue(text)
+        self.textdata.ShowPosition(self.textdata.GetLastPosition())
+        self.btn_earlier.Enable(self.has_earlier())
+    # ------------------------------------------------------------------#
+
+    def has_earlier(self):
+        """
+        Returns True if there are log messages
+        before those shown, also in rotated files.
+        """
+        if self.reader and self.reader.has_earlier():
+            return True
+        return bool(self.segments)
+    # ------------------------------------------------------------------#
+
+    def on_earlier(self, event):
+        """
+        Insert the earlier lines of the log file at
+        the beginning of the text, keeping in view
+        the first line shown so far. When the start
+        of the file is reached, the last rotated file
+        is inserted.
+
+        """
+        try:
+            if self.reader and self.reader.has_earlier():
+                text = self.reader.earlier()
+            elif self.segments:
+                text = read_segment(self.segments.pop(0))
+            else:
+                return
+        except OSError:
+            return
+        self.textdata.Freeze()
+        self.textdata.SetInsertionPoint(0)
+        self.textdata.WriteText(text)
+        self.textdata.ShowPosition(len(text))
+        self.textdata.Thaw()
+        self.btn_earlier.Enable(self.has_earlier())
+    # ------------------------------------------------------------------#
+
+    def on_wheel(self, event):
+        """
+        Loads the earlier lines scrolling up
+        at the top of the log messages.
+
+        """
+        if (event.GetWheelRotation() > 0
+                and self.textdata.GetScrollPos(wx.VERTICAL) == 0):
+            self.on_earlier(self)
+        event.Skip()
+    # ------------------------------------------------------------------#
+
+    def on_follow(self, event):
+        """
+        Start or stop following the new lines
+        of the selected log file.
+
+        """
+        if self.ckbx_follow.IsChecked():
+            self.timer.Start(ShowLogs.FOLLOW_INTERVAL)
+        else:
+            self.timer.Stop()
+    # ------------------------------------------------------------------#
+
+    def on_timer(self, event):
+        """
+        Appends the new lines of the selected log file,
+        e.g. during a split. If the file was rotated
+        its last lines are read again.
+
+        """
+        if not self.reader:
+            return
+        text = self.reader.follow()
+        if text is None:
+            self.on_select(self)
+        elif text:
+            self.textdata.AppendText(text)
     # ------------------------------------------------------------------#
 
     def on_close(self, event):
         """
         Destroy this dialog
         """
+        self.timer.Stop()
         pub.sendMessage("DESTROY_ORPHANED_WINDOWS", msg='ShowLogs')
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.04.2022
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 
 This file is part of FFaudiocue.
@@ -25,6 +25,7 @@ This file is part of FFaudiocue.
    along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import datetime
 import wx
 import wx.adv
 from pubsub import pub
@@ -83,8 +84,13 @@ class PopupDialog(wx.Dialog):
                                   )
             loadDlg.ShowModal()
             loadDlg.Destroy()
+
+    With `cancel=True` a Cancel button is shown, which ends the
+    modal dialog with wx.ID_CANCEL. Otherwise the dialog ends
+    with wx.ID_OK when the "RESULT_EVT" message is received,
+    whose `status` is then available on the `result` attribute.
     """
-    def __init__(self, parent, title, msg):
+    def __init__(self, parent, title, msg, cancel=False):
         # Create a dialog
         wx.Dialog.__init__(self, parent, -1, title, size=(350, 150),
                            style=wx.CAPTION)
@@ -103,6 +109,10 @@ class PopupDialog(wx.Dialog):
         message = wx.StaticText(self, -1, msg, style=wx.ALIGN_CENTRE_VERTICAL)
         box2.Add(message, 0, wx.EXPAND | wx.ALL, 10)
         box.Add(box2, 0, wx.EXPAND)
+        if cancel:
+            btn_cancel = wx.Button(self, wx.ID_CANCEL, "")
+            box.Add(btn_cancel, 0, wx.ALL | wx.ALIGN_RIGHT, 10)
+            self.Bind(wx.EVT_BUTTON, self.on_cancel, btn_cancel)
         # Add an Info graphic
         bitmap = wx.Bitmap(48, 48)
         bitmap = wx.ArtProvider.GetBitmap(wx.ART_INFORMATION,
@@ -116,9 +126,18 @@ class PopupDialog(wx.Dialog):
         self.Fit()
         self.Layout()
 
+        self.result = None
         pub.subscribe(self.getMessage, "RESULT_EVT")
     # ----------------------------------------------------------#
 
+    def on_cancel(self, event):
+        """
+        The user does not want to wait anymore
+        """
+        pub.unsubscribe(self.getMessage, "RESULT_EVT")
+        self.EndModal(wx.ID_CANCEL)
+    # ----------------------------------------------------------#
+
     def getMessage(self, status):
         """
         Riceive msg and status from thread.
@@ -134,4 +153,71 @@ class PopupDialog(wx.Dialog):
 
         # self.Destroy() # do not work
         # self.actind.Stop()
-        self.EndModal(1)
+        pub.unsubscribe(self.getMessage, "RESULT_EVT")
+        self.result = status
+        self.EndModal(wx.ID_OK)
+
+
+class TrackListCtrl(wx.ListCtrl):
+    """
+    A virtual list control (wx.LC_VIRTUAL) showing the audio
+    tracks of a CUE sheet. Rows are not stored on the control,
+    they are read from the `audiotracks` list of FFCueSplitter
+    only when painted, so that even CUE sheets with hundreds
+    of tracks are shown at once.
+
+    Usage:
+            tracklist = TrackListCtrl(parent)
+            tracklist.set_tracks(data.audiotracks)
+            tracklist.refresh_tracks(index)  # after editing a track
+    """
+    def __init__(self, parent):
+        wx.ListCtrl.__init__(self, parent, wx.ID_ANY, style=wx.LC_REPORT
+                             | wx.LC_VIRTUAL
+                             | wx.SUNKEN_BORDER
+                             | wx.LC_SINGLE_SEL
+                             )
+        self.tracks = []
+        self.InsertColumn(0, (_('Track')), width=60)
+        self.InsertColumn(1, (_('Author')), width=130)
+        self.InsertColumn(2, (_('Title')), width=130)
+        self.InsertColumn(3, (_('Length')), width=80)
+        self.InsertColumn(4, (_('Album')), width=180)
+    # ----------------------------------------------------------#
+
+    def set_tracks(self, audiotracks):
+        """
+        Shows the given list of audio tracks
+        """
+        self.tracks = audiotracks
+        self.SetItemCount(len(audiotracks))
+        self.Refresh()
+    # ----------------------------------------------------------#
+
+    def refresh_tracks(self, index=None):
+        """
+        Repaints the row of the given track index or
+        all the rows if index is None.
+        """
+        if index is not None:
+            self.RefreshItem(index)
+        elif self.tracks:
+            self.RefreshItems(0, len(self.tracks) - 1)
+    # ----------------------------------------------------------#
+
+    def OnGetItemText(self, item, column):
+        """
+        Returns the text of the given row and column,
+        called by wx.ListCtrl on painting.
+        """
+        track = self.tracks[item]
+        if column == 0:
+            return track.get('TRACK_NUM', 'N/A')
+        if column == 1:
+            return track.get('PERFORMER', 'N/A')
+        if column == 2:
+            return track.get('TITLE', 'N/A')
+        if column == 3:
+            dur = track.get('DURATION', '')
+            return str(datetime.timedelta(seconds=dur))[2:7]
+        return track.get('ALBUM', 'N/A')
@@ -24,7 +24,6 @@ This file is part of FFaudiocue.
    You should have received a copy of the GNU General Public License
    along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
 """
-import requests
 import wx
 from ffaudiocue.ffc_utils.utils import open_default_application
 
@@ -48,8 +47,11 @@ def get_github_releases(url, keyname):
     see keyname examples here:
     <https://api.github.com/repos/jeanslack/FFaudiocue/releases>
 
+    `requests` is imported here, it is needed only by this
+    function and it is slow to import.
     """
     try:
+        import requests
         response = requests.get(url, timeout=20)
         not_found = None, None
     except Exception as err:
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.15.2025
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 ########################################################
 
@@ -27,18 +27,11 @@ This file is part of FFaudiocue.
 """
 import os
 import sys
-import webbrowser
 import wx
 from pubsub import pub
 from ffaudiocue.ffc_utils.get_bmpfromsvg import get_bmp
-from ffaudiocue.ffc_dlg import preferences
-from ffaudiocue.ffc_dlg import infoprg
-from ffaudiocue.ffc_dlg.cd_info import CdInfo
-from ffaudiocue.ffc_dlg.track_info import TrackInfo
-from ffaudiocue.ffc_dlg import check_new_version
-from ffaudiocue.ffc_dlg.showlogs import ShowLogs
+from ffaudiocue.ffc_core.job_queue import JobQueue
 from ffaudiocue.ffc_panels import cuesplitter_panel
-from ffaudiocue.ffc_inout import io_tools
 from ffaudiocue.ffc_sys.about_app import VERSION
 from ffaudiocue.ffc_sys.settings_manager import ConfigManager
 
@@ -58,6 +51,7 @@ class MainFrame(wx.Frame):
         # -------------------------------#
         self.showlogs = False
         self.cdinfo = False
+        self.jobqueue = False
 
         wx.Frame.__init__(self, None, -1, style=wx.DEFAULT_FRAME_STYLE)
 
@@ -92,6 +86,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_CLOSE, self.on_close)
         # ------------------------------------------------------------
         pub.subscribe(self.check_modeless_window, "DESTROY_ORPHANED_WINDOWS")
+        wx.CallAfter(self.resume_interrupted_jobs)
 
     # -------------------Status bar settings--------------------#
 
@@ -135,6 +130,9 @@ class MainFrame(wx.Frame):
         elif msg == 'CdInfo':
             self.cdinfo.Destroy()
             self.cdinfo = False
+        elif msg == 'QueueManager':
+            self.jobqueue.Destroy()
+            self.jobqueue = False
     # ------------------------------------------------------------------#
 
     def destroy_orphaned_window(self):
@@ -148,6 +146,9 @@ class MainFrame(wx.Frame):
         if self.cdinfo:
             self.cdinfo.Destroy()
             self.cdinfo = False
+        if self.jobqueue:
+            self.jobqueue.Destroy()
+            self.jobqueue = False
     # ---------------------- Event handler (callback) ------------------#
 
     def write_option_before_exit(self):
@@ -174,7 +175,8 @@ class MainFrame(wx.Frame):
         """
         This method is called after from the `main_setup_dlg()` method.
         """
-        if self.gui_panel.thread_type is not None:
+        if (self.gui_panel.thread_type is not None
+                or (self.jobqueue and self.jobqueue.thread_type)):
             wx.MessageBox(_("There are still active windows with running "
                             "processes, make sure you finish your work "
                             "before exit."),
@@ -190,7 +192,8 @@ class MainFrame(wx.Frame):
         """
         Application exit request given by the user.
         """
-        if self.gui_panel.thread_type is not None:
+        if (self.gui_panel.thread_type is not None
+                or (self.jobqueue and self.jobqueue.thread_type)):
             wx.MessageBox(_("There are still active windows with running "
                             "processes, make sure you finish your work "
                             "before exit."),
@@ -238,6 +241,9 @@ class MainFrame(wx.Frame):
         dscrp = (_("Open output folder\tCtrl+A"),
                  _("Open the current audio folder"))
         fold_convers = fileButton.Append(wx.ID_OPEN, dscrp[0], dscrp[1])
+        dscrp = (_("Job queue\tCtrl+J"),
+                 _("Split many CUE files sharing the same workers"))
+        jobqueue = fileButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
 
         fileButton.AppendSeparator()
         dscrp = (_("Work Notes\tCtrl+N"),
@@ -252,6 +258,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.opencue, fold_cue)
         self.Bind(wx.EVT_MENU, self.restore_cuefile, self.restoretag)
         self.Bind(wx.EVT_MENU, self.open_myfiles, fold_convers)
+        self.Bind(wx.EVT_MENU, self.on_job_queue, jobqueue)
         self.Bind(wx.EVT_MENU, self.reminder, notepad)
         self.Bind(wx.EVT_MENU, self.on_close, exititem)
 
@@ -308,6 +315,7 @@ class MainFrame(wx.Frame):
         Open the conversions folder with file manager
 
         """
+        from ffaudiocue.ffc_inout import io_tools
         io_tools.openpath(self.appdata['destination'])
     # -------------------------------------------------------------------#
 
@@ -318,6 +326,49 @@ class MainFrame(wx.Frame):
         self.gui_panel.on_import_cuefile(self)
     # -------------------------------------------------------------------#
 
+    def on_job_queue(self, event):
+        """
+        Show the job queue dialog
+        """
+        if self.jobqueue:
+            self.jobqueue.Raise()
+            return
+
+        from ffaudiocue.ffc_dlg.job_queue import QueueManager
+        self.jobqueue = QueueManager(self)
+        self.jobqueue.Show()
+    # ------------------------------------------------------------------#
+
+    def resume_interrupted_jobs(self):
+        """
+        Looks for the split jobs interrupted by a crash and
+        offers to resume them on the job queue, where the
+        tracks already done are skipped. Also removes the
+        temporary folders left over.
+        """
+        journals = self.gui_panel.journals
+        journals.sweep([self.appdata['destination']])
+        found = journals.interrupted()
+        if not found:
+            return
+        names = '\n'.join(journal.data['cuefile'] for journal in found)
+        msg = _("The following split jobs have been interrupted:\n\n"
+                "{0}\n\nDo you want to resume them from the job queue? "
+                "The tracks already done will be skipped.").format(names)
+        if wx.MessageBox(msg, _('FFaudiocue - Confirm'),
+                         wx.ICON_QUESTION | wx.YES_NO, self) == wx.NO:
+            for journal in found:
+                journal.discard()
+            return
+
+        queue = JobQueue(os.path.join(self.appdata['confdir'],
+                                      'jobqueue.json'))
+        for journal in found:
+            queue.add(journal.data['cuefile'], journal.data['options'])
+            journal.release()
+        self.on_job_queue(self)
+    # ------------------------------------------------------------------#
+
     def reminder(self, event):
         """
         Call `io_tools.openpath` to open a 'user_memos.txt' file
@@ -325,6 +376,7 @@ class MainFrame(wx.Frame):
         not exist a new empty file with the same name will be created.
 
         """
+        from ffaudiocue.ffc_inout import io_tools
         fname = os.path.join(self.appdata['confdir'], 'user_memos.txt')
 
         if os.path.exists(fname) and os.path.isfile(fname):
@@ -349,6 +401,7 @@ class MainFrame(wx.Frame):
         see <https://docs.python.org/3.8/library/webbrowser.html>
         """
         page = 'https://github.com/jeanslack/ffaudiocue'
+        import webbrowser
         webbrowser.open(page)
     # ------------------------------------------------------------------#
 
@@ -356,18 +409,21 @@ class MainFrame(wx.Frame):
         """wiki page """
 
         page = 'https://github.com/jeanslack/FFaudiocue/wiki'
+        import webbrowser
         webbrowser.open(page)
     # ------------------------------------------------------------------#
 
     def issues(self, event):
         """Display issues page on github"""
         page = 'https://github.com/jeanslack/ffaudiocue/issues'
+        import webbrowser
         webbrowser.open(page)
     # ------------------------------------------------------------------#
 
     def doc_ffmpeg(self, event):
         """Display FFmpeg page documentation"""
         page = 'https://www.ffmpeg.org/documentation.html'
+        import webbrowser
         webbrowser.open(page)
     # -------------------------------------------------------------------#
 
@@ -376,6 +432,8 @@ class MainFrame(wx.Frame):
         Compare the FFaudiocue version with a given
         new version found on github.
         """
+        from ffaudiocue.ffc_inout import io_tools
+        from ffaudiocue.ffc_dlg import check_new_version
         this = VERSION  # this version
         url = ("https://api.github.com/repos/jeanslack/"
                "FFaudiocue/releases/latest")
@@ -414,12 +472,14 @@ class MainFrame(wx.Frame):
     def sponsor_this_project(self, event):
         """Go to sponsor page"""
         page = 'https://github.com/sponsors/jeanslack'
+        import webbrowser
         webbrowser.open(page)
     # ------------------------------------------------------------------#
 
     def donate_to_dev(self, event):
         """Go to donation page"""
         page = 'https://www.paypal.me/GPernigotto'
+        import webbrowser
         webbrowser.open(page)
     # ------------------------------------------------------------------#
 
@@ -427,6 +487,7 @@ class MainFrame(wx.Frame):
         """
         Display the program informations and developpers
         """
+        from ffaudiocue.ffc_dlg import infoprg
         infoprg.info_gui(self, self.icons['ffaudiocue'])
 
     # -----------------  BUILD THE TOOL BAR  --------------------###
@@ -468,12 +529,16 @@ class MainFrame(wx.Frame):
         self.toolbar.SetToolBitmapSize(bmp_size)
 
         if 'wx.svg' in sys.modules:  # available only in wx version 4.1 to up
-            bmplog = get_bmp(self.icons['log'], bmp_size)
-            bmpsetup = get_bmp(self.icons['setup'], bmp_size)
-            bmpcdinfo = get_bmp(self.icons['CDinfo'], bmp_size)
-            bmptrkinfo = get_bmp(self.icons['trackinfo'], bmp_size)
-            bmpsplit = get_bmp(self.icons['startsplit'], bmp_size)
-            bmpstop = get_bmp(self.icons['stop'], bmp_size)
+            cache = {'cachedir': os.path.join(self.appdata['confdir'],
+                                              'iconcache'),
+                     'window': self,
+                     }  # rasterized once, see `get_bmp`
+            bmplog = get_bmp(self.icons['log'], bmp_size, **cache)
+            bmpsetup = get_bmp(self.icons['setup'], bmp_size, **cache)
+            bmpcdinfo = get_bmp(self.icons['CDinfo'], bmp_size, **cache)
+            bmptrkinfo = get_bmp(self.icons['trackinfo'], bmp_size, **cache)
+            bmpsplit = get_bmp(self.icons['startsplit'], bmp_size, **cache)
+            bmpstop = get_bmp(self.icons['stop'], bmp_size, **cache)
 
         else:
             bmplog = wx.Bitmap(self.icons['log'], wx.BITMAP_TYPE_ANY)
@@ -574,6 +639,7 @@ class MainFrame(wx.Frame):
             self.cdinfo.Raise()
             return
 
+        from ffaudiocue.ffc_dlg.cd_info import CdInfo
         self.cdinfo = CdInfo(self,
                              self.gui_panel.data.cue.meta.data,
                              self.gui_panel.data.probedata,
@@ -587,6 +653,7 @@ class MainFrame(wx.Frame):
         """
         Call track info dialog
         """
+        from ffaudiocue.ffc_dlg.track_info import TrackInfo
         index = self.gui_panel.tracklist.GetFocusedItem()
         with TrackInfo(self,
                        self.gui_panel.author,
@@ -600,8 +667,11 @@ class MainFrame(wx.Frame):
                 if data:
                     self.gui_panel.author = data[0]
                     self.gui_panel.album = data[1]
-                    self.gui_panel.data.audiotracks = data[2]
-                    self.gui_panel.set_data_list_ctrl()
+                    self.gui_panel.data.audiotracks = data[2]  # same list
+                    if trackinfo.ckbx_glob.IsChecked():
+                        self.gui_panel.tracklist.refresh_tracks()
+                    else:
+                        self.gui_panel.tracklist.refresh_tracks(index)
     # -------------------------------------------------------------------#
 
     def restore_cuefile(self, event):
@@ -617,6 +687,7 @@ class MainFrame(wx.Frame):
         handle like filters dialogs on FFaudiocue, being need
         to get the return code from getvalue interface.
         """
+        from ffaudiocue.ffc_dlg import preferences
         msg = _("Some changes require restarting the application.")
         with preferences.SetUp(self) as set_up:
             if set_up.ShowModal() == wx.ID_OK:
@@ -641,6 +712,7 @@ class MainFrame(wx.Frame):
             self.showlogs.Raise()
             return
 
-        self.showlogs = ShowLogs(self, self.appdata['logdir'])
+        from ffaudiocue.ffc_dlg.showlogs import ShowLogs
+        self.showlogs = ShowLogs(self, self.appdata)
         self.showlogs.Show()
     # ------------------------------------------------------------------#
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.04.2022
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 ########################################################
 
@@ -27,16 +27,24 @@ This file is part of FFaudiocue.
 """
 import os
 import shutil
-import tempfile
-import datetime
 import wx
 import wx.lib.scrolledpanel as scrolled
 from pubsub import pub
-from ffcuesplitter.cuesplitter import FFCueSplitter
-from ffcuesplitter.utils import makeoutputdirs, remove_source_file, sanitize
 from ffaudiocue.ffc_utils.utils import get_codec_quality_items
-from ffaudiocue.ffc_threads.ffmpeg_processing import Processing
-from ffaudiocue.ffc_dlg.widget_utils import notification_area
+from ffaudiocue.ffc_core.finalize import (existing_tracks,
+                                          move_tracks,
+                                          make_staging_dir,
+                                          )
+from ffaudiocue.ffc_core.probe_cache import ProbeCache
+from ffaudiocue.ffc_core.charset_cache import CharsetCache
+from ffaudiocue.ffc_core.journal import Journals
+from ffaudiocue.ffc_core.job_logs import get_joblogs
+from ffaudiocue.ffc_core.metrics import format_summary
+from ffaudiocue.ffc_core.process_limits import ProcessLimits
+from ffaudiocue.ffc_dlg.widget_utils import (notification_area,
+                                             PopupDialog,
+                                             TrackListCtrl,
+                                             )
 from ffaudiocue.ffc_dlg.list_warning import ListWarning
 
 
@@ -47,19 +55,12 @@ def move_files_to_outputdir(outputdir, tmpdir):
     to output folder. Here evaluates what to do if files already
     exists on output folder.
     """
-    tracklist = []
-    existslist = []
-
-    for track in os.listdir(tmpdir):
-        tracklist.append(track)
-        fdest = os.path.join(outputdir, track)
-        if os.path.exists(fdest):
-            existslist.append(f'"{fdest}"')
+    tracklist, existslist = existing_tracks(outputdir, tmpdir)
 
     if existslist:
         msg = _('Files already exist, do you want to overwrite them?')
         with ListWarning(None,
-                         dict.fromkeys(existslist, ''),
+                         dict.fromkeys([f'"{f}"' for f in existslist], ''),
                          caption=_('Please confirm'),
                          header=msg,
                          buttons='CONFIRM',
@@ -67,36 +68,13 @@ def move_files_to_outputdir(outputdir, tmpdir):
             response = log.ShowModal()
 
             if response == wx.ID_YES:
-                for track in tracklist:
-                    orig = os.path.join(tmpdir, track)
-                    dest = os.path.join(outputdir, track)
-                    try:
-                        shutil.move(orig, dest)
-                    except Exception as error:
-                        return error
-            elif response == wx.ID_NO:
-                for track in tracklist:
-                    orig = os.path.join(tmpdir, track)
-                    dest = os.path.join(outputdir, track)
-                    if not os.path.exists(dest):
-                        try:
-                            shutil.move(orig, dest)
-                        except Exception as error:
-                            return error
-            else:
-                return 'cancelled'
-
-            return None
-
-    for track in tracklist:
-        orig = os.path.join(tmpdir, track)
-        dest = os.path.join(outputdir, track)
-        try:
-            shutil.move(orig, dest)
-        except Exception as error:
-            return error
+                return move_tracks(outputdir, tmpdir, tracklist)
+            if response == wx.ID_NO:
+                return move_tracks(outputdir, tmpdir, tracklist,
+                                   overwrite=False)
+            return 'cancelled'
 
-    return None
+    return move_tracks(outputdir, tmpdir, tracklist)
 
 
 class CueGui(wx.Panel):
@@ -120,6 +98,16 @@ class CueGui(wx.Panel):
         self.author = None
         self.album = None
         self.tmpdir = None  # path to tempdir folder
+        self.progress = None  # last (track, percent) shown
+        self.probecache = ProbeCache(os.path.join(self.appdata['confdir'],
+                                                  'probecache.json'))
+        self.charsets = CharsetCache(os.path.join(self.appdata['confdir'],
+                                                  'charsets.json'))
+        self.journals = Journals(os.path.join(self.appdata['confdir'],
+                                              'journal'))
+        self.journal = None  # the JobJournal of the running job
+        self.manifest = None  # the Manifest of the incremental split
+        self.fingerprints = {}  # of the tracks written, see `get_recipes`
 
         wx.Panel.__init__(self, parent, -1, style=wx.TAB_TRAVERSAL)
 
@@ -171,6 +159,12 @@ class CueGui(wx.Panel):
         msg = _('Copy codec and format\n(very fast)')
         self.ckbx_codec_copy = wx.CheckBox(panelscroll, wx.ID_ANY, msg)
         fgs1.Add(self.ckbx_codec_copy, 0, wx.ALL, 5)
+        msg = _('Decode the source only once\n(single pass)')
+        self.ckbx_singlepass = wx.CheckBox(panelscroll, wx.ID_ANY, msg)
+        fgs1.Add(self.ckbx_singlepass, 0, wx.ALL, 5)
+        msg = _('Skip the unchanged tracks\n(incremental)')
+        self.ckbx_incremental = wx.CheckBox(panelscroll, wx.ID_ANY, msg)
+        fgs1.Add(self.ckbx_incremental, 0, wx.ALL, 5)
         line1 = wx.StaticLine(panelscroll, wx.ID_ANY, pos=wx.DefaultPosition,
                               size=wx.DefaultSize, style=wx.LI_HORIZONTAL,
                               name=wx.StaticLineNameStr
@@ -210,6 +204,13 @@ class CueGui(wx.Panel):
                                  label=_("Miscellaneous:")
                                  )
         fgs1.Add(lbl_misc, 0, wx.ALL | wx.EXPAND, 5)
+        msg = _('Verify the tracks at the end\n(decode and duration check)')
+        self.ckbx_verify = wx.CheckBox(panelscroll, wx.ID_ANY, msg)
+        fgs1.Add(self.ckbx_verify, 0, wx.ALL, 5)
+        msg = _('Write the checksums of the tracks\n(MD5, CRC32, '
+                'AccurateRip)')
+        self.ckbx_checksums = wx.CheckBox(panelscroll, wx.ID_ANY, msg)
+        fgs1.Add(self.ckbx_checksums, 0, wx.ALL, 5)
         msg = _('Remove original files at the end\n(after successful)')
         self.ckbx_removesrc = wx.CheckBox(panelscroll, wx.ID_ANY, msg)
         fgs1.Add(self.ckbx_removesrc, 0, wx.ALL, 5)
@@ -220,15 +221,8 @@ class CueGui(wx.Panel):
         panelscroll.SetupScrolling()
 
         # -------------listctrl
-        self.tracklist = wx.ListCtrl(self, wx.ID_ANY, style=wx.LC_REPORT
-                                     | wx.SUNKEN_BORDER | wx.LC_SINGLE_SEL
-                                     )
+        self.tracklist = TrackListCtrl(self)
         boxlistctrl.Add(self.tracklist, 1, wx.ALL | wx.EXPAND, 5)
-        self.tracklist.InsertColumn(0, (_('Track')), width=60)
-        self.tracklist.InsertColumn(1, (_('Author')), width=130)
-        self.tracklist.InsertColumn(2, (_('Title')), width=130)
-        self.tracklist.InsertColumn(3, (_('Length')), width=80)
-        self.tracklist.InsertColumn(4, (_('Album')), width=180)
 
         sizer_cuefile = wx.BoxSizer(wx.HORIZONTAL)
         sizer_base.Add(sizer_cuefile, 0, wx.EXPAND | wx.ALL, 5)
@@ -324,23 +318,46 @@ class CueGui(wx.Panel):
 
     def load_cuefile(self, newincoming):
         """
-        Load the imported CUE file using FFCueSplitter package
+        Load the imported CUE file using FFCueSplitter package.
+        The loading runs on the `CueLoader` thread while a
+        cancellable pop-up dialog is shown.
         """
         self.txt_path_cue.SetValue(newincoming)
         newenc = " ".join(self.txt_charsenc.GetValue().split())
 
-        kwargs = {'filename': newincoming,
-                  'ffprobe_cmd': self.appdata['ffprobe_cmd'],
-                  'ffmpeg_cmd': self.appdata['ffmpeg_cmd'],
-                  'ffmpeg_loglevel': self.appdata['ffmpegloglev'],
-                  'progress_meter': 'tqdm',
-                  'characters_encoding': newenc,
-                  }  # for instance
-        try:
-            self.data = FFCueSplitter(**kwargs)
-        except Exception as err:
-            wx.MessageBox(f'{err}', "FFaudiocue - Error", wx.ICON_ERROR, self)
+        loaddlg = PopupDialog(self, _("FFaudiocue - Loading..."),
+                              _("\nLoading the CUE sheet and probing "
+                                "the audio files.\nPlease wait...\n"),
+                              cancel=True,
+                              )
+        from ffaudiocue.ffc_threads.cue_loader import CueLoader
+        loader = CueLoader(newincoming,
+                           self.appdata['ffprobe_cmd'],
+                           self.appdata['ffmpeg_cmd'],
+                           self.appdata['ffmpegloglev'],
+                           newenc,
+                           self.probecache,
+                           self.charsets,
+                           )
+        ret = loaddlg.ShowModal()
+        status = loaddlg.result
+        loaddlg.Destroy()
+
+        if ret == wx.ID_CANCEL:
+            loader.cancel()
+            self.parent.statusbar_msg(_("Loading cancelled"))
             return
+        if status['error']:
+            wx.MessageBox(status['error'], "FFaudiocue - Error",
+                          wx.ICON_ERROR, self)
+            return
+
+        self.data = status['data']
+        if self.ckbx_charsenc.IsChecked():  # remembers the user choice
+            try:
+                self.charsets.confirm(newincoming, newenc)
+            except OSError:
+                pass
 
         self.txt_charsenc.ChangeValue(self.data.chars_enc['encoding'])
         self.author = self.data.cue.meta.data['PERFORMER']
@@ -377,16 +394,7 @@ class CueGui(wx.Panel):
         """
         Populates listctrl and enable/disable some btns
         """
-        self.tracklist.DeleteAllItems()
-
-        for num, item in enumerate(self.data.audiotracks):
-            self.tracklist.InsertItem(num, item.get('TRACK_NUM', 'N/A'))
-            self.tracklist.SetItem(num, 1, item.get('PERFORMER', 'N/A'))
-            self.tracklist.SetItem(num, 2, item.get('TITLE', 'N/A'))
-            dur = item.get('DURATION', '')
-            sec = str(datetime.timedelta(seconds=dur))[2:7]
-            self.tracklist.SetItem(num, 3, sec)
-            self.tracklist.SetItem(num, 4, item.get('ALBUM', 'N/A'))
+        self.tracklist.set_tracks(self.data.audiotracks)
 
         self.parent.toolbar.EnableTool(12, True)  # start
         self.parent.toolbar.EnableTool(8, True)  # audio CD
@@ -426,11 +434,13 @@ class CueGui(wx.Panel):
             self.cmbx_quality.Disable()
             self.lbl_quality.Disable()
             self.lbl_formats.Disable()
+            self.ckbx_singlepass.Disable()
         else:
             self.cmbx_formats.Enable()
             self.cmbx_quality.Enable()
             self.lbl_quality.Enable()
             self.lbl_formats.Enable()
+            self.ckbx_singlepass.Enable()
     # -----------------------------------------------------------------#
 
     def on_select(self, event):
@@ -460,6 +470,10 @@ class CueGui(wx.Panel):
             self.txt_charsenc.Disable()
             self.txt_charsenc.ChangeValue('auto')
             self.btn_confirm.Disable()
+            try:  # back to the detected encoding
+                self.charsets.forget(self.txt_path_cue.GetValue())
+            except OSError:
+                pass
             self.on_import_cuefile(self, loadlast=True)
     # ----------------------------------------------------------------------
 
@@ -481,45 +495,55 @@ class CueGui(wx.Panel):
         self.btn_confirm.Disable()
     # ----------------------------------------------------------------------
 
+    def get_split_options(self):
+        """
+        Returns the current split options as a dict for the
+        `setup_splitter` function, also used by the job queue.
+        An empty destination means the folder of the CUE file.
+        """
+        if self.ckbx_samedest.IsChecked():
+            destination = ''
+        else:
+            destination = self.txt_out.GetValue()
+
+        return {'outputformat': self.cmbx_formats.GetValue(),
+                'quality': self.cmbx_quality.GetValue(),
+                'codec_copy': self.ckbx_codec_copy.IsChecked(),
+                'destination': destination,
+                'collection': self.ckbx_collection.IsChecked(),
+                'singlepass': self.ckbx_singlepass.IsChecked(),
+                'incremental': self.ckbx_incremental.IsChecked(),
+                'charset': 'auto',
+                'overwrite': 'never',
+                'verify': self.ckbx_verify.IsChecked(),
+                'checksums': self.ckbx_checksums.IsChecked(),
+                }
+    # ----------------------------------------------------------------------
+
     def update_attributes_of_ffcuesplitter_api(self):
         """
         Set required arguments on ffcuesplitter API
         """
-        self.data.kwargs['ffmpeg_cmd'] = self.appdata['ffmpeg_cmd']
-        self.data.kwargs['ffmpeg_loglevel'] = self.appdata['ffmpegloglev']
-
+        opts = self.get_split_options()
+        opts.update(ffmpeg_cmd=self.appdata['ffmpeg_cmd'],
+                    ffmpeg_loglevel=self.appdata['ffmpegloglev'],
+                    author=self.author,
+                    album=self.album,
+                    limits=ProcessLimits.from_settings(self.appdata),
+                    )
+        from ffaudiocue.ffc_core.split_args import setup_splitter
+        outputdir = setup_splitter(self.data, **opts)
+        # FLAC sources are cut by frames unless they are unsupported
         msg = (_('Due to a known issue in FFmpeg with cutting FLAC files, '
                  'Copy Codec and Format may lead to unexpected results.\n'
                  'This issue appears to only affect the FLAC format.'))
-        if self.ckbx_codec_copy.IsChecked():
+        if (self.ckbx_codec_copy.IsChecked()
+                and not self.data.kwargs['native_flac']):
             src = os.path.splitext(self.data.audiosource)[1]
             if src in ('.flac', '.FLAC'):
                 wx.MessageBox(f'{msg}', "FFaudiocue- Information",
                               wx.ICON_INFORMATION, self)
-            self.data.kwargs['ffmpeg_add_params'] = "-c copy"
-        else:
-            self.data.kwargs['outputformat'] = self.cmbx_formats.GetValue()
-            items = get_codec_quality_items(self.cmbx_formats.GetValue())
-            compression = items[self.cmbx_quality.GetValue()]
-            self.data.kwargs['ffmpeg_add_params'] = compression
-
-        if self.ckbx_samedest.IsChecked():
-            self.appdata['destination'] = self.data.kwargs['dirname']
-        else:
-            self.appdata['destination'] = self.txt_out.GetValue()
-
-        if self.ckbx_collection.IsChecked() is True:
-            unkp, unka = 'Unknown Author', 'Unknown Album'
-            author = unkp if not sanitize(self.author) else self.author
-            album = unka if not sanitize(self.album) else self.album
-            coll = os.path.join(self.appdata['destination'],
-                                sanitize(author),
-                                sanitize(album),
-                                )
-            self.appdata['destination'] = coll
-            self.data.kwargs['outputdir'] = self.appdata['destination']
-        else:
-            self.data.kwargs['outputdir'] = self.appdata['destination']
+        self.appdata['destination'] = outputdir
 
         return False
     # ----------------------------------------------------------------------
@@ -529,6 +553,12 @@ class CueGui(wx.Panel):
         Prepares and updates the required operations
         for thread instance
         """
+        if self.parent.jobqueue and self.parent.jobqueue.thread_type:
+            wx.MessageBox(_('The job queue is running, please wait for it '
+                            'to finish before proceeding.'),
+                          "FFaudiocue - Information",
+                          wx.ICON_INFORMATION, self)
+            return
         if self.btn_confirm.IsEnabled() is True:
             msg = (_('The character encoding of the CUE file has not been '
                      'applied yet. Please click the Appy button before '
@@ -540,23 +570,45 @@ class CueGui(wx.Panel):
         if ret:
             return
 
-        self.tmpdir = tempfile.mkdtemp(suffix=None,
-                                       prefix='FFaudiocue_',
-                                       dir=None)
+        from ffaudiocue.ffc_core.split_args import get_recipes
+        from ffaudiocue.ffc_core.incremental import Manifest
+        from ffaudiocue.ffc_threads.ffmpeg_processing import Processing
+        self.tmpdir = make_staging_dir(self.data.kwargs['outputdir'])
         self.data.kwargs['tempdir'] = self.tmpdir
+        self.manifest = None
+        if self.ckbx_incremental.IsChecked():
+            self.manifest = Manifest(self.data.kwargs['outputdir'])
         try:
-            args = self.data.commandargs(self.data.audiotracks)
+            args = get_recipes(self.data, self.ckbx_singlepass.IsChecked(),
+                               self.manifest)
         except Exception as err:
             wx.MessageBox(f'{err}', "FFaudiocue - Error",
                           wx.ICON_ERROR, self)
             return
+        if not args['recipes']:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            wx.MessageBox(_('All the audio tracks are unchanged since the '
+                            'last split, there is nothing to do.'),
+                          "FFaudiocue - Information",
+                          wx.ICON_INFORMATION, self)
+            return
+        self.fingerprints = args.get('fingerprints', {})
 
         self.parent.toolbar.EnableTool(13, True)  # stop
         self.parent.toolbar.EnableTool(12, False)  # start
         self.parent.toolbar.EnableTool(5, False)  # setup
 
-        logfile = os.path.join(self.appdata['logdir'], 'ffaudiocue.log')
-        self.thread_type = Processing(args, logfile)
+        self.journal = self.journals.begin(
+            os.path.abspath(self.data.kwargs['filename']),
+            self.get_split_options(), self.data.kwargs['outputdir'],
+            self.tmpdir, args['recipes'])
+        title = os.path.basename(self.data.kwargs['filename'])
+        self.thread_type = Processing(args, get_joblogs(self.appdata), title,
+                                      self.appdata['maxworkers'],
+                                      self.appdata['progressfps'],
+                                      self.journal,
+                                      ProcessLimits.from_settings(
+                                          self.appdata))
     # ----------------------------------------------------------------------
 
     def on_stop(self, event):
@@ -572,20 +624,24 @@ class CueGui(wx.Panel):
         self.thread_type.join()
     # ----------------------------------------------------------------------
 
-    def update_progress_bar(self, output, duration, track, status):
+    def update_progress_bar(self, track, percent, elapsed, duration, status):
         """
-        Update progress bar by receving ffmpeg stdout pipe on
-        thread loop. If `status` is not 0 means an error is
+        Update progress bar receiving the overall progress
+        already parsed and throttled by the thread, see
+        `SplitEngine`. If `status` is not 0 means an error is
         occurred. This is usually a syntax error or some
         incompatibility in the arguments passed to the FFmpeg
-        command.
+        command. The gauge and the status bar are repainted
+        only if the track or the rounded percentage change.
         """
         if not status == 0:
             self.error = True
             return
 
-        secs = round(int(output.split('=')[1]) / 1_000_000)
-        percent = secs / round(duration) * 100
+        progress = (track, round(percent))
+        if progress == self.progress:
+            return
+        self.progress = progress
         msg = _("Processing... File number: {} | Status "
                 "Progress: {}%").format(track, round(percent))
         self.barprog.SetValue(round(percent))
@@ -606,11 +662,13 @@ class CueGui(wx.Panel):
         else:
             self.barprog.SetRange(100)  # set overall percentage range
             self.barprog.SetValue(0)  # reset bar progress to 0
+            self.progress = None
     # ----------------------------------------------------------------------
 
-    def end_processing(self):
+    def end_processing(self, metrics=None):
         """
-        At the end of the process
+        At the end of the process, `metrics` is the
+        summary of the metrics (see `RecipeMetrics`).
         """
         if self.abort is True:
             self.parent.statusbar_msg(_("...Interrupted"),
@@ -622,9 +680,20 @@ class CueGui(wx.Panel):
                                              "See Logs for details."),
                               wx.ICON_ERROR)
         else:
+            from ffcuesplitter.utils import makeoutputdirs
             makeoutputdirs(self.data.kwargs['outputdir'])  # if doesn't exists
-            ret = move_files_to_outputdir(self.data.kwargs['outputdir'],
-                                          self.data.kwargs['tempdir'])
+            ret = None
+            if self.manifest:
+                ret = self.manifest.replace_owned(self.data.kwargs['tempdir'])
+            if not ret:
+                ret = move_files_to_outputdir(self.data.kwargs['outputdir'],
+                                              self.data.kwargs['tempdir'])
+            failed = []
+            if not ret and self.ckbx_verify.IsChecked():
+                failed = self.verify_tracks()
+            if self.manifest:
+                self.manifest.commit(self.fingerprints,
+                                     self.data.kwargs['tempdir'], failed)
             if ret == 'cancelled':
                 self.parent.statusbar_msg(_("FAILED: Operation cancelled"),
                                           'YELLOW', 'BLACK')
@@ -644,6 +713,20 @@ class CueGui(wx.Panel):
                                           'RED', 'WHITE')
                 return
 
+            if failed:
+                self.parent.statusbar_msg(_("ERROR: Tracks failed "
+                                            "verification"), 'RED', 'WHITE')
+                self.barprog.SetValue(0)
+                self.reset_gui()
+                return
+
+            if self.ckbx_checksums.IsChecked() and not self.checksums():
+                self.parent.statusbar_msg(_("ERROR: Checksums failed"),
+                                          'RED', 'WHITE')
+                self.barprog.SetValue(0)
+                self.reset_gui()
+                return
+
             if self.ckbx_removesrc.IsChecked():
                 cuef = self.data.kwargs['filename']
                 audf = self.data.audiosource
@@ -655,14 +738,17 @@ class CueGui(wx.Panel):
                                        | wx.YES_NO
                                        | wx.CANCEL).ShowModal()
                 if dlg == wx.ID_YES:
+                    from ffcuesplitter.utils import remove_source_file
                     ret = remove_source_file(cuef, audf)
                     if ret is False:
                         msg = _("File deletion failed: Files are missing")
                         wx.MessageBox(msg, "FFaudiocue - Error",
                                       wx.ICON_ERROR, self)
 
-            self.parent.statusbar_msg(_("...Finished!"),
-                                      'DARK GREEN', 'WHITE')
+            msg = _("...Finished!")
+            if metrics and metrics['recipes']:
+                msg += f'  {format_summary(metrics)}'
+            self.parent.statusbar_msg(msg, 'DARK GREEN', 'WHITE')
             notification_area(_('Success!'), _("Get your files at the "
                                                "destination you specified"),
                               wx.ICON_INFORMATION)
@@ -670,6 +756,85 @@ class CueGui(wx.Panel):
         self.reset_gui()
     # ----------------------------------------------------------------------
 
+    def verify_tracks(self):
+        """
+        Decodes the tracks moved to the destination while a
+        pop-up dialog is shown, see `verify_tracks`. Returns
+        the list of the names of the tracks that failed, if
+        any shows the failures, so that the source files are
+        not offered for deletion.
+        """
+        from ffaudiocue.ffc_core.verify import (expected_tracks,
+                                                failures,
+                                                failed_names,
+                                                )
+        from ffaudiocue.ffc_threads.track_verifier import TrackVerifier
+
+        tracks = expected_tracks(self.data, self.data.kwargs['outputdir'])
+        verifydlg = PopupDialog(self, _("FFaudiocue - Verifying..."),
+                                _("\nDecoding the audio tracks.\n"
+                                  "Please wait...\n"),
+                                )
+        TrackVerifier(tracks,
+                      self.appdata['ffmpeg_cmd'],
+                      self.appdata['maxworkers'],
+                      ProcessLimits.from_settings(self.appdata),
+                      )
+        verifydlg.ShowModal()
+        results = verifydlg.result['results']
+        verifydlg.Destroy()
+
+        failed = failures(results)
+        if not failed:
+            return []
+        msg = _("{0} of {1} tracks failed verification, the source files "
+                "are kept:\n\n{2}"
+                ).format(len(failed), len(results), '\n'.join(failed))
+        wx.MessageBox(msg, "FFaudiocue - Error", wx.ICON_ERROR, self)
+        return failed_names(results)
+    # ----------------------------------------------------------------------
+
+    def checksums(self):
+        """
+        Writes the PCM checksums of the tracks next to them
+        while a pop-up dialog is shown, see `write_checksums`.
+        Returns True on success, otherwise shows the error
+        and returns False.
+        """
+        from ffaudiocue.ffc_core.checksums import (checksum_plan,
+                                                   accuraterip_skipped,
+                                                   )
+        from ffaudiocue.ffc_threads.track_verifier import ChecksumWriter
+
+        plan = checksum_plan(self.data)
+        sumsdlg = PopupDialog(self, _("FFaudiocue - Checksums..."),
+                              _("\nComputing the checksums of the "
+                                "tracks.\nPlease wait...\n"),
+                              )
+        ChecksumWriter(self.data.kwargs['filename'],
+                       plan,
+                       self.data.kwargs['outputdir'],
+                       self.appdata['ffmpeg_cmd'],
+                       ProcessLimits.from_settings(self.appdata),
+                       )
+        sumsdlg.ShowModal()
+        status = sumsdlg.result
+        sumsdlg.Destroy()
+
+        if status['error']:
+            wx.MessageBox(status['error'], "FFaudiocue - Error",
+                          wx.ICON_ERROR, self)
+            return False
+        skipped = {accuraterip_skipped(source['format'])
+                   for source in plan}.difference([None])
+        if skipped:
+            msg = _("The AccurateRip checksums were not computed: {0}"
+                    ).format(', '.join(sorted(skipped)))
+            wx.MessageBox(msg, "FFaudiocue - Warning",
+                          wx.ICON_WARNING, self)
+        return True
+    # ----------------------------------------------------------------------
+
     def reset_gui(self):
         """
         Reset gui after exit status
@@ -682,4 +847,7 @@ class CueGui(wx.Panel):
         self.error = False
 
         shutil.rmtree(self.tmpdir, ignore_errors=True)
+        if self.journal:
+            self.journal.close()
+            self.journal = None
     # ----------------------------------------------------------------------
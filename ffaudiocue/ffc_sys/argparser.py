@@ -6,7 +6,7 @@ Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.13.2025
+Rev: Oct.18.2026
 Code checker: flake8, pylint .
 
 This file is part of FFaudiocue.
@@ -33,18 +33,25 @@ from ffaudiocue.ffc_sys.about_app import (PRGNAME,
                                           VERSION,
                                           RELSTATE
                                           )
-try:
-    import wx
-    MSGWX = f"{wx.version()})"
-except ModuleNotFoundError as errwx:
-    MSGWX = f"not installed! ({errwx})"
+from ffaudiocue.ffc_utils.utils import get_codec_quality_items
+
+# the output audio formats of the split options
+FORMATS = ('wav', 'flac', 'opus', 'mp3', 'ogg')
 
 
 def info_this_platform():
     """
     Get information about operating system, version of
-    Python and wxPython.
+    Python and wxPython. The wxPython version is read from
+    its package metadata, as importing wx takes much longer
+    than printing the version.
     """
+    from importlib import metadata  # on first use, slow to import
+    try:
+        msgwx = metadata.version('wxPython')
+    except metadata.PackageNotFoundError as errwx:
+        msgwx = f"not installed! ({errwx})"
+
     osys = platform.system_alias(platform.system(),
                                  platform.release(),
                                  platform.version(),
@@ -54,14 +61,210 @@ def info_this_platform():
                 f"Release: {osys[1]}\n"
                 f"Architecture: {platform.architecture()}\n"
                 f"Python: {sys.version}\n"
-                f"wxPython: {MSGWX}"
+                f"wxPython: {msgwx}"
                 )
     return thisplat
 
 
-def arguments():
+class ListQualities(argparse.Action):
+    """
+    Shows the quality preset names of each output format
+    and exits, as `--help` does.
+    """
+
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0,
+                         default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        for name in FORMATS:
+            print(f'{name}:')
+            for quality in get_codec_quality_items(name):
+                print(f'  {quality}')
+        parser.exit()
+
+
+def split_arguments(subparsers):
+    """
+    Parser for the `split` command options, which
+    split CUE sheets without the graphical interface.
+    """
+    split = subparsers.add_parser('split',
+                                  help=('split the audio tracks of CUE '
+                                        'sheets without starting the '
+                                        'graphical interface'),
+                                  )
+    split.add_argument('paths',
+                       help=('CUE files, directories to be searched '
+                             'recursively or glob patterns'),
+                       nargs='+',
+                       metavar='PATH',
+                       )
+    split_options(split)
+
+
+def split_options(split):
+    """
+    Adds the split options shared by the `split` and
+    `watch` commands to the given parser.
+    """
+    split.add_argument('-f', '--format',
+                       help='output audio format (default: %(default)s)',
+                       choices=FORMATS,
+                       default='flac',
+                       )
+    split.add_argument('-q', '--quality',
+                       help=('quality preset name of the output format, '
+                             'as listed by --list-qualities (default: '
+                             '%(default)s)'),
+                       default='Auto',
+                       )
+    split.add_argument('--list-qualities',
+                       help=('show the quality preset names of each output '
+                             'format and exit'),
+                       action=ListQualities,
+                       )
+    split.add_argument('--copy',
+                       help=('copy the audio codec without re-encoding '
+                             '(ignores --format and --quality)'),
+                       action="store_true",
+                       )
+    split.add_argument('-o', '--outputdir',
+                       help=('destination folder (default: the folder of '
+                             'each CUE file)'),
+                       metavar='DIRNAME',
+                       )
+    split.add_argument('--collection',
+                       help=('arrange the tracks into Author/Album '
+                             'sub-folders of the destination'),
+                       action="store_true",
+                       )
+    split.add_argument('--single-pass',
+                       help='decode each source audio file only once',
+                       action="store_true",
+                       )
+    split.add_argument('--incremental',
+                       help=('skip the tracks unchanged since the last '
+                             'split and remux those whose tags only are '
+                             'changed'),
+                       action="store_true",
+                       )
+    split.add_argument('--verify',
+                       help=('decode every track written and check its '
+                             'duration, the album fails on errors'),
+                       action="store_true",
+                       )
+    split.add_argument('--checksums',
+                       help=('write the MD5, CRC32 and AccurateRip '
+                             'checksums of the PCM audio of each track to '
+                             'a JSON file next to the tracks'),
+                       action="store_true",
+                       )
+    split.add_argument('-w', '--workers',
+                       help=('audio tracks to process at the same time '
+                             '(default: from settings)'),
+                       type=int,
+                       metavar='NUM',
+                       )
+    split.add_argument('--overwrite',
+                       help=('what to do with tracks already existing on '
+                             'the destination (default: %(default)s)'),
+                       choices=('never', 'always'),
+                       default='never',
+                       )
+    split.add_argument('--charset',
+                       help=('character encoding of the CUE files '
+                             '(default: %(default)s detection)'),
+                       default='auto',
+                       metavar='ENCODING',
+                       )
+
+
+def watch_arguments(subparsers):
+    """
+    Parser for the `watch` command options, which splits
+    the albums dropped into inbox folders, unattended.
+    """
+    watch = subparsers.add_parser('watch',
+                                  help=('watch inbox folders and split the '
+                                        'CUE sheets dropped into them, '
+                                        'without starting the graphical '
+                                        'interface'),
+                                  description=(
+                                      'An optional ffaudiocue-profile.json '
+                                      'file on each inbox overrides the '
+                                      'split options, with keys named as '
+                                      'the long options (e.g. {"format": '
+                                      '"opus", "outputdir": "/srv/music"}). '
+                                      'The albums processed are moved to '
+                                      'the "done" or "failed" subfolder of '
+                                      'their inbox.'),
+                                  )
+    watch.add_argument('paths',
+                       help='inbox folders to be watched recursively',
+                       nargs='+',
+                       metavar='PATH',
+                       )
+    split_options(watch)
+    watch.add_argument('--settle',
+                       help=('seconds the files of an album must stay '
+                             'unchanged before it is split (default: '
+                             '%(default)s)'),
+                       type=float,
+                       default=10,
+                       metavar='SECS',
+                       )
+    watch.add_argument('--interval',
+                       help=('max seconds between two polls of the inbox '
+                             'folders (default: %(default)s)'),
+                       type=float,
+                       default=5,
+                       metavar='SECS',
+                       )
+
+
+def scan_arguments(subparsers):
+    """
+    Parser for the `scan` command options, which
+    indexes the CUE sheets of a music library.
+    """
+    scan = subparsers.add_parser('scan',
+                                 help=('index the CUE sheets found on '
+                                       'music library folders and list '
+                                       'those not split yet'),
+                                 )
+    scan.add_argument('paths',
+                      help='music library folders to be scanned',
+                      nargs='+',
+                      metavar='PATH',
+                      )
+    scan.add_argument('--pending',
+                      help=('list the CUE files not split yet whose audio '
+                            'files are all found'),
+                      action="store_true",
+                      )
+    scan.add_argument('--missing',
+                      help='list the CUE files with missing audio files',
+                      action="store_true",
+                      )
+    scan.add_argument('--full',
+                      help=('list all folders again instead of the changed '
+                            'ones only'),
+                      action="store_true",
+                      )
+    scan.add_argument('-w', '--workers',
+                      help=('folders to scan at the same time '
+                            '(default: %(default)s)'),
+                      type=int,
+                      default=8,
+                      metavar='NUM',
+                      )
+
+
+def arguments(args=None):
     """
-    Parser for command line options
+    Parser for command line options, `args` is the
+    list of the arguments (default: `sys.argv[1:]`).
     """
 
     parser = argparse.ArgumentParser()
@@ -89,8 +292,12 @@ def arguments():
                               ),
                         metavar='DIRNAME',
                         )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    split_arguments(subparsers)
+    watch_arguments(subparsers)
+    scan_arguments(subparsers)
 
-    argmts = parser.parse_args()
+    argmts = parser.parse_args(args)
 
     if argmts.check:
         deps = {'Required': {'ffmpeg': None, 'ffprobe': None}}
@@ -114,7 +321,7 @@ def arguments():
         print(info_this_platform())
         parser.exit(status=0, message=None)
 
-    else:
+    elif not argmts.command:
         print("Type -h for help.")
 
     return vars(argmts)
@@ -6,7 +6,7 @@ Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.15.2025
+Rev: Oct.18.2026
 Code checker: flake8, pylint .
 
  This file is part of FFaudiocue.
@@ -51,7 +51,7 @@ class ConfigManager:
         >>> confmng.write_options(**settings)
     ------------------------------------------------------
     """
-    VERSION = 4.4
+    VERSION = 4.8
     DEFAULT_OPTIONS = {"confversion": VERSION,
                        "locale_name": "Default",
                        "destination": "",
@@ -60,8 +60,18 @@ class ConfigManager:
                        "ffmpegloglev": "info",
                        "ffprobe_cmd": "",
                        "ffprobe_islocal": False,
+                       "maxworkers": 1,
+                       "progressfps": 10,
+                       "ffmpegnice": 0,
+                       "ffmpegioclass": "default",
+                       "ffmpegaffinity": "",
+                       "ffmpegthreads": 0,
                        "warnexiting": True,
                        "clearlogfiles": False,
+                       "logmaxsize": 1024,
+                       "logbackups": 3,
+                       "logcompress": False,
+                       "logmaxjobs": 50,
                        "icontheme": "Colored",
                        "toolbarsize": 32,
                        "toolbarpos": 2,
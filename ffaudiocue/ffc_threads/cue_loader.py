@@ -0,0 +1,89 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: cue_loader.py
+Porpose: loads CUE sheets off the GUI thread
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread
+import wx
+from pubsub import pub
+from ffaudiocue.ffc_core.split_args import open_cuesheet
+
+
+class CueLoader(Thread):
+    """
+    Loads a CUE sheet on a separate thread, since detecting
+    its character encoding, parsing it and running ffprobe
+    on every referenced audio file can take several seconds
+    (e.g. on network shares).
+
+    The result is sent to the "RESULT_EVT" topic (see
+    `PopupDialog`) as `status` dict with 'data' keyword
+    (the FFCueSplitter instance or None) and 'error'
+    keyword (the error message or None).
+
+    A cancelled loader never sends its result, although the
+    running ffprobe process cannot be interrupted.
+    """
+
+    def __init__(self, filename, ffprobe_cmd, ffmpeg_cmd,
+                 ffmpeg_loglevel, characters_encoding, probecache=None,
+                 charsets=None):
+        """
+        Takes the same arguments of `open_cuesheet`
+        """
+        self.args = (filename, ffprobe_cmd, ffmpeg_cmd,
+                     ffmpeg_loglevel, characters_encoding, probecache,
+                     charsets)
+        self.cancelled = False
+        Thread.__init__(self, daemon=True)
+
+        self.start()  # start the thread
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Loads the CUE sheet
+        """
+        try:
+            status = {'data': open_cuesheet(*self.args), 'error': None}
+        except Exception as err:
+            status = {'data': None, 'error': f'{err}'}
+
+        wx.CallAfter(self.send_result, status)
+    # --------------------------------------------------------------------#
+
+    def send_result(self, status):
+        """
+        Sends the result from the main thread, so that it
+        can never be received after `cancel` is called.
+        """
+        if not self.cancelled:
+            pub.sendMessage("RESULT_EVT", status=status)
+    # --------------------------------------------------------------------#
+
+    def cancel(self):
+        """
+        Discards the result of the loading
+        """
+        self.cancelled = True
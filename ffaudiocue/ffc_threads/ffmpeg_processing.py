@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.03.2022
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 
 This file is part of FFaudiocue.
@@ -26,13 +26,10 @@ This file is part of FFaudiocue.
 """
 from threading import Thread
 import time
-import subprocess
-import platform
-from ffcuesplitter.utils import Popen
 import wx
 from pubsub import pub
-if not platform.system() == 'Windows':
-    import shlex
+from ffaudiocue.ffc_core.split_engine import SplitEngine
+from ffaudiocue.ffc_core.queue_engine import QueueEngine
 
 
 class Processing(Thread):
@@ -41,6 +38,9 @@ class Processing(Thread):
     ffmpeg processes, which need to read the stdout/stderr
     in real time.
 
+    The work is done by the toolkit-free `SplitEngine`,
+    whose events are forwarded to the GUI through pubsub.
+
     NOTE MS Windows:
 
     subprocess.STARTUPINFO()
@@ -54,101 +54,103 @@ class Processing(Thread):
     from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
 
     """
-    get = wx.GetApp()  # get wx.App attribute
-    appdata = get.appset
-    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
-    # ---------------------------------------------------------------
 
-    def __init__(self, args, logname):
+    def __init__(self, args, joblogs, title, workers=1, fps=10,
+                 journal=None, limits=None):
         """
         args: dict
-        logname: absolute path name of the file log.
-        """
-        self.stop_work_thread = False  # if True the process terminates
-        self.args = args  # list of commands/aguments
-        self.logname = logname  # path name of file log
-        subline = '-----------------------------'
-        slog = (f'\nFFaudiocue: Creating log file\nDate: {time.strftime("%c")}'
-                f'\n{subline}\n\n')
-        with open(self.logname, "w", encoding='utf-8') as log:
-            log.write(slog)
-        self.count = 0  # count for loop
-        self.countmax = len(args['recipes'])  # length list
-
+        joblogs: the JobLogs instance, a new job log is opened.
+        title: the title of the job log, e.g. the CUE file name.
+        workers: max number of ffmpeg processes running at once.
+        fps: max number of progress events per second.
+        journal: optional JobJournal of the job, see `Journals`.
+        limits: optional ProcessLimits of the ffmpeg processes.
+        """
+        self.joblogs = joblogs
+        self.log = joblogs.open(title)
+        self.engine = SplitEngine(args, self.log, workers,
+                                  notify=self.notify, fps=fps,
+                                  metricsfile=self.log.metricsfile,
+                                  journal=journal, limits=limits)
         Thread.__init__(self)
 
         self.start()  # start the thread
     # --------------------------------------------------------------------#
 
+    @staticmethod
+    def notify(topic, **kwargs):
+        """
+        Sends the engine events to the main thread
+        """
+        wx.CallAfter(pub.sendMessage, topic, **kwargs)
+    # --------------------------------------------------------------------#
+
     def run(self):
         """
         Subprocess initialize thread.
         """
-        for recipes in self.args['recipes']:
-            self.count += 1
-            track = f'{self.count}/{self.countmax}'
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         msg='',
-                         end='',
-                         )
-
-            cmdargs = recipes[0]
-            if not platform.system() == 'Windows':
-                cmdargs = shlex.split(recipes[0])
-
-            with open(self.logname, "a", encoding='utf-8') as log:
-                log.write(f"\n[INFO: COMMAND]: {recipes[0]}\n{'=' * 94}\n\n")
-
-                try:
-                    with Popen(cmdargs,
-                               stdout=subprocess.PIPE,
-                               stderr=log,
-                               bufsize=1,
-                               encoding='utf8',
-                               universal_newlines=True) as proc:
-                        for line in proc.stdout:
-                            if "out_time_ms" in line.strip():
-                                wx.CallAfter(pub.sendMessage,
-                                             "UPDATE_EVT",
-                                             output=line,
-                                             duration=recipes[1]['duration'],
-                                             track=track,
-                                             status=0,
-                                             )
-                            if self.stop_work_thread:
-                                proc.terminate()
-                                break  # break second 'for' loop
-
-                        if proc.wait():  # error
-                            wx.CallAfter(pub.sendMessage,
-                                         "UPDATE_EVT",
-                                         output='',
-                                         duration=recipes[1]['duration'],
-                                         track='',
-                                         status=proc.wait(),
-                                         )
-                except (OSError, FileNotFoundError) as err:
-                    excepterr = f"{err}\n  {Processing.NOT_EXIST_MSG}"
-                    log.write(f'\nERROR: {excepterr}')
-                    wx.CallAfter(pub.sendMessage,
-                                 "COUNT_EVT",
-                                 msg=excepterr,
-                                 end='error',
-                                 )
-                    break
-
-                if self.stop_work_thread:
-                    proc.terminate()
-                    break  # break second 'for' loop
+        status = self.engine.run()
+        self.joblogs.close(self.log, status)
+        time.sleep(.5)
+        wx.CallAfter(pub.sendMessage, "END_EVT", metrics=status['metrics'])
+    # --------------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.engine.stop()
+
+
+class QueueProcessing(Thread):
+    """
+    This class represents a separate thread for running
+    the jobs of the job queue, see `QueueEngine`.
 
+    The engine events are sent to pubsub with the "QUEUE_"
+    prefix (e.g. "QUEUE_JOB_EVT"), so they never reach the
+    main panel.
+    """
+
+    def __init__(self, queue, joblogs, workers=1, **cmds):
+        """
+        queue: the JobQueue instance
+        joblogs: the JobLogs instance, a new job log is opened.
+        workers: max number of ffmpeg processes running at once.
+        cmds: keyword arguments of the QueueEngine, i.e. fps,
+              probecache, charsets, journals, limits, ffmpeg_cmd,
+              ffprobe_cmd, ffmpeg_loglevel
+        """
+        self.joblogs = joblogs
+        self.log = joblogs.open(_('Job queue'))
+        self.engine = QueueEngine(queue, self.log, workers,
+                                  notify=self.notify,
+                                  metricsfile=self.log.metricsfile, **cmds)
+        Thread.__init__(self)
+
+        self.start()  # start the thread
+    # --------------------------------------------------------------------#
+
+    @staticmethod
+    def notify(topic, **kwargs):
+        """
+        Sends the engine events to the main thread
+        """
+        wx.CallAfter(pub.sendMessage, f"QUEUE_{topic}", **kwargs)
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Subprocess initialize thread.
+        """
+        status = self.engine.run()
+        self.joblogs.close(self.log, status)
         time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT")
+        wx.CallAfter(pub.sendMessage, "QUEUE_END_EVT", status=status)
     # --------------------------------------------------------------------#
 
     def stop(self):
         """
         Sets the stop work thread to terminate the process
         """
-        self.stop_work_thread = True
+        self.engine.stop()
@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: track_verifier.py
+Porpose: checks the audio tracks written, off the GUI thread
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread
+import wx
+from pubsub import pub
+from ffaudiocue.ffc_core.verify import verify_tracks
+from ffaudiocue.ffc_core.checksums import write_checksums
+
+
+class TrackVerifier(Thread):
+    """
+    Decodes the audio tracks written on a separate thread,
+    see `verify_tracks`.
+
+    The result is sent to the "RESULT_EVT" topic (see
+    `PopupDialog`) as `status` dict with 'results' keyword
+    (the list of results of `verify_track`).
+    """
+
+    def __init__(self, tracks, ffmpeg_cmd, workers=1, limits=None):
+        """
+        Takes the same arguments of `verify_tracks`
+        """
+        self.args = (tracks, ffmpeg_cmd, workers)
+        self.limits = limits
+        Thread.__init__(self, daemon=True)
+
+        self.start()  # start the thread
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Verifies the tracks
+        """
+        status = {'results': verify_tracks(*self.args, limits=self.limits)}
+        wx.CallAfter(pub.sendMessage, "RESULT_EVT", status=status)
+
+
+class ChecksumWriter(Thread):
+    """
+    Writes the PCM checksums of the audio tracks on a
+    separate thread, see `write_checksums`.
+
+    The result is sent to the "RESULT_EVT" topic (see
+    `PopupDialog`) as `status` dict with 'filename' keyword
+    (the pathname written or None) and 'error' keyword
+    (the error message or None).
+    """
+
+    def __init__(self, cuefile, plan, outputdir, ffmpeg_cmd, limits=None):
+        """
+        Takes the same arguments of `write_checksums`
+        """
+        self.args = (cuefile, plan, outputdir, ffmpeg_cmd, limits)
+        Thread.__init__(self, daemon=True)
+
+        self.start()  # start the thread
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Writes the checksums
+        """
+        try:
+            status = {'filename': write_checksums(*self.args), 'error': None}
+        except OSError as err:
+            status = {'filename': None, 'error': f'{err}'}
+
+        wx.CallAfter(pub.sendMessage, "RESULT_EVT", status=status)
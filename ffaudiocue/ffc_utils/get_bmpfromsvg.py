@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Jan.31.2022
+Rev: Oct.18.2026
 ########################################################
 
 This file is part of FFaudiocue.
@@ -24,18 +24,64 @@ This file is part of FFaudiocue.
    You should have received a copy of the GNU General Public License
    along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
 """
+import os
+import hashlib
 try:
+    import wx
     from wx.svg import SVGimage
 except ModuleNotFoundError:
     pass
 
 
-def get_bmp(imgfile, size):
+def cached_name(imgfile, size, scale):
     """
-    Given a file and a size, converts to bmp
+    Returns the file name of the bitmap cached for the given
+    SVG file, size and DPI scale factor. The path hash tells
+    apart the same icon of different themes.
     """
+    path = os.path.abspath(imgfile)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:10]
+    return f'{stem}-{digest}-{size[0]}x{size[1]}@{scale:g}.png'
+
+
+def get_bmp(imgfile, size, cachedir=None, window=None):
+    """
+    Given a file and a size, converts to bmp. If `window`
+    is given the size is scaled by its DPI scale factor.
+
+    If `cachedir` is given the bitmap is rasterized only once
+    and kept there as PNG file, whose modification time is
+    set to that of the SVG file: it is rasterized again only
+    when the SVG file changes.
+    """
+    scale = window.GetContentScaleFactor() if window else 1.0
+    cached, mtime = None, None
+    if cachedir:
+        cached = os.path.join(cachedir, cached_name(imgfile, size, scale))
+        try:
+            mtime = os.stat(imgfile).st_mtime_ns
+            if os.stat(cached).st_mtime_ns == mtime:
+                # no error dialog if the file is damaged
+                logging = wx.Log.EnableLogging(False)
+                bmp = wx.Bitmap(cached, wx.BITMAP_TYPE_PNG)
+                wx.Log.EnableLogging(logging)
+                if bmp.IsOk():
+                    return bmp
+        except OSError:
+            pass
 
     img = SVGimage.CreateFromFile(imgfile)
-    bmp = img.ConvertToScaledBitmap(size)
+    bmp = img.ConvertToScaledBitmap(size, window)
+
+    if cached and mtime is not None:
+        tmp = f'{cached}.tmp'
+        try:
+            os.makedirs(cachedir, exist_ok=True)
+            if bmp.SaveFile(tmp, wx.BITMAP_TYPE_PNG):
+                os.utime(tmp, ns=(mtime, mtime))
+                os.replace(tmp, cached)
+        except OSError:
+            pass  # the cache is optional
 
     return bmp
@@ -0,0 +1,120 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: log_reader.py
+Porpose: reads large log files by chunks
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import mmap
+
+
+class LogReader:
+    """
+    Reads a log file by chunks using a memory map, so that
+    huge log files are never loaded as a whole. It starts
+    from the last `tailsize` bytes, then it can read earlier
+    chunks on demand and follow the new lines written to it.
+    Chunks always begin at the start of a line.
+
+    Usage:
+        >>> reader = LogReader('/path/to/file.log')
+        >>> text = reader.tail()  # last lines
+        >>> text = reader.earlier()  # lines before, if any
+        >>> text = reader.follow()  # lines added since then
+    """
+
+    def __init__(self, filename, tailsize=65536, chunksize=262144):
+        """
+        filename: pathname of the log file
+        tailsize: bytes read by `tail`
+        chunksize: bytes read by `earlier`
+        """
+        self.filename = filename
+        self.tailsize = tailsize
+        self.chunksize = chunksize
+        self.start = 0  # offset of the first byte read
+        self.end = 0  # offset of the last byte read
+    # --------------------------------------------------------------------#
+
+    def read(self, begin, end, align=True):
+        """
+        Returns the text from the offset `begin` to `end`.
+        With `align`, the text begins with the first line
+        starting after `begin`, `self.start` is updated.
+        """
+        if end <= begin:
+            return ''
+        with open(self.filename, 'rb') as logf:
+            with mmap.mmap(logf.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+                end = min(end, len(mem))
+                if align and begin > 0 and mem[begin - 1:begin] != b'\n':
+                    newline = mem.find(b'\n', begin, end)
+                    if newline != -1:
+                        begin = newline + 1
+                if align:
+                    self.start = begin
+                data = mem[begin:end]
+        return data.decode('utf-8', errors='replace')
+    # --------------------------------------------------------------------#
+
+    def tail(self):
+        """
+        Returns the last lines of the file.
+        """
+        size = os.path.getsize(self.filename)
+        self.end = size
+        self.start = size
+        return self.read(max(size - self.tailsize, 0), size)
+    # --------------------------------------------------------------------#
+
+    def has_earlier(self):
+        """
+        Returns True if there are lines before those read.
+        """
+        return self.start > 0
+    # --------------------------------------------------------------------#
+
+    def earlier(self):
+        """
+        Returns the lines before those already read,
+        an empty string if the beginning is reached.
+        """
+        end = self.start
+        return self.read(max(end - self.chunksize, 0), end)
+    # --------------------------------------------------------------------#
+
+    def follow(self):
+        """
+        Returns the text added since the last reading, an
+        empty string if nothing was added or None if the file
+        was truncated, so that it must be read again by `tail`.
+        """
+        try:
+            size = os.path.getsize(self.filename)
+        except OSError:
+            return None
+        if size < self.end:
+            return None
+        text = self.read(self.end, size, align=False)
+        self.end = size
+        return text
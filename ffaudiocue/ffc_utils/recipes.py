@@ -0,0 +1,174 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: recipes.py
+Porpose: builds alternative FFmpeg recipes for the split engine
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of FFaudiocue.
+
+   FFaudiocue is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   FFaudiocue is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with FFaudiocue.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from ffcuesplitter.utils import sanitize
+
+# Sample rate of the mono PCM stream written to stdout by the
+# single pass recipes, i.e. one byte for each sample of the source.
+TAP_RATE = 44100
+
+# The per-track path lets ffmpeg resample to the rate of the
+# output codec *before* trimming, see `FFMpeg.DATACODECS`.
+OUTPUT_RATES = {'opus': 48000}
+
+
+def track_metadata(track, tracks_count):
+    """
+    Returns the metadata dict of the given track in the
+    same form used by `FFCueSplitter.commandargs`.
+    """
+    return {'ARTIST': track.get('PERFORMER', ''),
+            'ALBUM': track.get('ALBUM', ''),
+            'TITLE': track.get('TITLE', ''),
+            'TRACK': f"{track['TRACK_NUM']}/{tracks_count}",
+            'DISCNUMBER': track.get('DISCNUMBER', ''),
+            'GENRE': track.get('GENRE', ''),
+            'DATE': track.get('DATE', ''),
+            'COMMENT': track.get('COMMENT', ''),
+            'DISCID': track.get('DISCID', ''),
+            }
+# ------------------------------------------------------------------------
+
+
+def track_filename(track, suffix):
+    """
+    Returns the output file name of the given track
+    as named by `FFCueSplitter.commandargs`.
+    """
+    num = str(track['TRACK_NUM']).rjust(2, '0')
+    trk = track["FILE_TITLE"]
+    filetitle = 'Untitled' if not sanitize(trk) else trk
+    return f'{num} - {filetitle}.{suffix}'
+# ------------------------------------------------------------------------
+
+
+def single_pass_commandargs(splitter, audiotracks, total=None):
+    """
+    Builds one FFmpeg command for each source audio file
+    referenced by the CUE sheet, which decodes the source
+    only once and writes all its tracks in the same pass.
+
+    The decoded stream is fanned out with `asplit` and each
+    branch is resampled to the output rate and then cut with
+    `atrim` using the same start/end seconds given to `-ss/-to`
+    by `FFCueSplitter.commandargs`, that is the same order used
+    by ffmpeg for the per-track path, so that the output is
+    sample-identical.
+
+    An additional branch is written to stdout as unsigned
+    8-bit mono PCM at `TAP_RATE`, so the number of bytes read
+    gives the exact position in the source (see `Processing`).
+    Note that the codec copy (`-c copy`) cannot be used here.
+
+    `splitter` is the FFCueSplitter instance with its `kwargs`
+    already set up for the split. `total` is the number of
+    tracks of the album when only some of them are given.
+
+    Returns:
+        dict(recipes) in the same form of `commandargs`.
+    """
+    kwargs = splitter.kwargs
+    total = total or len(audiotracks)
+    sources = {}
+    for track in audiotracks:
+        sources.setdefault(track['FILE'], []).append(track)
+
+    data = []
+    for source, tracks in sources.items():
+        codec, suffix = splitter.codec_setup(source)
+        rate = OUTPUT_RATES.get(suffix, 44100)
+        fpath = os.path.join(kwargs["dirname"], source)
+        labels = ''.join(f'[s{num}]' for num in range(len(tracks)))
+        graph = [f'[0:a]asplit={len(tracks) + 1}{labels}[tap]']
+        outputs = ''
+        names = []
+        for num, track in enumerate(tracks):
+            trim = f"start={round(track['START'] / 44100, 6)}"
+            if 'END' in track:
+                trim += f":end={round(track['END'] / 44100, 6)}"
+            graph.append(f'[s{num}]aresample={rate},atrim={trim},'
+                         f'asetpts=PTS-STARTPTS[t{num}]')
+            outputs += f' -map "[t{num}]"'
+            meta = track_metadata(track, total)
+            for key, val in meta.items():
+                outputs += f' -metadata {key}="{val}"'
+            outputs += f" {codec} {kwargs['ffmpeg_add_params']}"
+            name = track_filename(track, suffix)
+            names.append(name)
+            outputs += f' "{os.path.join(kwargs["tempdir"], name)}"'
+
+        cmd = f'"{kwargs["ffmpeg_cmd"]}" '
+        cmd += f' -loglevel {kwargs["ffmpeg_loglevel"]} -nostats -nostdin -y'
+        cmd += f' -i "{fpath}"'
+        cmd += f' -filter_complex "{";".join(graph)}"'
+        cmd += outputs
+        cmd += (f' -map "[tap]" -ac 1 -ar {TAP_RATE} -c:a pcm_u8'
+                f' -f u8 pipe:1')
+        duration = sum(track['DURATION'] for track in tracks)
+        start = round(tracks[0]['START'] / 44100, 6)
+        data.append((cmd, {'duration': duration,
+                           'titletrack': ', '.join(names),
+                           'outputs': names,
+                           'tap_start': start,
+                           }))
+
+    return {'recipes': data}
+# ------------------------------------------------------------------------
+
+
+def retag_commandargs(splitter, audiotracks, total):
+    """
+    Builds one FFmpeg command for each of the given tracks
+    already existing on the output folder, which rewrites
+    their metadata copying the audio stream as is (remux),
+    instead of encoding them again.
+
+    `splitter` is the FFCueSplitter instance with its `kwargs`
+    already set up for the split, `total` is the number of
+    tracks of the album.
+
+    Returns:
+        dict(recipes) in the same form of `commandargs`.
+    """
+    kwargs = splitter.kwargs
+    data = []
+    for track in audiotracks:
+        suffix = splitter.codec_setup(track['FILE'])[1]
+        name = track_filename(track, suffix)
+        fpath = os.path.join(kwargs['outputdir'], name)
+        cmd = f'"{kwargs["ffmpeg_cmd"]}" '
+        cmd += f' -loglevel {kwargs["ffmpeg_loglevel"]}'
+        cmd += ' -progress pipe:1 -nostats -nostdin'
+        cmd += f' -i "{fpath}" -map 0 -map_metadata -1'
+        for key, val in track_metadata(track, total).items():
+            cmd += f' -metadata {key}="{val}"'
+        cmd += f' -c copy -y "{os.path.join(kwargs["tempdir"], name)}"'
+        data.append((cmd, {'duration': track['DURATION'],
+                           'titletrack': name,
+                           }))
+
+    return {'recipes': data}
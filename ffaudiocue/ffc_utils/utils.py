@@ -117,6 +117,23 @@ def get_codec_quality_items(_format_):
 # ------------------------------------------------------------------------
 
 
+def check_quality(_format_, quality):
+    """
+    Raises ValueError if `quality` is not a preset name of
+    `get_codec_quality_items` for the given audio format,
+    the message lists the valid names.
+    """
+    try:
+        items = get_codec_quality_items(_format_)
+    except (KeyError, TypeError) as err:
+        raise ValueError(f"invalid audio format: {_format_!r}") from err
+    if not isinstance(quality, str) or quality not in items:
+        names = ', '.join(repr(name) for name in items)
+        raise ValueError(f"invalid quality for {_format_}: {quality!r} "
+                         f"(choose from {names})")
+# ------------------------------------------------------------------------
+
+
 def del_filecontents(filename):
     """
     Delete the contents of the file if it is not empty.
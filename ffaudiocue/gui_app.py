@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyright: 2023 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.13.2025
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 
 This file is part of FFaudiocue.
@@ -37,6 +37,7 @@ from ffaudiocue.ffc_sys.argparser import arguments
 from ffaudiocue.ffc_sys.settings_manager import DataSource  # data
 from ffaudiocue.ffc_sys import app_const as appC
 from ffaudiocue.ffc_utils.utils import del_filecontents
+from ffaudiocue.ffc_core.job_logs import get_joblogs
 
 # add translation macro to builtin similar to what gettext does
 builtins.__dict__['_'] = wx.GetTranslation
@@ -171,6 +172,8 @@ class CuesplitterGUI(wx.App):
                 if flist:
                     for logname in flist:
                         logfile = os.path.join(logdir, logname)
+                        if not os.path.isfile(logfile):
+                            continue  # e.g. the job logs directory
                         try:
                             del_filecontents(logfile)
                         except Exception as err:
@@ -179,6 +182,14 @@ class CuesplitterGUI(wx.App):
                                             "{0}").format(err),
                                           'FFaudiocue - ERROR', wx.ICON_STOP)
                             return False
+            joblogs = get_joblogs(self.appset)
+            try:
+                joblogs.remove([entry['id'] for entry in joblogs.jobs()])
+            except OSError as err:
+                wx.MessageBox(_("Unexpected error while deleting "
+                                "file contents:\n\n{0}").format(err),
+                              'FFaudiocue - ERROR', wx.ICON_STOP)
+                return False
 
         if self.appset['auto-restart-app']:
             auto_restart(self.appset['app'], self.appset['make_portable'])
@@ -212,15 +223,18 @@ def auto_restart(apptype, portmode):
         wx.Execute(f'{cmdargs}', flags=wx.EXEC_SYNC)
 
 
-def main():
+def main(kwargs=None):
     """
     Without arguments starts the wx.App mainloop
-    instead to print output to console.
+    instead to print output to console. `kwargs` are
+    the command line arguments already parsed by the
+    `cli_app` entry point, if any.
     """
-    if not sys.argv[1:]:
-        kwargs = {'make_portable': None}
-    else:
-        kwargs = arguments()
+    if kwargs is None:
+        if not sys.argv[1:]:
+            kwargs = {'make_portable': None}
+        else:
+            kwargs = arguments()
 
     app = CuesplitterGUI(redirect=False, **kwargs)
     app.MainLoop()
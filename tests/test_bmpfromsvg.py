@@ -0,0 +1,39 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the get_bmpfromsvg.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_utils.get_bmpfromsvg import cached_name
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestIconCache(unittest.TestCase):
+    """Test case for the names of the cached bitmaps."""
+
+    def test_cached_name(self):
+        light = os.path.join('icons', 'Light', '24x24', 'stop.svg')
+        dark = os.path.join('icons', 'Dark', '24x24', 'stop.svg')
+        name = cached_name(light, (32, 32), 1.0)
+        self.assertTrue(name.startswith('stop-'))
+        self.assertTrue(name.endswith('-32x32@1.png'))
+        self.assertEqual(name, cached_name(light, (32, 32), 1.0))
+        self.assertNotEqual(name, cached_name(dark, (32, 32), 1.0))
+        self.assertNotEqual(name, cached_name(light, (24, 24), 1.0))
+        self.assertTrue(cached_name(light, (32, 32), 1.5).endswith('@1.5.png'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the charset_cache.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import json
+import shutil
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.charset_cache import (CharsetCache,
+                                                   sniff_encoding,
+                                                   )
+except ImportError as error:
+    sys.exit(error)
+
+CUE = ('PERFORMER "Кино"\nTITLE "Группа крови"\n'
+       'FILE "Кино - Группа крови.flac" WAVE\n'
+       '  TRACK 01 AUDIO\n    TITLE "Группа крови"\n'
+       '    INDEX 01 00:00:00\n')
+
+
+class TestCharsetCache(unittest.TestCase):
+    """Test case for the CharsetCache class."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cuefile = os.path.join(self.tmp, 'a.cue')
+        self.jsonfile = os.path.join(self.tmp, 'charsets.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_sniff(self):
+        self.assertEqual(sniff_encoding(b'FILE "a.wav" WAVE\n'), 'ascii')
+        self.assertEqual(sniff_encoding('\ufeffé'.encode('utf-8')),
+                         'utf-8-sig')
+        self.assertEqual(sniff_encoding('\ufeffé'.encode('utf-16-le')),
+                         'utf-16')
+        self.assertIsNone(sniff_encoding('é'.encode('utf-8')))
+
+    def test_cache(self):
+        with open(self.cuefile, 'wb') as fcue:
+            fcue.write(CUE.encode('cp1251'))
+        cache = CharsetCache(self.jsonfile)
+        detected = cache.encoding(self.cuefile)
+        self.assertEqual(CUE.encode('cp1251').decode(detected), CUE)
+
+        # the stored encoding is used instead of detecting again
+        with open(self.jsonfile, encoding='utf-8') as fjson:
+            entries = json.load(fjson)
+        key = next(iter(entries))
+        entries[key]['encoding'] = 'koi8-r'
+        with open(self.jsonfile, 'w', encoding='utf-8') as fjson:
+            json.dump(entries, fjson)
+        self.assertEqual(CharsetCache(self.jsonfile).encoding(self.cuefile),
+                         'koi8-r')
+
+        # the user choice takes precedence over the fast path
+        with open(self.cuefile, 'wb') as fcue:
+            fcue.write(b'FILE "a.wav" WAVE\n')
+        cache.confirm(self.cuefile, 'cp1252')
+        cache = CharsetCache(self.jsonfile)
+        self.assertEqual(cache.encoding(self.cuefile), 'cp1252')
+        cache.forget(self.cuefile)
+        self.assertEqual(cache.encoding(self.cuefile), 'ascii')
+        self.assertEqual(len(cache.entries), 1)  # ASCII is not stored
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
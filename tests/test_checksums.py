@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the checksums.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shutil
+import random
+import tempfile
+import wave
+import zlib
+import hashlib
+import importlib.util
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core import checksums
+    from ffaudiocue.ffc_core.checksums import (TrackSums,
+                                               compute_checksums,
+                                               accuraterip_skipped,
+                                               AR_SKIP,
+                                               )
+except ImportError as error:
+    sys.exit(error)
+
+
+def accuraterip(data, first, last):
+    """
+    The AccurateRip v1 and v2 CRCs of the given PCM data
+    computed sample by sample, as the reference code does.
+    """
+    count = len(data) // 4
+    start = AR_SKIP - 1 if first else 0
+    end = count - AR_SKIP if last else count
+    v1 = v2 = 0
+    for num in range(count):
+        multiplier = num + 1
+        if start <= multiplier <= end:
+            sample = int.from_bytes(data[num * 4:num * 4 + 4], 'little')
+            product = sample * multiplier
+            v1 += product & 0xFFFFFFFF
+            v2 += (product & 0xFFFFFFFF) + (product >> 32)
+    return f'{v1 & 0xFFFFFFFF:08X}', f'{v2 & 0xFFFFFFFF:08X}'
+
+
+class TestChecksums(unittest.TestCase):
+    """Test case for the checksums of the tracks."""
+
+    def setUp(self):
+        rand = random.Random(7)
+        self.tracks = [rand.randbytes(frames * 4)
+                       for frames in (AR_SKIP * 3 + 11, 5000, AR_SKIP + 7)]
+
+    @unittest.skipIf(importlib.util.find_spec('numpy') is None,
+                     'numpy is not installed')
+    def test_accuraterip(self):
+        for num, data in enumerate(self.tracks):
+            first, last = num == 0, num == len(self.tracks) - 1
+            sums = TrackSums('x', 4, first, last, True)
+            pos = 0
+            for size in (1, 700, 2939, 2940, 9999999):
+                sums.update(memoryview(data)[pos:pos + size * 4])
+                pos += size * 4
+            res = sums.result()
+            self.assertEqual((res['accuraterip_v1'], res['accuraterip_v2']),
+                             accuraterip(data, first, last))
+            self.assertEqual(res['frames'], len(data) // 4)
+            self.assertEqual(res['md5'], hashlib.md5(data).hexdigest())
+
+    def test_skipped(self):
+        self.assertTrue(accuraterip_skipped((24, 96000, 2)))
+        self.assertTrue(accuraterip_skipped((16, 44100, 1)))
+        with mock.patch.object(checksums, 'numpy', None):
+            self.assertEqual(accuraterip_skipped((16, 44100, 2)),
+                             'NumPy is not installed')
+
+    @unittest.skipIf(shutil.which('ffmpeg') is None, 'ffmpeg is not installed')
+    def test_compute(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            source = os.path.join(tmp, 'image.wav')
+            pregap = b'\x01\x00' * 2 * 588  # before the first track
+            with wave.open(source, 'wb') as wav:
+                wav.setnchannels(2)
+                wav.setsampwidth(2)
+                wav.setframerate(44100)
+                wav.writeframes(pregap + b''.join(self.tracks))
+            start, tracks = 588, []
+            for num, data in enumerate(self.tracks):
+                end = start + len(data) // 4
+                tracks.append({'name': f'{num}.flac', 'start': start,
+                               'end': end if num < 2 else None})
+                start = end
+            plan = [{'source': source, 'format': (16, 44100, 2),
+                     'tracks': tracks}]
+            sums = compute_checksums(plan)
+        finally:
+            shutil.rmtree(tmp)
+
+        self.assertEqual([trk['md5'] for trk in sums['tracks']],
+                         [hashlib.md5(data).hexdigest()
+                          for data in self.tracks])
+        self.assertEqual(sums['crc32'],
+                         f"{zlib.crc32(b''.join(self.tracks)):08X}")
+        self.assertEqual('accuraterip_skipped' in sums,
+                         checksums.numpy is None)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the cli_app.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shutil
+import tempfile
+import wave
+import contextlib
+import io
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_sys.argparser import arguments
+    from ffaudiocue.cli_app import job_options, run_command
+except ImportError as error:
+    sys.exit(error)
+
+CUESHEET = '''REM COMMENT "test"
+REM GENRE Rock
+REM DATE 1999
+REM DISCID 00000000
+TITLE "Album"
+PERFORMER "Artist"
+FILE "image.wav" WAVE
+  TRACK 01 AUDIO
+    TITLE "One"
+    INDEX 01 00:00:00
+  TRACK 02 AUDIO
+    TITLE "Two"
+    INDEX 01 00:01:00
+'''
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test case for the headless commands."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.confdir = os.path.join(self.tmp, 'conf')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def run_command(self, *args):
+        """
+        Runs the given command line with a portable
+        configuration, returns its exit status code.
+        """
+        kwargs = arguments(['--make-portable', self.confdir, *args])
+        with contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            return run_command(kwargs)
+
+    def test_arguments(self):
+        kwargs = arguments(['split', 'a.cue', 'b', '-f', 'opus', '--copy',
+                            '--single-pass', '-w', '3'])
+        self.assertEqual(kwargs['command'], 'split')
+        self.assertEqual(kwargs['paths'], ['a.cue', 'b'])
+        self.assertEqual(kwargs['workers'], 3)
+        options = job_options(kwargs)
+        self.assertEqual(options['outputformat'], 'opus')
+        self.assertTrue(options['codec_copy'])
+        self.assertTrue(options['singlepass'])
+        self.assertFalse(options['verify'])
+        self.assertEqual(options['overwrite'], 'never')
+        self.assertEqual(options['charset'], 'auto')
+        self.assertIsNone(options['destination'])
+
+        self.assertIsNone(arguments(['--make-portable', 'x'])['command'])
+        with contextlib.redirect_stderr(io.StringIO()), \
+                self.assertRaises(SystemExit) as exc:
+            arguments(['split', 'a.cue', '-f', 'aiff'])
+        self.assertEqual(exc.exception.code, 2)
+
+        with contextlib.redirect_stdout(io.StringIO()) as out, \
+                self.assertRaises(SystemExit) as exc:
+            arguments(['split', '--list-qualities'])
+        self.assertEqual(exc.exception.code, 0)
+        self.assertIn('  VBR 128 kbit/s (low quality)\n', out.getvalue())
+
+    def test_quality(self):
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(run_command(arguments(
+                ['split', self.tmp, '-f', 'mp3', '-q', 'bogus'])), 2)
+        self.assertIn("'VBR 160 kbit/s'", err.getvalue())
+        self.assertEqual(self.run_command('watch', self.tmp, '-q', 'x'), 2)
+        # checked, then no CUE files found
+        self.assertEqual(self.run_command('split', self.tmp, '-f', 'mp3',
+                                          '-q', 'VBR 160 kbit/s'), 1)
+        self.assertEqual(self.run_command('split', self.tmp, '-q', 'x',
+                                          '--copy'), 1)
+
+    def test_exit_status(self):
+        self.assertEqual(self.run_command('split', self.tmp), 1)  # no CUE
+        missing = os.path.join(self.tmp, 'missing')
+        self.assertEqual(self.run_command('scan', missing), 1)
+        self.assertEqual(self.run_command('scan', self.tmp), 0)
+
+    @unittest.skipIf(None in (shutil.which('ffmpeg'), shutil.which('ffprobe')),
+                     'ffmpeg is not installed')
+    def test_split(self):
+        album = os.path.join(self.tmp, 'album')
+        os.mkdir(album)
+        with wave.open(os.path.join(album, 'image.wav'), 'wb') as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(b'\x00\x01' * 2 * 44100 * 2)
+        with open(os.path.join(album, 'image.cue'), 'w',
+                  encoding='utf-8') as fcue:
+            fcue.write(CUESHEET)
+        outputdir = os.path.join(self.tmp, 'out')
+        self.assertEqual(self.run_command('split', album, '-o', outputdir,
+                                          '-f', 'wav'), 0)
+        self.assertEqual(sorted(os.listdir(outputdir)),
+                         ['01 - One.wav', '02 - Two.wav'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the finalize.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import errno
+import tempfile
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core import finalize
+    from ffaudiocue.ffc_core.finalize import (make_staging_dir,
+                                              existing_tracks,
+                                              move_tracks,
+                                              )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFinalize(unittest.TestCase):
+    """Test case for the staging and moving of the tracks."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.outputdir = os.path.join(self.tmpdir.name, 'out')
+        self.staging = os.path.join(self.tmpdir.name, 'staging')
+        os.mkdir(self.outputdir)
+        os.mkdir(self.staging)
+        for name in ('01 - One.flac', '02 - Two.flac'):
+            with open(os.path.join(self.staging, name), 'w') as fout:
+                fout.write('new')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_staging_dir(self):
+        outputdir = os.path.join(self.outputdir, 'Author', 'Album')
+        staging = make_staging_dir(outputdir)  # on the nearest parent
+        self.assertEqual(os.path.dirname(staging), self.outputdir)
+        self.assertTrue(os.path.basename(staging).startswith('.FFaudiocue_'))
+        os.rmdir(staging)
+
+        with mock.patch.object(finalize.tempfile, 'mkdtemp',
+                               side_effect=[PermissionError(errno.EACCES,
+                                                            'denied'),
+                                            self.staging]) as patched:
+            self.assertEqual(make_staging_dir(outputdir), self.staging)
+        self.assertIsNone(patched.call_args.kwargs['dir'])  # system temp
+
+    def test_move(self):
+        with open(os.path.join(self.outputdir, '01 - One.flac'), 'w') as fout:
+            fout.write('old')
+        tracks, existing = existing_tracks(self.outputdir, self.staging)
+        self.assertEqual(tracks, ['01 - One.flac', '02 - Two.flac'])
+        self.assertEqual(existing, [os.path.join(self.outputdir,
+                                                 '01 - One.flac')])
+
+        self.assertIsNone(move_tracks(self.outputdir, self.staging, tracks,
+                                      overwrite=False))
+        self.assertEqual(os.listdir(self.staging), ['01 - One.flac'])
+        with open(os.path.join(self.outputdir, '01 - One.flac')) as fin:
+            self.assertEqual(fin.read(), 'old')
+
+        self.assertIsNone(move_tracks(self.outputdir, self.staging,
+                                      ['01 - One.flac']))
+        self.assertEqual(os.listdir(self.staging), [])
+        with open(os.path.join(self.outputdir, '01 - One.flac')) as fin:
+            self.assertEqual(fin.read(), 'new')
+
+    def test_move_across_filesystems(self):
+        tracks = sorted(os.listdir(self.staging))
+        with mock.patch.object(finalize.os, 'replace',
+                               side_effect=OSError(errno.EXDEV, 'cross')):
+            self.assertIsNone(move_tracks(self.outputdir, self.staging,
+                                          tracks))
+        self.assertEqual(sorted(os.listdir(self.outputdir)), tracks)
+        self.assertEqual(os.listdir(self.staging), [])
+
+    def test_move_error(self):
+        tracks = sorted(os.listdir(self.staging))
+        with mock.patch.object(finalize.os, 'replace',
+                               side_effect=OSError(errno.EACCES, 'denied')):
+            ret = move_tracks(self.outputdir, self.staging, tracks)
+        self.assertEqual(ret.errno, errno.EACCES)
+        self.assertEqual(sorted(os.listdir(self.staging)), tracks)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the flac_split.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shutil
+import tempfile
+import subprocess
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core import flac_split
+    from ffaudiocue.ffc_core.flac_split import (crc8,
+                                                crc16,
+                                                utf8_number,
+                                                update_crc16,
+                                                frame_header,
+                                                parse_frame_header,
+                                                read_streaminfo,
+                                                streaminfo_block,
+                                                FlacFrames,
+                                                FlacError,
+                                                split_track,
+                                                MIN_BLOCKSIZE,
+                                                )
+    from ffaudiocue.ffc_core.process_limits import ProcessLimits
+    from ffaudiocue.ffc_core.split_args import (open_cuesheet,
+                                                setup_splitter,
+                                                get_recipes,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+CUESHEET = '''REM COMMENT "test"
+REM GENRE Rock
+REM DATE 1999
+REM DISCID 00000000
+PERFORMER "Artist"
+TITLE "Album"
+FILE "image.flac" WAVE
+  TRACK 01 AUDIO
+    TITLE "One"
+    INDEX 01 00:00:00
+  TRACK 02 AUDIO
+    TITLE "Two"
+    INDEX 01 00:02:00
+'''
+
+
+def decode(filename):
+    """
+    Returns the PCM data of the given FLAC file
+    """
+    return subprocess.run(['ffmpeg', '-nostdin', '-v', 'error', '-i',
+                           filename, '-f', 's16le', '-'],
+                          check=True, capture_output=True).stdout
+
+
+class Limits(ProcessLimits):
+    """ProcessLimits recording the processes applied to"""
+
+    def __init__(self):
+        super().__init__(threads=1)
+        self.pids = []
+
+    def apply(self, pid):
+        self.pids.append(pid)
+        return super().apply(pid)
+
+
+class TestFlacSplit(unittest.TestCase):
+    """Test case for the FLAC frames splitter."""
+
+    def setUp(self):
+        # fixed block size frame #300 of 4096 samples, 44.1kHz stereo
+        head = bytes([0xFF, 0xF8, 0xC9, 0x18]) + utf8_number(300)
+        self.head = head + bytes([crc8(head)])
+        self.body = bytes(range(256)) * 10
+
+    def test_frame_header(self):
+        head = parse_frame_header(self.head + self.body, 0)
+        self.assertEqual((head['number'], head['blocksize']), (300, 4096))
+        self.assertFalse(head['variable'])
+
+        newhead = frame_header(head['head'], 300 * 4096, head['extra'])
+        head = parse_frame_header(newhead, 0)
+        self.assertEqual(head['number'], 300 * 4096)
+        self.assertTrue(head['variable'])
+        self.assertIsNone(parse_frame_header(newhead[:-1] + b'\x00', 0))
+
+    def test_update_crc16(self):
+        crc = crc16(self.head + self.body)
+        newhead = frame_header(self.head, 2 ** 30, b'')
+        self.assertEqual(update_crc16(crc, self.head, newhead,
+                                      len(self.body)),
+                         crc16(newhead + self.body))
+
+    def test_streaminfo(self):
+        info = {'rate': 96000, 'channels': 2, 'bits': 24}
+        block = streaminfo_block(info, 123456, (1152, 4608), (14, 9000),
+                                 last=True)
+        info = read_streaminfo(b'fLaC' + block + self.head)
+        self.assertEqual((info['rate'], info['channels'], info['bits'],
+                          info['samples'], info['maxblocksize']),
+                         (96000, 2, 24, 123456, 4608))
+        self.assertEqual(info['offset'], 4 + len(block))
+        with self.assertRaises(FlacError):
+            read_streaminfo(b'RIFF' + block)
+
+    def test_not_flac(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'fake.flac')
+            with open(filename, 'wb') as fout:
+                fout.write(b'RIFF' + bytes(100))
+            opened = []
+
+            def tracked(*args):
+                opened.append(open(*args))
+                return opened[-1]
+
+            with mock.patch.object(flac_split, 'open', tracked,
+                                   create=True), \
+                    self.assertRaises(FlacError):
+                FlacFrames(filename)
+            self.assertTrue(opened[0].closed)  # not leaked
+
+
+@unittest.skipIf(None in (shutil.which('ffmpeg'), shutil.which('ffprobe')),
+                 'ffmpeg is not installed')
+class TestSplitTrack(unittest.TestCase):
+    """Test case for the tracks cut out of FLAC files."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp, 'image.flac')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def make_source(self, samples):
+        """
+        Writes the FLAC source of the given samples,
+        returns its PCM data and block size
+        """
+        subprocess.run(['ffmpeg', '-nostdin', '-v', 'error', '-f', 'lavfi',
+                        '-i', f'anoisesrc=seed=5,atrim=end_sample={samples}',
+                        '-ac', '2', '-ar', '44100', '-sample_fmt', 's16',
+                        self.source], check=True)
+        with FlacFrames(self.source) as flac:
+            return decode(self.source), flac.info['maxblocksize']
+
+    def split(self, start, end, limits=None):
+        """
+        Writes the given samples to a new track, returns
+        its PCM data and STREAMINFO
+        """
+        output = os.path.join(self.tmp, f'{start}.flac')
+        native = {'source': self.source, 'start': start, 'end': end,
+                  'output': output, 'tags': {'TITLE': 'x'},
+                  'ffmpeg_cmd': 'ffmpeg', 'limits': limits}
+        list(split_track(native))
+        with open(output, 'rb') as fin:
+            info = read_streaminfo(fin.read())
+        return decode(output), info
+
+    def test_round_trip(self):
+        pcm, size = self.make_source(44100 * 60)
+        bounds = [0, size - 3, 5 * size + 3, 9 * size - 3, 20 * size,
+                  20 * size + 20, None]
+        for start, end in zip(bounds, bounds[1:]):
+            track, info = self.split(start, end)
+            end = end or len(pcm) // 4
+            self.assertEqual(info['samples'], end - start)
+            self.assertGreaterEqual(info['maxblocksize'], MIN_BLOCKSIZE)
+            self.assertEqual(track, pcm[start * 4:end * 4], (start, end))
+
+    def test_limits(self):
+        pcm, size = self.make_source(44100 * 5)
+        limits = Limits()
+        track = self.split(size + 3, 4 * size - 3, limits)[0]
+        self.assertEqual(track, pcm[(size + 3) * 4:(4 * size - 3) * 4])
+        self.assertEqual(len(limits.pids), 4)  # decode and encode twice
+
+    def test_short_track(self):
+        pcm, size = self.make_source(44100 * 2 + 10)
+        with self.assertRaises(FlacError):
+            self.split(size * 3 + 100, size * 3 + 110)
+
+        cuefile = os.path.join(self.tmp, 'image.cue')
+        with open(cuefile, 'w', encoding='utf-8') as fcue:
+            fcue.write(CUESHEET)  # the last track has 10 samples
+        data = open_cuesheet(cuefile, 'ffprobe', 'ffmpeg')
+        limits = ProcessLimits()
+        setup_splitter(data, ffmpeg_cmd='ffmpeg', ffmpeg_loglevel='error',
+                       codec_copy=True, destination=self.tmp,
+                       collection=False, limits=limits)
+        data.kwargs['tempdir'] = self.tmp
+        first, last = get_recipes(data)['recipes']
+        self.assertIs(first[1]['native']['limits'], limits)
+        self.assertNotIn('native', last[1])  # ffmpeg recipe
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the incremental.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.incremental import (Manifest,
+                                                 ENCODE,
+                                                 RETAG,
+                                                 SKIP,
+                                                 )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestManifest(unittest.TestCase):
+    """Test case for the Manifest class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.outputdir = os.path.join(self.tmpdir.name, 'out')
+        self.staging = os.path.join(self.tmpdir.name, 'staging')
+        os.mkdir(self.outputdir)
+        os.mkdir(self.staging)
+        self.name = '01 - One.flac'
+        self.fingerprint = {'encode': 'a', 'tags': 'b'}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_track(self, dirname, content=b'track'):
+        with open(os.path.join(dirname, self.name), 'wb') as fbin:
+            fbin.write(content)
+
+    def test_state(self):
+        manifest = Manifest(self.outputdir)
+        self.assertEqual(manifest.state(self.name, self.fingerprint), ENCODE)
+        self.write_track(self.outputdir)  # as moved from the staging
+        manifest.commit({self.name: self.fingerprint}, self.staging)
+
+        manifest = Manifest(self.outputdir)  # reload
+        self.assertEqual(manifest.state(self.name, self.fingerprint), SKIP)
+        self.assertEqual(manifest.state(self.name, {'encode': 'a',
+                                                    'tags': 'c'}), RETAG)
+        self.write_track(self.staging, b'retagged')
+        self.assertIsNone(manifest.replace_owned(self.staging))
+        self.assertEqual(os.listdir(self.staging), [])
+
+        self.write_track(self.outputdir, b'edited by a tag editor')
+        self.assertEqual(manifest.state(self.name, self.fingerprint), ENCODE)
+
+    def test_failed(self):
+        manifest = Manifest(self.outputdir)
+        self.write_track(self.outputdir)
+        manifest.commit({self.name: self.fingerprint}, self.staging,
+                        failed=[self.name])
+
+        manifest = Manifest(self.outputdir)  # reload
+        self.assertTrue(manifest.owned(self.name))  # replaced next time
+        self.assertEqual(manifest.state(self.name, self.fingerprint), ENCODE)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the job_logs.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+import multiprocessing
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.job_logs import JobLogs, read_segment
+except ImportError as error:
+    sys.exit(error)
+
+
+def open_logs(logdir):
+    """
+    Adds some jobs to the index, run by the child processes
+    """
+    joblogs = JobLogs(logdir, maxjobs=100)
+    for num in range(20):
+        joblogs.open(f'{num}.cue')
+
+
+class TestJobLogs(unittest.TestCase):
+    """Test case for the JobLogs and RotatingLog classes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.status = {'aborted': False, 'failed': False, 'errors': 0}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_rotation(self):
+        joblogs = JobLogs(self.tmpdir.name, maxbytes=1000, backups=2,
+                          compress=True)
+        log = joblogs.open('album.cue')
+        for num in range(30):
+            log.write(f'{num:099d}\n')  # 100 bytes each
+        segments = log.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(segments[0].endswith('.1.gz'))
+        self.assertLessEqual(os.path.getsize(log.filename), 1000)
+        with open(log.filename, encoding='utf-8') as current:
+            first = int(current.readline())
+        last = int(read_segment(segments[0]).splitlines()[-1])
+        self.assertEqual(last + 1, first)
+
+    def test_index(self):
+        joblogs = JobLogs(self.tmpdir.name, maxjobs=2)
+        logs = [joblogs.open(f'{num}.cue') for num in range(3)]
+        joblogs.close(logs[2], self.status)
+        entries = joblogs.jobs()
+        self.assertEqual([ent['title'] for ent in entries],
+                         ['2.cue', '1.cue'])
+        self.assertEqual(entries[0]['status'], 'done')
+        self.assertFalse(os.path.exists(logs[0].filename))
+        joblogs.remove([entries[1]['id']])
+        self.assertEqual(len(joblogs.jobs()), 1)
+        self.assertFalse(os.path.exists(logs[1].filename))
+
+    def test_processes(self):
+        procs = [multiprocessing.Process(target=open_logs,
+                                         args=(self.tmpdir.name,))
+                 for num in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        self.assertEqual(len(JobLogs(self.tmpdir.name).jobs()), 80)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
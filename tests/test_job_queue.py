@@ -0,0 +1,79 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the job_queue.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.job_queue import JobQueue, find_cuesheets
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFindCuesheets(unittest.TestCase):
+    """Test case for the find_cuesheets function."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        os.makedirs(os.path.join(self.root, 'sub'))
+        for name in ('a.cue', 'b.CUE', 'c.flac', os.path.join('sub', 'd.cue')):
+            with open(os.path.join(self.root, name), 'w') as fname:
+                fname.write('')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_directory(self):
+        found = [os.path.relpath(f, self.root) for f in
+                 find_cuesheets([self.root])]
+        self.assertEqual(found, ['a.cue', 'b.CUE',
+                                 os.path.join('sub', 'd.cue')])
+
+    def test_glob_and_duplicates(self):
+        cue = os.path.join(self.root, 'a.cue')
+        found = find_cuesheets([os.path.join(self.root, '*.cue'), cue])
+        self.assertEqual(found, [cue])
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test case for the JobQueue class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmpdir.name, 'jobqueue.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_next_job(self):
+        queue = JobQueue(self.fname)
+        first = queue.add('a.cue', {'outputformat': 'flac'})
+        queue.add('b.cue', {'outputformat': 'flac'})
+        self.assertIsNone(queue.add('a.cue', {}))  # already queued
+        self.assertEqual(queue.next_job()['id'], first['id'])
+        self.assertEqual(queue.get(first['id'])['status'], 'running')
+
+    def test_persistence(self):
+        queue = JobQueue(self.fname)
+        job = queue.add('a.cue', {'outputformat': 'flac'})
+        queue.next_job()
+        reloaded = JobQueue(self.fname)  # e.g. after a crash
+        self.assertEqual(reloaded.get(job['id'])['status'], 'queued')
+        self.assertEqual(reloaded.get(job['id'])['options'],
+                         {'outputformat': 'flac'})
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
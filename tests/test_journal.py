@@ -0,0 +1,58 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the journal.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.journal import Journals
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestJournal(unittest.TestCase):
+    """Test case for the Journals and JobJournal classes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journals = Journals(os.path.join(self.tmpdir.name, 'journal'))
+        self.tempdir = os.path.join(self.tmpdir.name, '.FFaudiocue_test')
+        os.mkdir(self.tempdir)
+        self.recipes = [('cmd', {'duration': 1, 'titletrack': name})
+                        for name in ('01 - One.flac', '02 - Two.flac')]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resume(self):
+        journal = self.journals.begin('/album.cue', {'outputformat': 'flac'},
+                                      '/out', self.tempdir, self.recipes)
+        with open(os.path.join(self.tempdir, '01 - One.flac'), 'wb') as fbin:
+            fbin.write(b'track')
+        journal.record_done(0)
+        self.assertEqual(self.journals.interrupted(), [])  # running
+        journal.release()  # as after a crash
+
+        found = self.journals.find('/album.cue', {'outputformat': 'flac'})
+        self.assertEqual(found.completed(self.recipes), {0})
+        with open(os.path.join(self.tempdir, '01 - One.flac'), 'ab') as fbin:
+            fbin.write(b'changed')
+        self.assertEqual(found.completed(self.recipes), set())
+        found.discard()
+        self.assertFalse(os.path.exists(self.tempdir))
+        self.assertEqual(self.journals.interrupted(), [])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
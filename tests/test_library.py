@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the library.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shutil
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.library import Library, resolve_sources
+    from ffaudiocue.ffc_core.incremental import MANIFEST_NAME
+except ImportError as error:
+    sys.exit(error)
+
+
+def write(pathname, data=b''):
+    """
+    Writes a file making its folder
+    """
+    os.makedirs(os.path.dirname(pathname), exist_ok=True)
+    with open(pathname, 'wb') as fout:
+        fout.write(data)
+
+
+def bump(path):
+    """
+    Changes the modification time of `path` to the future,
+    so file system timestamp granularity is not a concern.
+    """
+    mtime = os.stat(path).st_mtime_ns + 10 ** 9
+    os.utime(path, ns=(mtime, mtime))
+
+
+class TestLibrary(unittest.TestCase):
+    """Test case for the Library index."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmp, 'music')
+        write(os.path.join(self.root, 'A', 'a.cue'),
+              b'FILE "Image.wav" WAVE\n')
+        write(os.path.join(self.root, 'A', 'image.flac'))
+        write(os.path.join(self.root, 'B', 'CD1', 'b.cue'),
+              b'\xef\xbb\xbfFILE "caf\xc3\xa9.flac" WAVE\n')
+        write(os.path.join(self.root, 'B', 'CD1', 'caf\xe9.flac'))
+        write(os.path.join(self.root, 'C', 'c.cue'),
+              b'FILE "none.ape" WAVE\n')
+        self.library = Library(os.path.join(self.tmp, 'library.sqlite'))
+
+    def tearDown(self):
+        self.library.close()
+        shutil.rmtree(self.tmp)
+
+    def test_resolve_sources(self):
+        cuefile = os.path.join(self.tmp, 'x.cue')
+        write(cuefile, b'FILE "d:\\rip\\caf\xe9.WAV" WAVE\nFILE y.wav WAVE\n')
+        self.assertEqual(resolve_sources(cuefile, {'caf\xe9.flac'}),
+                         (['caf\xe9.flac'], ['y.wav']))
+
+    def test_scan(self):
+        stats = self.library.scan([self.root], workers=4)
+        self.assertEqual((stats['dirs'], stats['parsed']), (5, 3))
+        pending = self.library.albums([self.root], pending=True)
+        self.assertEqual([os.path.basename(a['cuefile']) for a in pending],
+                         ['a.cue', 'b.cue'])
+        self.assertEqual(pending[0]['sources'], ['image.flac'])
+
+        # nothing changed, no folder is listed again
+        stats = self.library.scan([self.root])
+        self.assertEqual((stats['dirs'], stats['listed'], stats['parsed']),
+                         (5, 0, 0))
+
+        # an edited CUE sheet, a split album and a removed album
+        cuefile = os.path.join(self.root, 'C', 'c.cue')
+        write(cuefile, b'FILE "a.ape" WAVE\nFILE "b.ape" WAVE\n')
+        bump(cuefile)
+        write(os.path.join(self.root, 'A', MANIFEST_NAME), b'{}')
+        bump(os.path.join(self.root, 'A'))
+        shutil.rmtree(os.path.join(self.root, 'B'))
+        bump(self.root)
+        stats = self.library.scan([self.root])
+        self.assertEqual((stats['dirs'], stats['listed'], stats['parsed']),
+                         (3, 2, 2))
+        albums = self.library.albums([self.root])
+        self.assertEqual(len(albums), 2)
+        self.assertTrue(albums[0]['split'])
+        self.assertEqual(albums[1]['missing'], ['a.ape', 'b.ape'])
+        self.assertEqual(self.library.albums([self.root], pending=True), [])
+
+    def test_mark_split(self):
+        self.library.scan([self.root])
+        cuefile = os.path.join(self.root, 'B', 'CD1', 'b.cue')
+        self.library.mark_split(cuefile, self.tmp)
+        pending = self.library.albums(pending=True)
+        self.assertEqual([a['cuefile'] for a in pending],
+                         [os.path.join(self.root, 'A', 'a.cue')])
+        self.assertEqual(self.library.albums([os.path.join(self.root, 'B')]
+                                             )[0]['outputdir'], self.tmp)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the log_reader.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_utils.log_reader import LogReader
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestLogReader(unittest.TestCase):
+    """Test case for the LogReader class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'job.log')
+        # 100 lines of 9 bytes each
+        self.lines = [f'line {num:03d}\n' for num in range(100)]
+        self.write(''.join(self.lines), 'w')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, text, mode='a'):
+        with open(self.filename, mode, encoding='utf-8') as logf:
+            logf.write(text)
+
+    def test_tail_earlier(self):
+        reader = LogReader(self.filename, tailsize=50, chunksize=95)
+        self.assertEqual(reader.tail(), ''.join(self.lines[95:]))
+        self.assertTrue(reader.has_earlier())
+        self.assertEqual(reader.earlier(), ''.join(self.lines[85:95]))
+        text = reader.tail()
+        while reader.has_earlier():
+            text = reader.earlier() + text
+        self.assertEqual(text, ''.join(self.lines))
+        self.assertEqual(reader.earlier(), '')
+
+    def test_follow(self):
+        reader = LogReader(self.filename, tailsize=20)
+        reader.tail()
+        self.assertEqual(reader.follow(), '')
+        self.write('new line\nhalf')
+        self.assertEqual(reader.follow(), 'new line\nhalf')
+        self.write(' line\n')
+        self.assertEqual(reader.follow(), ' line\n')
+
+        self.write('rotated\n', 'w')  # truncated
+        self.assertIsNone(reader.follow())
+        self.assertEqual(reader.tail(), 'rotated\n')
+        os.remove(self.filename)
+        self.assertIsNone(reader.follow())
+
+    def test_utf8(self):
+        self.write('città\n', 'w')
+        reader = LogReader(self.filename, tailsize=4)  # within a character
+        self.assertEqual(reader.tail(), '')
+        self.assertEqual(reader.earlier(), 'città\n')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
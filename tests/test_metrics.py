@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the metrics.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import gettext
+import json
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.metrics import (RecipeMetrics,
+                                             ffmpeg_version,
+                                             summarize,
+                                             format_summary,
+                                             append_jsonl,
+                                             )
+except ImportError as error:
+    sys.exit(error)
+
+gettext.install('ffaudiocue')  # the `_` of format_summary
+
+
+class TestMetrics(unittest.TestCase):
+    """Test case for the metrics of the recipes."""
+
+    def record(self, index, **values):
+        metrics = RecipeMetrics(index, {'titletrack': f'{index}.flac',
+                                        'duration': 60})
+        metrics.record.update(values)
+        return metrics.finish(values.get('status', 0))
+
+    def test_recipe(self):
+        metrics = RecipeMetrics(0, {'titletrack': '01 - One.flac',
+                                    'duration': 212.4004})
+        metrics.progress('speed', '51.8x')
+        metrics.progress('speed', 'N/A')
+        metrics.progress('total_size', '24309120')
+        metrics.progress('total_size', 'N/A')
+        record = metrics.finish(0)
+        self.assertEqual(record['track'], '01 - One.flac')
+        self.assertEqual(record['duration'], 212.4)
+        self.assertEqual(record['speed'], 51.8)
+        self.assertEqual(record['bytes_out'], 24309120)
+        self.assertEqual(record['status'], 0)
+        self.assertIsNotNone(record['wall'])
+
+        metrics = RecipeMetrics(1, {'duration': 1})
+        metrics.written = 1000  # from /proc, when -progress has not it
+        self.assertEqual(metrics.finish(1)['bytes_out'], 1000)
+
+    def test_version(self):
+        self.assertEqual(ffmpeg_version('ffmpeg version 6.1.1 Copyright '
+                                        '(c) 2000-2023'), '6.1.1')
+        self.assertIsNone(ffmpeg_version('Input #0, wav, from'))
+
+    def test_summarize(self):
+        records = [self.record(0, cpu_user=2.0, maxrss_kb=3000,
+                               bytes_out=100, ffmpeg='6.1.1'),
+                   self.record(1, cpu_user=None, maxrss_kb=5000,
+                               bytes_out=50, status=1),
+                   self.record(2, cpu_user=1.5, maxrss_kb=None,
+                               bytes_out=None)]
+        summary = summarize(records, 30)
+        self.assertEqual(summary['recipes'], 3)
+        self.assertEqual(summary['duration'], 180)
+        self.assertEqual(summary['cpu_user'], 3.5)
+        self.assertIsNone(summary['cpu_system'])
+        self.assertEqual(summary['bytes_out'], 150)
+        self.assertEqual(summary['maxrss_kb'], 5000)
+        self.assertEqual(summary['realtime'], 6.0)
+        self.assertEqual(summary['recipes_per_sec'], 0.1)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['ffmpeg'], '6.1.1')
+        self.assertEqual(format_summary(summary),
+                         '180 s of audio processed in 30 s, 6.0x realtime')
+
+        empty = summarize([], 0)
+        self.assertIsNone(empty['realtime'])
+        self.assertEqual(format_summary(empty),
+                         '0 s of audio processed in 0 s')
+
+    def test_append(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'metrics.jsonl')
+            append_jsonl(filename, {'type': 'recipe', 'track': 'città'})
+            append_jsonl(filename, {'type': 'summary'})
+            with open(filename, encoding='utf-8') as jsonl:
+                lines = [json.loads(line) for line in jsonl]
+        self.assertEqual(lines, [{'type': 'recipe', 'track': 'città'},
+                                 {'type': 'summary'}])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the pcm_split.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+import wave
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.pcm_split import (read_wav_header,
+                                               split_track,
+                                               WavError,
+                                               )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestPcmSplit(unittest.TestCase):
+    """Test case for the native WAV splitter."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, 'image.wav')
+        self.frames = bytes(range(256)) * 441  # 28224 stereo frames
+        with wave.open(self.source, 'wb') as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(self.frames)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_split(self):
+        wav = read_wav_header(self.source)
+        self.assertEqual((wav['rate'], wav['bits'], wav['block_align']),
+                         (44100, 16, 4))
+        self.assertEqual(wav['size'], len(self.frames))
+        output = os.path.join(self.tmpdir.name, '01 - One.wav')
+        pcm = {'source': self.source,
+               'wav': wav,
+               'begin': wav['offset'] + 588 * 4,
+               'end': wav['offset'] + 588 * 4 * 3,
+               'output': output,
+               'tags': {'TITLE': 'One', 'TRACK': '1/2'},
+               }
+        self.assertEqual(list(split_track(pcm))[-1], 588 * 4 * 2)
+        with wave.open(output, 'rb') as track:
+            self.assertEqual(track.getnchannels(), 2)
+            self.assertEqual(track.readframes(track.getnframes()),
+                             self.frames[588 * 4:588 * 4 * 3])
+
+    def test_not_pcm(self):
+        with open(self.source, 'r+b') as wav:
+            wav.seek(20)
+            wav.write(b'\x03\x00')  # IEEE float
+        with self.assertRaises(WavError):
+            read_wav_header(self.source)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
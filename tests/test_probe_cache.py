@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the probe_cache.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.probe_cache import ProbeCache
+    from ffaudiocue.ffc_core import split_args
+    from ffaudiocue.ffc_core.split_args import open_cuesheet
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestProbeCache(unittest.TestCase):
+    """Test case for the ProbeCache class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.files = []
+        for name in ('a.wav', 'b.wav', 'c.wav'):
+            fname = os.path.join(self.tmpdir.name, name)
+            with open(fname, 'w') as audio:
+                audio.write(name)
+            self.files.append(fname)
+        self.cachefile = os.path.join(self.tmpdir.name, 'probecache.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_persistence_and_identity(self):
+        cache = ProbeCache(self.cachefile)
+        cache.put(self.files[0], {'format': {'duration': '1.0'}})
+        cache = ProbeCache(self.cachefile)
+        self.assertEqual(cache.get(self.files[0]),
+                         {'format': {'duration': '1.0'}})
+        with open(self.files[0], 'a') as audio:
+            audio.write('changed')
+        self.assertIsNone(cache.get(self.files[0]))
+
+    def test_lru_eviction(self):
+        cache = ProbeCache(self.cachefile, maxentries=2)
+        cache.put(self.files[0], {})
+        cache.put(self.files[1], {})
+        cache.get(self.files[0])  # now b.wav is the least recently used
+        cache.put(self.files[2], {})
+        self.assertIsNone(cache.get(self.files[1]))
+        self.assertEqual(cache.get(self.files[0]), {})
+
+    def test_cuesheet(self):
+        cuefile = os.path.join(self.tmpdir.name, 'a.cue')
+        with open(cuefile, 'w', encoding='utf-8') as fcue:
+            fcue.write('REM COMMENT "test"\nREM GENRE Rock\nREM DATE 1999\n'
+                       'REM DISCID 00000000\nPERFORMER "Artist"\n'
+                       'TITLE "Album"\nFILE "a.wav" WAVE\n'
+                       '  TRACK 01 AUDIO\n    TITLE "One"\n'
+                       '    INDEX 01 00:00:00\n  TRACK 02 AUDIO\n'
+                       '    TITLE "Two"\n    INDEX 01 00:02:00\n')
+        probe = {'format': {'duration': '10.0'}}
+        cache = ProbeCache(self.cachefile)
+        cache.put(self.files[0], probe)
+        with mock.patch.object(split_args, '_ffprobe') as ffprobe:
+            data = open_cuesheet(cuefile, 'ffprobe', 'ffmpeg',
+                                 probecache=cache)
+            ffprobe.assert_not_called()  # taken from the cache
+        self.assertEqual(data.probedata, [probe])
+        self.assertEqual([track['DURATION'] for track in data.audiotracks],
+                         [2.0, 8.0])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
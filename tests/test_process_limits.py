@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the process_limits.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import platform
+import subprocess
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.process_limits import (ProcessLimits,
+                                                    parse_cpulist,
+                                                    )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestProcessLimits(unittest.TestCase):
+    """Test case for the ProcessLimits class."""
+
+    def test_settings(self):
+        self.assertEqual(parse_cpulist('0-2, 5'), {0, 1, 2, 5})
+        self.assertEqual(parse_cpulist(''), set())
+        with self.assertRaises(ValueError):
+            parse_cpulist('3-1')
+
+        limits = ProcessLimits.from_settings({'ffmpegnice': 10,
+                                              'ffmpegaffinity': 'x',
+                                              })
+        self.assertEqual(limits.nice, 0)  # invalid settings ignored
+        limits = ProcessLimits.from_settings({'ffmpegthreads': 2})
+        self.assertEqual(limits.command(['ffmpeg', '-i', 'in.flac']),
+                         ['ffmpeg', '-threads', '2', '-filter_threads', '2',
+                          '-filter_complex_threads', '2', '-i', 'in.flac'])
+        self.assertEqual(limits.command('"ffmpeg"  -i "in.flac"'),
+                         '"ffmpeg" -threads 2 -filter_threads 2 '
+                         '-filter_complex_threads 2  -i "in.flac"')
+
+    @unittest.skipIf(platform.system() == 'Windows', 'POSIX only')
+    def test_apply(self):
+        limits = ProcessLimits(nice=5)
+        with subprocess.Popen([sys.executable, '-c',
+                               'import sys; sys.stdin.read()'],
+                              stdin=subprocess.PIPE) as proc:
+            self.assertEqual(limits.apply(proc.pid), [])
+            prio = os.getpriority(os.PRIO_PROCESS, proc.pid)
+            proc.communicate(b'')
+        self.assertEqual(prio, min(os.getpriority(os.PRIO_PROCESS, 0) + 5,
+                                   19))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the single pass recipes.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shutil
+import tempfile
+import subprocess
+import contextlib
+import io
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_sys.argparser import arguments
+    from ffaudiocue.cli_app import run_command
+except ImportError as error:
+    sys.exit(error)
+
+CUESHEET = '''REM COMMENT "test"
+REM GENRE Rock
+REM DATE 1999
+REM DISCID 00000000
+PERFORMER "Artist"
+TITLE "Album"
+FILE "image.flac" WAVE
+  TRACK 01 AUDIO
+    TITLE "One"
+    INDEX 01 00:00:00
+  TRACK 02 AUDIO
+    TITLE "Two"
+    INDEX 01 00:01:37
+  TRACK 03 AUDIO
+    TITLE "Three"
+    INDEX 01 00:02:50
+'''
+
+
+def decode(filename):
+    """
+    Returns the PCM data of the given audio file
+    """
+    return subprocess.run(['ffmpeg', '-nostdin', '-v', 'error', '-i',
+                           filename, '-f', 's16le', '-'],
+                          check=True, capture_output=True).stdout
+
+
+@unittest.skipIf(None in (shutil.which('ffmpeg'), shutil.which('ffprobe')),
+                 'ffmpeg is not installed')
+class TestSinglePass(unittest.TestCase):
+    """Test case for the single pass split."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.album = os.path.join(self.tmp, 'album')
+        os.mkdir(self.album)
+        subprocess.run(['ffmpeg', '-nostdin', '-v', 'error', '-f', 'lavfi',
+                        '-i', 'anoisesrc=duration=4:seed=7', '-ac', '2',
+                        '-ar', '44100', '-sample_fmt', 's16',
+                        os.path.join(self.album, 'image.flac')], check=True)
+        with open(os.path.join(self.album, 'image.cue'), 'w',
+                  encoding='utf-8') as fcue:
+            fcue.write(CUESHEET)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def split(self, *args):
+        """
+        Splits the album to a new folder, returns its pathname
+        """
+        outputdir = os.path.join(self.tmp, f'out{len(args)}')
+        kwargs = arguments(['--make-portable', os.path.join(self.tmp, 'conf'),
+                            'split', self.album, '-o', outputdir,
+                            '-f', 'flac', *args])
+        with contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(run_command(kwargs), 0)
+        return outputdir
+
+    def test_same_samples(self):
+        tracks = self.split()
+        single = self.split('--single-pass')
+        names = sorted(os.listdir(tracks))
+        self.assertEqual(names, ['01 - One.flac', '02 - Two.flac',
+                                 '03 - Three.flac'])
+        self.assertEqual(sorted(os.listdir(single)), names)
+        pcm = []
+        for name in names:
+            pcm.append(decode(os.path.join(single, name)))
+            self.assertEqual(pcm[-1], decode(os.path.join(tracks, name)),
+                             name)
+        self.assertEqual(b''.join(pcm),
+                         decode(os.path.join(self.album, 'image.flac')))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
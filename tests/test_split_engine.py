@@ -0,0 +1,226 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the split_engine.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import time
+import gettext
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core import split_engine
+    from ffaudiocue.ffc_core.split_engine import SplitEngine
+except ImportError as error:
+    sys.exit(error)
+
+gettext.install('ffaudiocue')  # the `_` of the error messages
+
+# stands for ffmpeg: NAME SECONDS STATUS, writing the progress to
+# stdout and its NAME to the `running` folder while it runs
+FAKE_FFMPEG = '''import os, sys, time
+name, secs, status = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+workdir = os.path.dirname(os.path.abspath(sys.argv[0]))
+running = os.path.join(workdir, 'running', name)
+open(running, 'w').close()
+sys.stderr.write(f'ffmpeg version 9.9\\n{name} first line\\n')
+sys.stderr.flush()
+start = time.monotonic()
+while time.monotonic() - start < secs:
+    with open(os.path.join(workdir, 'peaks'), 'a') as peaks:
+        peaks.write(f'{len(os.listdir(os.path.dirname(running)))}\\n')
+    elapsed = int((time.monotonic() - start) * 1000000)
+    print(f'out_time_ms={elapsed}\\nprogress=continue', flush=True)
+    time.sleep(0.05)
+os.remove(running)
+sys.stderr.write(f'{name} last line\\n')
+with open(os.path.join(workdir, 'done'), 'a') as done:
+    done.write(f'{name}\\n')
+sys.exit(status)
+'''
+
+
+class FakeLog:
+    """The job log, kept in memory"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+
+    def text(self):
+        return ''.join(self.chunks)
+
+
+class TestProgress(unittest.TestCase):
+    """Test case for the throttled progress events."""
+
+    def setUp(self):
+        self.events = []
+        self.now = 100.0
+        patcher = mock.patch.object(split_engine.time, 'monotonic',
+                                    lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        args = {'recipes': [([], {'duration': 30}), ([], {'duration': 10})]}
+        self.engine = SplitEngine(args, None, workers=2, fps=10,
+                                  notify=self.notify)
+
+    def notify(self, topic, **kwargs):
+        self.events.append((topic, kwargs))
+
+    def test_throttle(self):
+        self.engine.update_progress(0, 5, 'one')
+        self.engine.update_progress(1, 5, 'two')  # too early, dropped
+        self.now += 0.05
+        self.engine.update_progress(0, 6, 'one')  # dropped
+        self.assertEqual(len(self.events), 1)
+
+        self.now += 0.06
+        self.engine.update_progress(1, 10, 'two')  # coalesces all workers
+        self.assertEqual(len(self.events), 2)
+        topic, event = self.events[-1]
+        self.assertEqual(topic, 'UPDATE_EVT')
+        self.assertEqual(event['elapsed'], 16)
+        self.assertEqual(event['duration'], 40)
+        self.assertEqual(event['percent'], 40.0)
+
+        self.engine.update_progress(0, 30, 'one', force=True)  # track end
+        self.assertEqual(len(self.events), 3)
+        self.assertEqual(self.events[-1][1]['percent'], 100.0)
+
+    def test_unthrottled(self):
+        engine = SplitEngine(self.engine.args, None, fps=0,
+                             notify=self.notify)
+        for secs in range(5):
+            engine.update_progress(0, secs, 'one')
+        self.assertEqual(len(self.events), 5)
+
+
+class TestRun(unittest.TestCase):
+    """Test case for the ffmpeg processes run by the workers."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.tmpdir.name, 'ffmpeg.py')
+        with open(self.script, 'w', encoding='utf-8') as fake:
+            fake.write(FAKE_FFMPEG)
+        os.mkdir(os.path.join(self.tmpdir.name, 'running'))
+        self.log = FakeLog()
+        self.events = []
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def notify(self, topic, **kwargs):
+        self.events.append((topic, kwargs))
+
+    def recipe(self, name, secs=0.2, status=0):
+        cmd = f'"{sys.executable}" "{self.script}" {name} {secs} {status}'
+        return (cmd, {'titletrack': name, 'duration': secs})
+
+    def engine(self, recipes, workers):
+        return SplitEngine({'recipes': recipes}, self.log, workers=workers,
+                           notify=self.notify)
+
+    def read(self, name):
+        """
+        Returns the lines of the given file written by
+        the fake ffmpeg processes
+        """
+        try:
+            with open(os.path.join(self.tmpdir.name, name),
+                      encoding='utf-8') as fin:
+                return fin.read().split()
+        except FileNotFoundError:
+            return []
+
+    def assert_sections(self, names):
+        """
+        Each recipe run must have its own section
+        of the log, holding its stderr only
+        """
+        sections = self.log.text().split('[INFO: COMMAND]: ')[1:]
+        self.assertEqual(len(sections), len(names))
+        for section in sections:
+            name = section.split()[2]  # the argument of the script
+            self.assertIn(name, names)
+            self.assertIn(f'{name} first line\n{name} last line\n',
+                          section)
+            for line in section.splitlines():
+                if line.endswith((' first line', ' last line')):
+                    self.assertEqual(line.split()[0], name)
+
+    def test_workers(self):
+        names = ['one', 'two', 'three', 'four']
+        engine = self.engine([self.recipe(name) for name in names], 2)
+        status = engine.run()
+        self.assertEqual((status['aborted'], status['failed'],
+                          status['errors']), (False, False, 0))
+        self.assertEqual(sorted(self.read('done')), sorted(names))
+        self.assertEqual(max(map(int, self.read('peaks'))), 2)
+        self.assert_sections(names)
+        self.assertEqual(status['metrics']['recipes'], 4)
+        self.assertEqual(self.events[-1][1]['percent'], 100.0)
+
+    def test_error(self):
+        names = ['one', 'two', 'three']
+        engine = self.engine([self.recipe('one'),
+                              self.recipe('two', status=1),
+                              self.recipe('three')], 1)
+        status = engine.run()
+        self.assertEqual((status['failed'], status['errors']), (False, 1))
+        self.assertEqual(self.read('done'), names)  # the others run anyway
+        self.assertIn(1, [event.get('status') for topic, event
+                          in self.events if topic == 'UPDATE_EVT'])
+        self.assert_sections(names)
+
+    def test_failed(self):
+        missing = os.path.join(self.tmpdir.name, 'missing')
+        recipes = [(f'"{missing}" -i one', {'duration': 1}),
+                   self.recipe('two'), self.recipe('three')]
+        status = self.engine(recipes, 1).run()
+        self.assertTrue(status['failed'])
+        self.assertEqual(self.read('done'), [])  # the others are skipped
+        self.assertEqual(self.log.text().count('[INFO: COMMAND]'), 1)
+        self.assertIn('ERROR: ', self.log.text())
+        self.assertIn(('COUNT_EVT', 'error'), [(topic, event['end'])
+                                               for topic, event in
+                                               self.events
+                                               if topic == 'COUNT_EVT'])
+
+    def test_stop(self):
+        names = ['one', 'two', 'three', 'four']
+        engine = self.engine([self.recipe(name, secs=30) for name in names],
+                             2)
+        status = {}
+        thread = threading.Thread(target=lambda: status.update(engine.run()))
+        started = time.monotonic()
+        thread.start()
+        running = os.path.join(self.tmpdir.name, 'running')
+        while len(os.listdir(running)) < 2 and time.monotonic() < started + 10:
+            time.sleep(0.05)
+        engine.stop()
+        thread.join(20)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.monotonic() - started, 20)
+        self.assertTrue(status['aborted'])
+        self.assertEqual(self.read('done'), [])
+        self.assertLessEqual(max(map(int, self.read('peaks'))), 2)
+        self.assertEqual(self.log.text().count('[INFO: COMMAND]'), 2)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Measures the start up imports with `python -X importtime`.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import subprocess
+import importlib.util
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+ROOTDIR = os.path.dirname(os.path.dirname(PATH))
+
+# max cumulative import time of the command line entry point,
+# in microseconds; it takes about 40ms on a desktop computer.
+BUDGET = 250_000
+
+# modules loaded on first use only, never on start up
+LAZY = ('wx', 'requests', 'ffcuesplitter', 'pubsub')
+
+
+def import_times(code):
+    """
+    Runs the given Python code with `-X importtime`, returns
+    a dict of the cumulative import time of each module.
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOTDIR, capture_output=True, text=True,
+                          check=False, timeout=60)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and line.count('|') == 2:
+            cumulative, name = line.split('|')[1:]
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def run_cli(option):
+    """
+    Returns the import times of the entry point with `option`
+    """
+    return import_times(f"import sys; sys.argv = ['ffaudiocue', '{option}']"
+                        f"; from ffaudiocue.cli_app import main; main()")
+
+
+class TestStartup(unittest.TestCase):
+    """Test case for the start up imports."""
+
+    def assert_lazy(self, times, lazy):
+        loaded = [name for name in times
+                  if name.split('.')[0] in lazy or name in lazy]
+        self.assertEqual(loaded, [], 'modules not loaded on first use')
+
+    def test_version(self):
+        times = run_cli('--version')
+        self.assertIn('ffaudiocue.cli_app', times)
+        self.assert_lazy(times, LAZY)
+        self.assertLess(times['ffaudiocue.cli_app'], BUDGET)
+
+    def test_check(self):
+        times = run_cli('--check')
+        self.assert_lazy(times, LAZY)
+        self.assertLess(times['ffaudiocue.cli_app'], BUDGET)
+
+    @unittest.skipIf(importlib.util.find_spec('wx') is None,
+                     'wxPython is not installed')
+    def test_main_frame(self):
+        times = import_times("import builtins; builtins._ = str; "
+                             "import ffaudiocue.ffc_main.main_frame")
+        self.assertIn('ffaudiocue.ffc_main.main_frame', times)
+        self.assert_lazy(times, ('requests',
+                                 'webbrowser',
+                                 'ffcuesplitter',
+                                 'ffaudiocue.ffc_dlg.preferences',
+                                 'ffaudiocue.ffc_dlg.showlogs',
+                                 'ffaudiocue.ffc_dlg.job_queue',
+                                 'ffaudiocue.ffc_inout.io_tools',
+                                 ))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the verify.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.verify import verify_tracks, failures
+except ImportError as error:
+    sys.exit(error)
+
+
+@unittest.skipIf(shutil.which('ffmpeg') is None, 'ffmpeg is not installed')
+class TestVerify(unittest.TestCase):
+    """Test case for the verification of the tracks."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.track = os.path.join(self.tmp, '01 - Sine.flac')
+        subprocess.run(['ffmpeg', '-nostdin', '-v', 'error', '-f', 'lavfi',
+                        '-i', 'sine=duration=2', self.track], check=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_verify(self):
+        broken = os.path.join(self.tmp, '02 - Broken.flac')
+        with open(self.track, 'rb') as fin, open(broken, 'wb') as fout:
+            fout.write(fin.read(4096))
+        missing = os.path.join(self.tmp, '03 - Missing.flac')
+        results = verify_tracks([(self.track, 2.0), (self.track, 5.0),
+                                 (broken, 2.0), (missing, 2.0)], workers=4)
+        self.assertEqual(results[0]['errors'], [])
+        self.assertAlmostEqual(results[0]['decoded'], 2.0, places=2)
+        self.assertTrue(results[1]['errors'][0].startswith('duration'))
+        self.assertTrue(results[2]['errors'])
+        self.assertEqual(results[3]['errors'], ['file not found'])
+        lines = failures(results)
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith('03 - Missing.flac: '))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the watch_folder.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import json
+import shutil
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from ffaudiocue.ffc_core.watch_folder import (WatchFolders,
+                                                  load_profile,
+                                                  PROFILE_NAME,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+
+def write(pathname, data=b''):
+    """
+    Writes a file making its folder
+    """
+    os.makedirs(os.path.dirname(pathname), exist_ok=True)
+    with open(pathname, 'wb') as fout:
+        fout.write(data)
+
+
+class TestWatchFolders(unittest.TestCase):
+    """Test case for the WatchFolders class."""
+
+    def setUp(self):
+        self.inbox = tempfile.mkdtemp()
+        self.watch = WatchFolders([self.inbox], settle=0)
+
+    def tearDown(self):
+        self.watch.close()
+        shutil.rmtree(self.inbox)
+
+    def test_ready(self):
+        cuefile = os.path.join(self.inbox, 'Artist', 'Album', 'a.cue')
+        write(cuefile, b'FILE "a.flac" WAVE\n')
+        self.assertEqual(self.watch.ready(), [])  # no audio file yet
+        write(os.path.join(self.inbox, 'Artist', 'Album', 'a.flac'), b'x')
+        self.assertEqual(self.watch.ready(), [])  # not settled yet
+        album = self.watch.ready()
+        self.assertEqual(album, [(self.inbox, cuefile, [
+            os.path.join(self.inbox, 'Artist', 'Album', 'a.flac')])])
+        self.assertEqual(self.watch.ready(), [])  # returned once only
+
+        dest = self.watch.archive(*album[0], success=True)
+        self.assertEqual(dest, os.path.join(self.inbox, 'done', 'Artist',
+                                            'Album'))
+        self.assertEqual(os.listdir(self.inbox), ['done'])
+        self.assertEqual(self.watch.ready(), [])  # done is not watched
+
+    def test_archive_loose(self):
+        for num in (1, 2):
+            write(os.path.join(self.inbox, 'a.cue'), b'FILE a.wav WAVE\n')
+            write(os.path.join(self.inbox, 'a.wav'))
+            self.watch.ready()
+            album = self.watch.ready()
+            self.watch.archive(*album[0], success=False)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.inbox,
+                                                        'failed'))),
+                         ['a (1).cue', 'a (1).wav', 'a.cue', 'a.wav'])
+
+    def test_archive_shared(self):
+        album = os.path.join(self.inbox, 'Album')
+        for name in ('cd1', 'cd2'):
+            write(os.path.join(album, f'{name}.cue'),
+                  f'FILE "{name}.wav" WAVE\n'.encode())
+            write(os.path.join(album, f'{name}.wav'))
+        write(os.path.join(album, 'cover.jpg'))
+        self.watch.ready()
+        cd1, cd2 = self.watch.ready()
+
+        dest = self.watch.archive(*cd1, success=True)
+        self.assertEqual(dest, os.path.join(self.inbox, 'done', 'Album'))
+        self.assertEqual(sorted(os.listdir(dest)), ['cd1.cue', 'cd1.wav'])
+        self.assertEqual(sorted(os.listdir(album)),
+                         ['cd2.cue', 'cd2.wav', 'cover.jpg'])
+
+        dest = self.watch.archive(*cd2, success=False)
+        self.assertEqual(dest, os.path.join(self.inbox, 'failed', 'Album'))
+        self.assertEqual(sorted(os.listdir(dest)),
+                         ['cd2.cue', 'cd2.wav', 'cover.jpg'])
+        self.assertEqual(sorted(os.listdir(self.inbox)), ['done', 'failed'])
+
+    def test_archive_merge(self):
+        album = os.path.join(self.inbox, 'Album')
+        for name in ('cd1', 'cd2'):
+            write(os.path.join(album, f'{name}.cue'),
+                  f'FILE "{name}.wav" WAVE\n'.encode())
+            write(os.path.join(album, f'{name}.wav'))
+        self.watch.ready()
+        for cdx in self.watch.ready():
+            self.watch.archive(*cdx, success=True)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.inbox, 'done',
+                                                        'Album'))),
+                         ['cd1.cue', 'cd1.wav', 'cd2.cue', 'cd2.wav'])
+        self.assertEqual(os.listdir(self.inbox), ['done'])
+
+    def test_profile(self):
+        self.assertEqual(load_profile(self.inbox), {})
+        with open(os.path.join(self.inbox, PROFILE_NAME), 'w',
+                  encoding='utf-8') as fout:
+            json.dump({'format': 'opus', 'outputdir': 'out'}, fout)
+        self.assertEqual(load_profile(self.inbox),
+                         {'format': 'opus',
+                          'outputdir': os.path.join(self.inbox, 'out')})
+        with open(os.path.join(self.inbox, PROFILE_NAME), 'w',
+                  encoding='utf-8') as fout:
+            json.dump({'formats': 'opus'}, fout)
+        with self.assertRaises(ValueError):
+            load_profile(self.inbox)
+
+    def test_profile_quality(self):
+        options = {'format': 'mp3', 'quality': 'Auto', 'copy': False}
+        for profile in ({'format': 'aiff'}, {'quality': 'quality 1'},
+                        {'format': 'opus', 'quality': 'VBR 160 kbit/s'}):
+            with open(os.path.join(self.inbox, PROFILE_NAME), 'w',
+                      encoding='utf-8') as fout:
+                json.dump(profile, fout)
+            with self.assertRaises(ValueError):
+                load_profile(self.inbox, options)
+        profile['copy'] = True  # the format and quality are ignored
+        with open(os.path.join(self.inbox, PROFILE_NAME), 'w',
+                  encoding='utf-8') as fout:
+            json.dump(profile, fout)
+        self.assertEqual(load_profile(self.inbox, options), profile)
+        options['format'] = 'flac'
+        with open(os.path.join(self.inbox, PROFILE_NAME), 'w',
+                  encoding='utf-8') as fout:
+            json.dump({'quality': 'quality 1'}, fout)
+        self.assertEqual(load_profile(self.inbox, options),
+                         {'quality': 'quality 1'})
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()